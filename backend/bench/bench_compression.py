@@ -0,0 +1,111 @@
+"""
+Benchmark response compression: CPU cost and bytes on the wire
+
+For representative payloads (the seeded topic listing, the longest topic
+body, a canned assistant answer and a large quiz listing) reports, per
+available encoding:
+
+- compressed size and ratio against the identity body
+- CPU time to compress per request at the middleware's fast level
+- CPU time to compress once at the cached level, and the time to serve the
+  stored variant from the cache afterwards
+
+Run from the backend directory:
+    python -m bench.bench_compression
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def payloads():
+    from services.fast_json import dumps
+    from services.gemini_service import gemini_service
+
+    topics = []
+    with open(os.path.join(BACKEND_DIR, "data", "seed_content.jsonl"), encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get("type") == "topic":
+                topics.append({
+                    "id": len(topics) + 1, "title": record["title"], "slug": record["slug"],
+                    "description": record.get("description"), "content": record["content"],
+                    "difficulty_level": record.get("difficulty_level", "beginner"),
+                    "category": record["category"], "tags": json.dumps(record.get("tags", [])),
+                    "is_published": True,
+                })
+    answer = gemini_service._check_common_questions("what are my consumer rights")
+    quizzes = [
+        {"id": i, "topic_id": 1, "question": f"Which article covers case {i}?",
+         "options": ["Article 14", "Article 19", "Article 21", "Article 32"],
+         "explanation": "Article 21 protects life and personal liberty.", "difficulty": "medium"}
+        for i in range(1000)
+    ]
+    return {
+        "topic_listing": dumps(topics),
+        "topic_body": dumps(max(topics, key=lambda topic: len(topic["content"]))),
+        "canned_answer": dumps({"response": answer, "success": True}),
+        "quiz_listing_1k": dumps(quizzes),
+    }
+
+
+def cpu_us(func, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.process_time()
+        func()
+        samples.append((time.process_time() - started) * 1e6)
+    return statistics.median(samples)
+
+
+def wall_us(func, loops):
+    started = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return (time.perf_counter() - started) / loops * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+    sys.path.insert(0, BACKEND_DIR)
+
+    from services.cache import MemoryCache
+    from services.compression import CACHED_LEVELS, FAST_LEVELS, PREFERENCE, compress
+
+    cache = MemoryCache()
+    rows = []
+    for name, body in payloads().items():
+        for encoding in PREFERENCE:
+            fast = compress(body, encoding)
+            cached = compress(body, encoding, CACHED_LEVELS[encoding])
+            cache.set(f"{name}#{encoding}", cached)
+            rows.append({
+                "payload": name,
+                "encoding": encoding,
+                "identity_bytes": len(body),
+                "fast_bytes": len(fast),
+                "cached_bytes": len(cached),
+                "ratio_cached": round(len(body) / len(cached), 2),
+                "per_request_cpu_us": round(cpu_us(lambda: compress(body, encoding), args.runs), 1),
+                "cached_once_cpu_us": round(cpu_us(lambda: compress(body, encoding, CACHED_LEVELS[encoding]), max(3, args.runs // 10)), 1),
+                "cached_serve_us": round(wall_us(lambda: cache.get(f"{name}#{encoding}"), 10000), 3),
+            })
+            row = rows[-1]
+            print(f"{name:16s} {encoding:5s} {row['identity_bytes']:>8} -> {row['cached_bytes']:>7} B "
+                  f"(x{row['ratio_cached']:<5}) per-request {row['per_request_cpu_us']:>9.1f} µs  "
+                  f"cached {row['cached_serve_us']:.3f} µs", file=sys.stderr)
+
+    print(json.dumps({"encodings": PREFERENCE, "fast_levels": FAST_LEVELS, "cached_levels": CACHED_LEVELS,
+                      "results": rows}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
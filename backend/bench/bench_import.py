@@ -0,0 +1,134 @@
+"""
+Benchmark the bulk content importer/exporter
+
+Generates a synthetic question bank (100k quizzes by default), imports it
+into a fresh SQLite database and exports it back, then compares against the
+old row-by-row "query then insert" loading on a small sample.
+
+Run from the backend directory:
+    python -m bench.bench_import --quizzes 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def generate(path, n_topics, n_quizzes):
+    with open(path, "w", encoding="utf-8") as f:
+        for t in range(n_topics):
+            f.write(json.dumps({
+                "type": "topic", "slug": f"topic-{t}", "title": f"Topic {t}",
+                "category": f"Category {t % 12}", "content": "Lorem ipsum " * 40,
+                "tags": [f"tag{t % 50}", f"tag{t % 7}"],
+            }) + "\n")
+        for q in range(n_quizzes):
+            f.write(json.dumps({
+                "type": "quiz", "topic_slug": f"topic-{q % n_topics}",
+                "question": f"Question {q}?", "options": ["A", "B", "C", "D"],
+                "correct_answer": q % 4, "explanation": "Because.",
+                "difficulty": ("easy", "medium", "hard")[q % 3],
+            }) + "\n")
+
+
+def row_by_row(db, path, limit):
+    """The seed-script pattern: one existence query and one insert per record"""
+    from models.topic_model import LegalTopic, Quiz
+
+    topic_ids = {}
+    with open(path, encoding="utf-8") as f:
+        for i, line in enumerate(f):
+            if i >= limit:
+                break
+            record = json.loads(line)
+            if record["type"] == "topic":
+                topic = db.query(LegalTopic).filter(LegalTopic.slug == record["slug"]).first()
+                if not topic:
+                    topic = LegalTopic(slug=record["slug"], title=record["title"], category=record["category"],
+                                       content=record["content"], tags=json.dumps(record["tags"]))
+                    db.add(topic)
+                    db.flush()
+                topic_ids[record["slug"]] = topic.id
+            else:
+                topic_id = topic_ids[record["topic_slug"]]
+                exists = db.query(Quiz).filter(Quiz.topic_id == topic_id, Quiz.question == record["question"]).first()
+                if not exists:
+                    db.add(Quiz(topic_id=topic_id, question=record["question"], options=json.dumps(record["options"]),
+                                correct_answer=record["correct_answer"], explanation=record["explanation"],
+                                difficulty=record["difficulty"]))
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--topics", type=int, default=1000)
+    parser.add_argument("--quizzes", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--baseline-sample", type=int, default=5000,
+                        help="records loaded with the row-by-row baseline (0 to skip)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="rights360-bench-")
+    os.chdir(workdir)  # database.py uses a relative SQLite path
+    sys.path.insert(0, BACKEND_DIR)
+    from database import SessionLocal, create_tables
+    from services.content_io import import_file, iter_export
+
+    source = os.path.join(workdir, "bank.jsonl")
+    generate(source, args.topics, args.quizzes)
+    create_tables()
+    total = args.topics + args.quizzes
+    results = {"records": total}
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        with open(source, encoding="utf-8") as f:
+            report = import_file(db, f, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - started
+        results["import_seconds"] = round(elapsed, 3)
+        results["import_records_per_second"] = round(total / elapsed)
+        results["import_errors"] = report.error_count
+
+        # Second pass hits ON CONFLICT for every row
+        started = time.perf_counter()
+        with open(source, encoding="utf-8") as f:
+            import_file(db, f, batch_size=args.batch_size)
+        results["reimport_seconds"] = round(time.perf_counter() - started, 3)
+
+        started = time.perf_counter()
+        exported = sum(1 for _ in iter_export(db))
+        elapsed = time.perf_counter() - started
+        results["export_seconds"] = round(elapsed, 3)
+        results["export_records_per_second"] = round(exported / elapsed)
+    finally:
+        db.close()
+
+    if args.baseline_sample:
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from database import Base
+
+        engine = create_engine(f"sqlite:///{os.path.join(workdir, 'baseline.db')}")
+        Base.metadata.create_all(bind=engine)
+        sample = min(args.baseline_sample, total)
+        db = sessionmaker(bind=engine)()
+        try:
+            started = time.perf_counter()
+            row_by_row(db, source, sample)
+            elapsed = time.perf_counter() - started
+        finally:
+            db.close()
+        results["row_by_row_sample"] = sample
+        results["row_by_row_records_per_second"] = round(sample / elapsed)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
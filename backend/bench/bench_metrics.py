@@ -0,0 +1,79 @@
+"""
+Benchmark the per-request overhead of MetricsMiddleware
+
+Drives a minimal ASGI app directly (no sockets, no HTTP parsing) with and
+without the middleware, so the difference is the cost of the instrumentation
+alone. The budget is 20 µs per request.
+
+Run from the backend directory:
+    python -m bench.bench_metrics --requests 200000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from services import metrics
+
+BUDGET_US = 20.0
+
+
+class _Route:
+    path_format = "/api/quiz/{quiz_id}"
+
+
+async def app(scope, receive, send):
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def drive(target, requests: int) -> float:
+    started = time.perf_counter()
+    for i in range(requests):
+        scope = {"type": "http", "method": "GET", "path": f"/api/quiz/{i % 500}"}
+        await target(scope, receive, send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    instrumented = metrics.MetricsMiddleware(app, groups=["/api/auth", "/api/legal", "/api/quiz", "/api/ai", "/api/admin"])
+    overheads = []
+    for _ in range(args.runs):
+        bare_us = asyncio.run(drive(app, args.requests))
+        wrapped_us = asyncio.run(drive(instrumented, args.requests))
+        overheads.append(wrapped_us - bare_us)
+
+    started = time.perf_counter()
+    metrics.render()
+    render_ms = (time.perf_counter() - started) * 1000
+
+    overhead = statistics.median(overheads)
+    print(json.dumps({
+        "requests": args.requests,
+        "overhead_us_median": round(overhead, 3),
+        "overhead_us_runs": [round(value, 3) for value in overheads],
+        "render_ms": round(render_ms, 3),
+        "budget_us": BUDGET_US,
+        "within_budget": overhead < BUDGET_US,
+    }, indent=2))
+    raise SystemExit(0 if overhead < BUDGET_US else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Benchmark JSON serialization of the list endpoints
+
+Seeds a throwaway database with N topics, one topic with N quizzes and one
+user with N quiz results, then times each list endpoint two ways through the
+test client:
+
+- legacy: ORM rows -> Pydantic objects -> response_model validation ->
+  stdlib JSON (the previous handlers, mounted on a side app)
+- fast: column tuples -> orjson bytes (the real app), plus the cached
+  topic listing served as pre-encoded bytes
+
+Both bodies are checked for equality before timing.
+
+Run from the backend directory:
+    python -m bench.bench_serialization --rows 1000 10000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def seed(n):
+    from datetime import datetime, timedelta
+
+    from database import create_tables, engine
+    from models.topic_model import LegalTopic, Quiz, QuizResult
+    from models.user_model import User
+
+    create_tables()
+    with engine.begin() as conn:
+        conn.execute(LegalTopic.__table__.insert(), [
+            {"id": i, "slug": f"topic-{i}", "title": f"Topic {i}", "description": f"About topic {i}",
+             "content": "Know your rights. " * 40, "difficulty_level": "beginner",
+             "category": f"Category {i % 8}", "tags": '["a", "b"]', "is_published": True}
+            for i in range(1, n + 1)
+        ])
+        conn.execute(Quiz.__table__.insert(), [
+            {"id": i, "topic_id": 1, "question": f"Question {i}?", "options": '["A", "B", "C", "D"]',
+             "correct_answer": i % 4, "explanation": "Because.", "difficulty": "medium"}
+            for i in range(1, n + 1)
+        ])
+        conn.execute(User.__table__.insert(), [{"id": 1, "email": "bench@example.com", "name": "Bench",
+                                                "hashed_password": "", "is_active": True}])
+        started = datetime(2024, 1, 1, 12, 0, 0)
+        conn.execute(QuizResult.__table__.insert(), [
+            {"user_id": 1, "quiz_id": (i % n) + 1, "selected_answer": i % 4, "is_correct": i % 3 == 0,
+             "time_taken": 5 + i % 60, "created_at": started + timedelta(seconds=i)}
+            for i in range(n)
+        ])
+
+
+def legacy_app():
+    """The handlers as they were before the fast path, for comparison"""
+    from fastapi import Depends, FastAPI
+    from pydantic import BaseModel
+    from sqlalchemy.orm import Session
+
+    from database import get_db
+    from models.topic_model import LegalTopic, Quiz, QuizResult
+    from routers.legal_topics import TopicResponse
+    from services import catalog
+
+    class QuizResponse(BaseModel):
+        id: int
+        topic_id: int
+        question: str
+        options: List[str]
+        explanation: Optional[str] = None
+        difficulty: str
+
+    app = FastAPI()
+
+    @app.get("/topics", response_model=List[TopicResponse])
+    def topics(db: Session = Depends(get_db)):
+        return db.query(LegalTopic).filter(LegalTopic.is_published == True).all()
+
+    @app.get("/quizzes/{topic_id}", response_model=List[QuizResponse])
+    def quizzes(topic_id: int, limit: int = 10, db: Session = Depends(get_db)):
+        db.query(LegalTopic).filter(LegalTopic.id == topic_id).first()
+        # Tuned difficulties come from the catalog, as in the real app
+        snapshot = catalog.current()
+        rows = db.query(Quiz).filter(Quiz.topic_id == topic_id).limit(limit).all()
+        return [QuizResponse(id=q.id, topic_id=q.topic_id, question=q.question, options=json.loads(q.options),
+                             explanation=q.explanation, difficulty=snapshot.quizzes[q.id].effective_difficulty)
+                for q in rows]
+
+    @app.get("/results", response_model=List[dict])
+    def results(db: Session = Depends(get_db)):
+        return [
+            {"quiz_id": r.quiz_id, "is_correct": r.is_correct, "selected_answer": r.selected_answer,
+             "time_taken": r.time_taken, "created_at": r.created_at.isoformat()}
+            for r in db.query(QuizResult).filter(QuizResult.user_id == 1).all()
+        ]
+
+    return app
+
+
+def timed(client, url, runs, before=None):
+    samples = []
+    for _ in range(runs):
+        if before:
+            before()
+        started = time.perf_counter()
+        response = client.get(url)
+        samples.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+    return statistics.median(samples), response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args()
+
+    if len(args.rows) > 1:
+        # One interpreter per size: fresh database, engine and caches
+        results = []
+        for n in args.rows:
+            output = subprocess.run(
+                [sys.executable, "-m", "bench.bench_serialization", "--rows", str(n), "--runs", str(args.runs)],
+                cwd=BACKEND_DIR, stdout=subprocess.PIPE, text=True, check=True,
+            ).stdout
+            results.append(json.loads(output))
+        print(json.dumps({"orjson": results[0]["orjson"], "results": [row for r in results for row in r["results"]]}, indent=2))
+        return
+
+    n = args.rows[0]
+    workdir = tempfile.mkdtemp(prefix="rights360-serial-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'serial.db')}"
+    sys.path.insert(0, BACKEND_DIR)
+    seed(n)
+
+    from fastapi.testclient import TestClient
+
+    import main as app_module
+    from routers.auth import get_current_user
+    from models.user_model import User
+    from services.cache import get_cache
+    from services.fast_json import orjson
+
+    app_module.app.dependency_overrides[get_current_user] = lambda: User(id=1, email="bench@example.com")
+    fast = TestClient(app_module.app)
+    legacy = TestClient(legacy_app())
+
+    cases = [
+        ("topics", "/topics", "/api/legal/topics", get_cache().clear),
+        ("topics (cached bytes)", "/topics", "/api/legal/topics", None),
+        ("quizzes", f"/quizzes/1?limit={n}", f"/api/quiz/topic/1?limit={n}", None),
+        ("results", "/results", "/api/quiz/results", None),
+    ]
+    report = []
+    for name, legacy_url, fast_url, before in cases:
+        legacy_ms, legacy_response = timed(legacy, legacy_url, args.runs)
+        fast_ms, fast_response = timed(fast, fast_url, args.runs, before)
+        if legacy_response.json() != fast_response.json():
+            raise SystemExit(f"{name}: fast and legacy bodies differ")
+        report.append({
+            "rows": n, "endpoint": name, "legacy_ms": round(legacy_ms, 3), "fast_ms": round(fast_ms, 3),
+            "speedup": round(legacy_ms / fast_ms, 2), "bytes": len(fast_response.content),
+        })
+        print(f"{n:>6} {name:24s} legacy {legacy_ms:9.2f} ms   fast {fast_ms:9.2f} ms   x{legacy_ms / fast_ms:.2f}",
+              file=sys.stderr)
+
+    print(json.dumps({"orjson": orjson is not None, "results": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark worker cold start: import time of the app and lifespan startup
+
+Each sample runs in a fresh interpreter so nothing is cached in-process.
+Reports the median of several runs plus the slowest modules from
+`python -X importtime`.
+
+Run from the backend directory:
+    python -m bench.bench_startup --runs 7
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app):
+    ready = time.perf_counter()
+import sys
+print((imported - started) * 1000, (ready - imported) * 1000, len(sys.modules))
+"""
+
+
+def run_probe(workdir):
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR, PYTHONDONTWRITEBYTECODE="0")
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=workdir, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return float(output[-3]), float(output[-2]), int(output[-1])
+
+
+def slowest_imports(workdir, top):
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR)
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"], cwd=workdir, env=env,
+        capture_output=True, text=True, check=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    rows.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": cum / 1000, "self_ms": own / 1000} for cum, own, name in rows[:top]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="rights360-bench-")
+    run_probe(workdir)  # warm the bytecode cache and create the database once
+
+    samples = [run_probe(workdir) for _ in range(args.runs)]
+    print(json.dumps({
+        "runs": args.runs,
+        "import_main_ms": round(statistics.median(s[0] for s in samples), 1),
+        "lifespan_startup_ms": round(statistics.median(s[1] for s in samples), 1),
+        "modules_loaded": samples[-1][2],
+        "slowest_imports": slowest_imports(workdir, args.top),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Check that concurrent identical reads are coalesced
+
+Seeds a throwaway database (as bench.query_budgets does) with --students
+accounts, then fires bursts of that many concurrent requests for the same
+topic body and the same quiz list, each burst starting from cold caches and
+an unloaded catalog. Topic and quiz content is read through the catalog
+(services.catalog), so counts the catalog's topic and quiz statements the
+database actually sees per burst, and exits non-zero when any burst ran
+either more than once.
+
+Run from the backend directory:
+    python -m bench.coalescing --students 300 --bursts 3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Statement fragments identifying each coalesced read
+PROBES = {
+    "catalog_topics": "FROM legal_topics",
+    "catalog_quizzes": "FROM quizzes LEFT OUTER JOIN quiz_stats",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=300, help="concurrent requests per burst")
+    parser.add_argument("--bursts", type=int, default=3)
+    args = parser.parse_args()
+
+    sys.path.insert(0, BACKEND_DIR)
+    from bench.query_budgets import setup
+
+    setup(tempfile.mkdtemp(prefix="rights360-coalescing-"))
+    os.environ.pop("RIGHTS360_DEBUG", None)
+    # Let the whole burst reach the handlers instead of being turned away with 429/503
+    for name in ("LEGAL", "QUIZ"):
+        os.environ[f"RIGHTS360_BULKHEAD_{name}"] = str(args.students)
+
+    import httpx
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    import main as app_module
+    from database import SessionLocal, engine
+    from models.topic_model import LegalTopic
+    from models.user_model import User
+    from routers.auth import create_access_token
+    from routers.legal_topics import topic_reads
+    from routers.quizzes import quiz_lists
+    from services import catalog, overload
+    from services.cache import get_cache
+
+    overload.limiter.limit = overload.limiter.minimum = overload.limiter.maximum = float(args.students)
+
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"name": f"student {n}", "email": f"student-{n}@example.com", "hashed_password": "", "is_active": True}
+            for n in range(args.students)
+        ])
+    db = SessionLocal()
+    try:
+        topic_id, slug = db.query(LegalTopic.id, LegalTopic.slug).filter(LegalTopic.is_published == True).first()
+    finally:
+        db.close()
+    headers = [{"Authorization": f"Bearer {create_access_token({'sub': f'student-{n}@example.com'})}"}
+               for n in range(args.students)]
+
+    counts = {name: 0 for name in PROBES}
+
+    # Every engine: the catalog loads through its own unpooled one
+    @event.listens_for(Engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        for name, fragment in PROBES.items():
+            if fragment in statement:
+                counts[name] += 1
+
+    async def burst(client, url):
+        for name in counts:
+            counts[name] = 0
+        get_cache().clear()
+        catalog._snapshot = None
+        topic_reads.forget()
+        quiz_lists.forget()
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(client.get(url, headers=h) for h in headers))
+        elapsed = time.perf_counter() - started
+        statuses = sorted({response.status_code for response in responses})
+        return {"url": url, "requests": len(responses), "statuses": statuses,
+                "elapsed_ms": round(elapsed * 1000, 1), **counts}
+
+    async def run():
+        import anyio.to_thread
+
+        # One thread per student as well: with fewer threads than requests, requests holding a pooled
+        # connection between dependencies queue behind ones waiting for a connection
+        anyio.to_thread.current_default_thread_limiter().total_tokens = args.students + 8
+        transport = httpx.ASGITransport(app=app_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            results = []
+            for _ in range(args.bursts):
+                results.append(await burst(client, f"/api/legal/topics/{slug}"))
+                results.append(await burst(client, f"/api/quiz/topic/{topic_id}"))
+            return results
+
+    results = asyncio.run(run())
+    print(json.dumps(results, indent=2))
+    failed = [r for r in results if r["statuses"] != [200] or any(r[name] > 1 for name in PROBES)]
+    if failed:
+        raise SystemExit(f"{len(failed)} burst(s) were not coalesced into a single query")
+    print(f"Checked {len(results)} bursts of {args.students} requests: one query each", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Generate a synthetic database at production scale
+
+Creates users, published topics and quizzes, then QuizResult and
+UserProgress history with Core bulk inserts in large transactions, and
+finally rebuilds the derived spaced-repetition and difficulty tables so
+every endpoint sees consistent data. A million results take well under a
+minute on SQLite.
+
+Every generated user has the password BENCH_PASSWORD; user n is
+bench-user-<n>@example.com.
+
+Run from the backend directory:
+    python -m bench.datagen --db /tmp/bench.db --users 10000 --results 2000000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCH_PASSWORD = "bench123"
+CATEGORIES = ["Consumer Rights", "Tenant Rights", "Cyber Law", "Workplace Rights", "Family Law", "Civic Rights"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+CHUNK = 50000
+
+
+def user_email(n: int) -> str:
+    return f"bench-user-{n}@example.com"
+
+
+def _insert_chunked(conn, table, rows):
+    for start in range(0, len(rows), CHUNK):
+        conn.execute(table.insert(), rows[start:start + CHUNK])
+
+
+def _rows(columns, arrays):
+    """Turn equal-length column arrays into insert dicts"""
+    return [dict(zip(columns, values)) for values in zip(*(array.tolist() for array in arrays))]
+
+
+def generate(n_users: int, n_topics: int, quizzes_per_topic: int, n_results: int,
+             progress_per_user: int, seed: int = 42, derived: bool = True) -> dict:
+    from database import create_tables, engine, SessionLocal
+    from models.user_model import User, UserProgress
+    from models.topic_model import LegalTopic, Quiz, QuizResult
+    from routers.auth import get_password_hash
+
+    rng = np.random.default_rng(seed)
+    timings = {}
+    create_tables()
+    started = time.perf_counter()
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+
+        # Hashing is deliberately slow, so every user shares one hash
+        password_hash = get_password_hash(BENCH_PASSWORD)
+        first_user = (conn.execute(User.__table__.select().with_only_columns(User.id).order_by(User.id.desc())).scalar() or 0) + 1
+        user_ids = np.arange(first_user, first_user + n_users)
+        _insert_chunked(conn, User.__table__, [
+            {"id": int(uid), "email": user_email(int(uid)), "name": f"Bench User {uid}",
+             "hashed_password": password_hash, "is_active": True, "is_verified": True}
+            for uid in user_ids
+        ])
+
+        first_topic = (conn.execute(LegalTopic.__table__.select().with_only_columns(LegalTopic.id).order_by(LegalTopic.id.desc())).scalar() or 0) + 1
+        topic_ids = np.arange(first_topic, first_topic + n_topics)
+        _insert_chunked(conn, LegalTopic.__table__, [
+            {"id": int(tid), "slug": f"bench-topic-{tid}", "title": f"Bench Topic {tid}",
+             "description": f"Synthetic topic {tid}", "content": "Know your rights. " * 60,
+             "difficulty_level": ("beginner", "intermediate", "advanced")[tid % 3],
+             "category": CATEGORIES[tid % len(CATEGORIES)],
+             "tags": json.dumps([f"tag{tid % 40}", f"tag{tid % 9}"]), "is_published": True}
+            for tid in topic_ids.tolist()
+        ])
+
+        first_quiz = (conn.execute(Quiz.__table__.select().with_only_columns(Quiz.id).order_by(Quiz.id.desc())).scalar() or 0) + 1
+        n_quizzes = n_topics * quizzes_per_topic
+        quiz_ids = np.arange(first_quiz, first_quiz + n_quizzes)
+        quiz_topics = np.repeat(topic_ids, quizzes_per_topic)
+        correct = rng.integers(0, 4, n_quizzes)
+        options = json.dumps(["Option A", "Option B", "Option C", "Option D"])
+        _insert_chunked(conn, Quiz.__table__, [
+            {"id": qid, "topic_id": tid, "question": f"Bench question {qid}?", "options": options,
+             "correct_answer": answer, "explanation": "Synthetic explanation.",
+             "difficulty": DIFFICULTIES[qid % 3]}
+            for qid, tid, answer in zip(quiz_ids.tolist(), quiz_topics.tolist(), correct.tolist())
+        ])
+        timings["content_s"] = time.perf_counter() - started
+
+        # Results: popular quizzes get more attempts (Zipf-like), harder ones fail more
+        step = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        popularity = 1.0 / np.arange(1, n_quizzes + 1) ** 0.8
+        popularity /= popularity.sum()
+        for start in range(0, n_results, CHUNK * 4):
+            size = min(CHUNK * 4, n_results - start)
+            quiz_index = rng.choice(n_quizzes, size, p=popularity)
+            is_correct = rng.random(size) < np.array([0.85, 0.6, 0.35])[quiz_ids[quiz_index] % 3]
+            wrong = (correct[quiz_index] + rng.integers(1, 4, size)) % 4
+            created = [now - timedelta(seconds=int(s)) for s in rng.integers(0, 180 * 86400, size)]
+            _insert_chunked(conn, QuizResult.__table__, _rows(
+                ("user_id", "quiz_id", "selected_answer", "is_correct", "time_taken", "created_at"),
+                (rng.choice(user_ids, size), quiz_ids[quiz_index], np.where(is_correct, correct[quiz_index], wrong),
+                 is_correct, rng.gamma(2.0, 12.0, size).astype(int) + 2, np.array(created, dtype=object)),
+            ))
+        timings["results_s"] = time.perf_counter() - step
+
+        # Progress: each user has opened a few distinct topics
+        step = time.perf_counter()
+        per_user = min(progress_per_user, n_topics)
+        progress_rows = []
+        for uid in user_ids.tolist():
+            for tid in rng.choice(topic_ids, per_user, replace=False).tolist():
+                percentage = int(rng.integers(0, 101))
+                progress_rows.append({"user_id": uid, "topic_id": tid, "progress_percentage": percentage,
+                                      "completed": percentage == 100})
+        _insert_chunked(conn, UserProgress.__table__, progress_rows)
+        timings["progress_s"] = time.perf_counter() - step
+
+    if derived:
+        from services.quiz_stats import rebuild_quiz_stats
+        from services.spaced_repetition import rebuild_review_states
+
+        step = time.perf_counter()
+        db = SessionLocal()
+        try:
+            rebuild_review_states(db)
+            rebuild_quiz_stats(db)
+        finally:
+            db.close()
+        timings["derived_s"] = time.perf_counter() - step
+
+    timings["total_s"] = time.perf_counter() - started
+    return {
+        "users": n_users, "topics": n_topics, "quizzes": n_quizzes,
+        "results": n_results, "progress": len(progress_rows),
+        "first_user_id": int(first_user), "first_topic_id": int(first_topic),
+        "timings": {key: round(value, 3) for key, value in timings.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", required=True, help="SQLite file to create or extend")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--topics", type=int, default=60)
+    parser.add_argument("--quizzes-per-topic", type=int, default=25)
+    parser.add_argument("--results", type=int, default=200000)
+    parser.add_argument("--progress-per-user", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-derived", action="store_true", help="skip rebuilding review states and stats")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.db)}"
+    sys.path.insert(0, BACKEND_DIR)
+    report = generate(args.users, args.topics, args.quizzes_per_topic, args.results,
+                      args.progress_per_user, args.seed, not args.no_derived)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Async load driver for the API
+
+Replays a weighted mix of user journeys (browse topics, open a topic, fetch
+its quizzes, get the next quiz, submit answers, ask the assistant) against
+the app in-process through httpx's ASGI transport, with N concurrent virtual
+users. Reports throughput, latency percentiles, SQL query counts and
+(compressed) bytes on the wire per endpoint as JSON, so runs on different
+commits can be compared.
+
+Point it at a database from bench.datagen (or any seeded database):
+
+    python -m bench.datagen --db /tmp/bench.db --users 2000 --results 1000000
+    python -m bench.load --db /tmp/bench.db --concurrency 32 --duration 30 --output run.json
+
+Tokens are minted directly for the bench users, so bcrypt logins do not
+dominate the numbers; the login endpoint is in the mix at a low weight.
+Rejected requests (429/503/504) are counted and the virtual user then waits
+out Retry-After before its next request.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Relative frequency of each action in the mix
+MIX = {
+    "browse_topics": 20,
+    "list_categories": 5,
+    "open_topic": 15,
+    "topic_quizzes": 20,
+    "next_quiz": 10,
+    "submit_answer": 25,
+    "ask_assistant": 4,
+    "login": 1,
+}
+
+QUESTIONS = [
+    "What are my consumer rights?",
+    "What are my rights as a tenant?",
+    "What is cyberbullying?",
+    "What is a contract?",
+    "Can my landlord keep my deposit?",
+]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+class Catalog:
+    """Ids the virtual users pick from, loaded once from the database"""
+
+    def __init__(self, db, max_users):
+        from models.user_model import User
+        from models.topic_model import LegalTopic, Quiz
+
+        self.topics = db.query(LegalTopic.id, LegalTopic.slug).filter(LegalTopic.is_published == True).all()
+        self.quizzes_by_topic = defaultdict(list)
+        for quiz_id, topic_id, options in db.query(Quiz.id, Quiz.topic_id, Quiz.options):
+            self.quizzes_by_topic[topic_id].append((quiz_id, len(json.loads(options))))
+        self.users = [email for (email,) in db.query(User.email).filter(User.email.like("bench-user-%")).limit(max_users)]
+        if not self.users:
+            self.users = [email for (email,) in db.query(User.email).limit(max_users)]
+        if not self.topics or not self.users:
+            raise SystemExit("Database has no topics or users; run bench.datagen first")
+
+
+class VirtualUser:
+    def __init__(self, client, catalog, email, token, rng):
+        self.client = client
+        self.catalog = catalog
+        self.email = email
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.rng = rng
+
+    def _topic(self):
+        return self.rng.choice(self.catalog.topics)
+
+    async def run(self, action):
+        client, rng = self.client, self.rng
+        if action == "browse_topics":
+            return await client.get("/api/legal/topics")
+        if action == "list_categories":
+            return await client.get("/api/legal/categories")
+        if action == "open_topic":
+            return await client.get(f"/api/legal/topics/{self._topic()[1]}", headers=self.headers)
+        if action == "topic_quizzes":
+            return await client.get(f"/api/quiz/topic/{self._topic()[0]}", headers=self.headers)
+        if action == "next_quiz":
+            return await client.get("/api/quiz/next", headers=self.headers)
+        if action == "submit_answer":
+            quizzes = self.catalog.quizzes_by_topic.get(self._topic()[0]) or [(1, 4)]
+            quiz_id, option_count = rng.choice(quizzes)
+            body = {"quiz_id": quiz_id, "selected_answer": rng.randrange(option_count),
+                    "time_taken": rng.randint(3, 90)}
+            return await client.post("/api/quiz/submit", json=body, headers=self.headers)
+        if action == "ask_assistant":
+            return await client.post("/api/ai/assistant", json={"message": rng.choice(QUESTIONS)}, headers=self.headers)
+        if action == "login":
+            from bench.datagen import BENCH_PASSWORD
+            return await client.post("/api/auth/login", data={"username": self.email, "password": BENCH_PASSWORD})
+        raise ValueError(action)
+
+
+async def drive(app, catalog, concurrency, duration, max_requests, seed):
+    import httpx
+
+    from routers.auth import create_access_token
+
+    samples = defaultdict(list)  # action -> [(seconds, status, queries, bytes on the wire)]
+    actions = list(MIX)
+    weights = [MIX[action] for action in actions]
+    deadline = time.perf_counter() + duration
+    issued = 0
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def user_loop(index):
+            nonlocal issued
+            rng = random.Random(seed + index)
+            email = catalog.users[index % len(catalog.users)]
+            user = VirtualUser(client, catalog, email, create_access_token({"sub": email}), rng)
+            while time.perf_counter() < deadline and (not max_requests or issued < max_requests):
+                issued += 1
+                action = rng.choices(actions, weights)[0]
+                started = time.perf_counter()
+                try:
+                    response = await user.run(action)
+                    status, queries = response.status_code, response.headers.get("x-db-queries")
+                    wire_bytes = response.num_bytes_downloaded
+                except Exception:
+                    status, queries, wire_bytes = 599, None, 0
+                samples[action].append((time.perf_counter() - started, status, int(queries) if queries else None,
+                                        wire_bytes))
+                if status in (429, 503, 504):
+                    # Back off like a well-behaved client instead of retrying in a tight loop
+                    await asyncio.sleep(float(response.headers.get("retry-after", 1)))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user_loop(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return samples, elapsed
+
+
+def summarize(samples, elapsed):
+    def stats(rows):
+        latencies = sorted(row[0] * 1000 for row in rows)
+        queries = [row[2] for row in rows if row[2] is not None]
+        return {
+            "requests": len(rows),
+            "errors": sum(1 for row in rows if row[1] >= 500),
+            "client_errors": sum(1 for row in rows if 400 <= row[1] < 500),
+            "throughput_rps": round(len(rows) / elapsed, 2) if elapsed else None,
+            "p50_ms": round(percentile(latencies, 0.50), 3) if latencies else None,
+            "p95_ms": round(percentile(latencies, 0.95), 3) if latencies else None,
+            "p99_ms": round(percentile(latencies, 0.99), 3) if latencies else None,
+            "max_ms": round(latencies[-1], 3) if latencies else None,
+            "queries_mean": round(sum(queries) / len(queries), 2) if queries else None,
+            "queries_max": max(queries) if queries else None,
+            "wire_bytes_mean": round(sum(row[3] for row in rows) / len(rows)) if rows else None,
+        }
+
+    everything = [row for rows in samples.values() for row in rows]
+    return {"overall": stats(everything), "endpoints": {action: stats(rows) for action, rows in sorted(samples.items())}}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", required=True, help="SQLite database to run against (it is written to)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds")
+    parser.add_argument("--requests", type=int, default=0, help="stop after this many requests (0 = no limit)")
+    parser.add_argument("--users", type=int, default=500, help="distinct accounts to spread load over")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.db)}"
+    os.environ["RIGHTS360_DEBUG"] = "1"  # X-DB-Queries headers
+    # A few hundred virtual users share the assistant; keep the per-user limit out of the numbers
+    os.environ.setdefault("RIGHTS360_AI_RATE_PER_MINUTE", "100000")
+    sys.path.insert(0, BACKEND_DIR)
+    import logging
+    logging.getLogger("services.query_stats").setLevel(logging.WARNING)
+
+    import main as app_module
+    from database import SessionLocal, create_tables
+    from services import lifecycle
+
+    create_tables()
+    lifecycle.run_startup()
+    db = SessionLocal()
+    try:
+        catalog = Catalog(db, args.users)
+    finally:
+        db.close()
+
+    try:
+        samples, elapsed = asyncio.run(drive(app_module.app, catalog, args.concurrency, args.duration,
+                                             args.requests, args.seed))
+    finally:
+        lifecycle.run_shutdown()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {"concurrency": args.concurrency, "duration_s": round(elapsed, 3), "mix": MIX,
+                   "users": len(catalog.users), "topics": len(catalog.topics)},
+        **summarize(samples, elapsed),
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
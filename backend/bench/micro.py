@@ -0,0 +1,301 @@
+"""
+Microbenchmarks for hot functions, with stored baselines
+
+Times each function in BENCHMARKS (calibrated loop count, several repeats)
+and reports µs per call. `save` stores the results as a baseline and
+`compare` re-runs them and fails when any benchmark got slower than the
+baseline by more than --threshold percent.
+
+Baselines are per machine (bench/baselines/micro-<hostname>.json by
+default), since timings from different hardware are not comparable.
+
+Run from the backend directory:
+    python -m bench.micro run
+    python -m bench.micro save
+    python -m bench.micro compare --threshold 10
+    python -m bench.micro compare -k jwt        # only names containing "jwt"
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(BACKEND_DIR, "bench", "baselines", f"micro-{platform.node() or 'local'}.json")
+
+# name -> setup function returning the zero-argument callable to time
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _sample_topics(n=50):
+    from models.topic_model import LegalTopic
+
+    return [
+        LegalTopic(id=i, title=f"Topic {i}", slug=f"topic-{i}", description="A short description",
+                   content="Know your rights. " * 80, difficulty_level="beginner", category="Consumer Rights",
+                   tags='["consumer", "rights"]', is_published=True)
+        for i in range(n)
+    ]
+
+
+@benchmark("assistant.common_question_hit")
+def _common_question_hit():
+    from services.gemini_service import gemini_service
+
+    return lambda: gemini_service._check_common_questions("Can you tell me about tenant rights in my city?")
+
+
+@benchmark("assistant.common_question_miss")
+def _common_question_miss():
+    from services.gemini_service import gemini_service
+
+    return lambda: gemini_service._check_common_questions("How do I register a small business partnership?")
+
+
+@benchmark("assistant.common_question_typo")
+def _common_question_typo():
+    from services.gemini_service import gemini_service
+
+    gemini_service._check_common_questions("warmup")
+    return lambda: gemini_service._check_common_questions("what are my rights as a tennant")
+
+
+def _keywords(n=10000):
+    import random
+
+    rng = random.Random(11)
+    return ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(5, 12))) for _ in range(n)]
+
+
+@benchmark("spelling.symspell_10k")
+def _symspell_lookup():
+    from services.spelling import SymSpell
+
+    speller = SymSpell()
+    words = _keywords()
+    for word in words:
+        speller.add(word)
+    typo = words[1234][:3] + words[1234][4:]
+    return lambda: speller.lookup(typo)
+
+
+@benchmark("spelling.levenshtein_scan_10k")
+def _levenshtein_scan():
+    from services.spelling import edit_distance
+
+    words = _keywords()
+    typo = words[1234][:3] + words[1234][4:]
+    return lambda: min(words, key=lambda word: edit_distance(typo, word, 2))
+
+
+@benchmark("quiz.parse_options")
+def _parse_options():
+    options = json.dumps(["Option A is correct", "Option B", "Option C", "Option D"])
+    return lambda: json.loads(options)
+
+
+@benchmark("quiz.grade_and_schedule")
+def _grade_and_schedule():
+    from models.quiz_model import QuizReviewState
+    from services.spaced_repetition import apply_review, grade_quality
+
+    state = QuizReviewState(user_id=1, quiz_id=1)
+    now = datetime.now(timezone.utc)
+
+    def grade():
+        is_correct = 2 == 2
+        apply_review(state, grade_quality(is_correct, 8), now)
+        state.repetitions = 0
+    return grade
+
+
+@benchmark("exams.page_10")
+def _exam_page():
+    from array import array
+
+    from services import exams
+    from services.catalog import Catalog, QuizRecord
+
+    quizzes = {
+        i: QuizRecord(i, i % 50, f"Question {i}?", ("Option A", "Option B", "Option C", "Option D"), i % 4, None,
+                      "easy", None)
+        for i in range(1, 2001)
+    }
+    snapshot = Catalog(1, {}, quizzes)
+    deck = exams.Deck(1, 1, 12345, array("I", range(1, 41)), datetime.now(timezone.utc))
+    return lambda: exams.page(deck, snapshot, 1, 10)
+
+
+@benchmark("auth.jwt_encode")
+def _jwt_encode():
+    from routers.auth import create_access_token
+
+    return lambda: create_access_token({"sub": "bench@example.com"})
+
+
+@benchmark("auth.jwt_decode")
+def _jwt_decode():
+    from jose import jwt
+
+    from routers.auth import ALGORITHM, SECRET_KEY, create_access_token
+
+    token = create_access_token({"sub": "bench@example.com"})
+    # The decode half of get_current_user (the user lookup is a DB query)
+    return lambda: jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+
+@benchmark("auth.password_hash")
+def _password_hash():
+    from routers.auth import get_password_hash
+
+    return lambda: get_password_hash("correct horse battery staple")
+
+
+@benchmark("serialize.topic_list_50")
+def _serialize_topics():
+    from pydantic import TypeAdapter
+    from typing import List
+
+    from routers.legal_topics import TopicResponse
+
+    topics = _sample_topics()
+    adapter = TypeAdapter(List[TopicResponse])
+    return lambda: adapter.dump_json([TopicResponse.model_validate(topic) for topic in topics])
+
+
+@benchmark("suggest.prefix_100k")
+def _suggest_prefix():
+    import random
+
+    from services.suggest import PrefixIndex, Suggestion, _entries
+
+    rng = random.Random(7)
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9))) for _ in range(5000)]
+    suggestions = [Suggestion(" ".join(rng.sample(words, 3)), "topic", f"topic-{i}", (i,)) for i in range(34000)]
+    index = PrefixIndex(_entries(suggestions), {i: rng.randint(0, 500) for i in range(34000)})
+    return lambda: index.search("a", 8)
+
+
+@benchmark("compression.gzip_topic_body")
+def _gzip_topic_body():
+    from services.compression import compress
+    from services.fast_json import dumps
+
+    body = dumps({"id": 1, "title": "Topic", "content": "Know your rights. " * 200, "tags": '["a"]'})
+    return lambda: compress(body, "gzip")
+
+
+@benchmark("compression.negotiate")
+def _negotiate():
+    from services.compression import negotiate
+
+    return lambda: negotiate("gzip, deflate, br;q=0.9, zstd;q=0.8, *;q=0.1")
+
+
+def measure(func: Callable[[], object], repeats: int = 5, min_time: float = 0.1) -> Dict:
+    """Time `func`: calibrate a loop count, then report per-call µs over several repeats"""
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or loops >= 1 << 24:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    per_call = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        per_call.append((time.perf_counter() - started) / loops * 1e6)
+    return {
+        "median_us": round(statistics.median(per_call), 4),
+        "min_us": round(min(per_call), 4),
+        "stdev_us": round(statistics.stdev(per_call), 4) if len(per_call) > 1 else 0.0,
+        "loops": loops,
+    }
+
+
+def run(name_filter: str = "", repeats: int = 5, min_time: float = 0.1) -> Dict[str, Dict]:
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = measure(setup(), repeats, min_time)
+        print(f"{name:36s} {results[name]['median_us']:12.3f} µs", file=sys.stderr)
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float):
+    """Return (report rows, regressed names) comparing medians"""
+    rows, regressed = [], []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            rows.append({"name": name, "median_us": result["median_us"], "baseline_us": None, "change_pct": None})
+            continue
+        change = (result["median_us"] - base["median_us"]) / base["median_us"] * 100
+        rows.append({"name": name, "median_us": result["median_us"], "baseline_us": base["median_us"],
+                     "change_pct": round(change, 2)})
+        if change > threshold:
+            regressed.append(name)
+    return rows, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["run", "save", "compare"])
+    parser.add_argument("-k", dest="name_filter", default="", help="only benchmarks whose name contains this")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed slowdown in percent")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.1, help="seconds per repeat")
+    args = parser.parse_args()
+
+    sys.path.insert(0, BACKEND_DIR)
+    results = run(args.name_filter, args.repeats, args.min_time)
+
+    if args.command == "run":
+        print(json.dumps(results, indent=2))
+    elif args.command == "save":
+        existing = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                existing = json.load(f).get("results", {})
+        existing.update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"machine": platform.node(), "python": platform.python_version(),
+                       "saved_at": datetime.now(timezone.utc).isoformat(), "results": existing}, f, indent=2)
+        print(f"Saved {len(results)} results to {args.baseline}")
+    else:
+        if not os.path.exists(args.baseline):
+            raise SystemExit(f"No baseline at {args.baseline}; run `python -m bench.micro save` first")
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        rows, regressed = compare(results, baseline, args.threshold)
+        for row in rows:
+            change = "new" if row["change_pct"] is None else f"{row['change_pct']:+.1f}%"
+            flag = "  REGRESSION" if row["name"] in regressed else ""
+            print(f"{row['name']:36s} {row['median_us']:12.3f} µs  {change:>8s}{flag}")
+        if regressed:
+            raise SystemExit(f"{len(regressed)} benchmark(s) regressed more than {args.threshold}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Check per-endpoint SQL query budgets
+
+Seeds a throwaway SQLite database with data/seed_content.jsonl, calls each
+endpoint through the test client with RIGHTS360_DEBUG=1 and compares the
+X-DB-Queries / X-DB-Rows headers against BUDGETS. Exits non-zero when any
+endpoint goes over, so a change that, say, lazy-loads LegalTopic.quizzes in
+a loop fails the check.
+
+Run from the backend directory:
+    python -m bench.query_budgets            # check
+    python -m bench.query_budgets --report   # print the current numbers
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (method, path, JSON body, max queries, max rows). Paths are filled with ids
+# from the seeded data; the auth dependency's user lookup is included. Topic
+# and quiz content comes from the in-memory catalog, not the database.
+BUDGETS = [
+    ("GET", "/api/legal/topics", None, 0, 0),
+    ("GET", "/api/legal/categories", None, 0, 0),
+    ("GET", "/api/legal/topics?tag={tag}", None, 0, 0),
+    ("GET", "/api/legal/facets", None, 1, 40),
+    ("GET", "/api/legal/suggest?prefix=rig", None, 0, 0),
+    ("GET", "/api/legal/topics/{slug}", None, 3, 2),
+    ("GET", "/api/legal/topics/{slug}/related", None, 1, 8),
+    ("POST", "/api/legal/topics/{topic_id}/progress", {"progress_percentage": 50}, 2, 2),
+    ("POST", "/api/legal/progress/batch", {"updates": [
+        {"topic_id": "{topic_id}", "progress_percentage": 60},
+        {"topic_id": "{topic_id}", "progress_percentage": 40, "completed": True},
+    ]}, 2, 1),
+    ("GET", "/api/legal/user/progress", None, 2, 10),
+    ("GET", "/api/quiz/random", None, 1, 1),
+    ("GET", "/api/quiz/random?topic_id={topic_id}", None, 1, 1),
+    ("GET", "/api/quiz/next", None, 2, 2),
+    ("GET", "/api/quiz/topic/{topic_id}", None, 1, 1),
+    ("GET", "/api/quiz/topic/{topic_id}/stats", None, 2, 2),
+    ("GET", "/api/quiz/{quiz_id}/stats", None, 2, 2),
+    ("POST", "/api/quiz/submit", {"quiz_id": "{quiz_id}", "selected_answer": 0, "time_taken": 12}, 8, 5),
+    ("GET", "/api/quiz/results", None, 2, 20),
+    ("GET", "/api/auth/me", None, 1, 1),
+    ("GET", "/api/me/recommendations", None, 3, 11),
+    ("GET", "/api/sync", None, 4, 40),
+    ("GET", "/api/sync?since=1", None, 6, 110),
+    ("POST", "/api/exams", {"question_count": 10}, 3, 11),
+    ("GET", "/api/exams/{exam_id}", None, 1, 1),
+    ("POST", "/api/exams/{exam_id}/finish", {"answers": [{"quiz_id": "{quiz_id}", "selected_answer": 0}]}, 3, 1),
+]
+
+# Ids taken from a response for the entries that follow: endpoint -> {id name: response field}
+CAPTURE = {
+    ("POST", "/api/exams"): {"exam_id": "id"},
+}
+
+
+def setup(workdir):
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'budgets.db')}"
+    os.environ["RIGHTS360_DEBUG"] = "1"
+    sys.path.insert(0, BACKEND_DIR)
+
+    from database import SessionLocal, create_tables
+    from models.user_model import User
+    from routers.auth import get_password_hash
+    from services.content_io import import_file
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        with open(os.path.join(BACKEND_DIR, "data", "seed_content.jsonl"), encoding="utf-8") as f:
+            import_file(db, f)
+        db.add(User(name="budget", email="budget@example.com", hashed_password=get_password_hash("budget123"), is_active=True))
+        db.commit()
+    finally:
+        db.close()
+
+
+def fill(value, ids):
+    if isinstance(value, str):
+        filled = value.format(**ids)
+        return int(filled) if filled.isdigit() and value != filled else filled
+    if isinstance(value, dict):
+        return {key: fill(item, ids) for key, item in value.items()}
+    if isinstance(value, list):
+        return [fill(item, ids) for item in value]
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--report", action="store_true", help="print usage without failing")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="rights360-budgets-")
+    setup(workdir)
+
+    from fastapi.testclient import TestClient
+
+    import main as app_module
+    from database import SessionLocal
+    from models.topic_model import LegalTopic, Quiz
+    from services.query_stats import HEADER_QUERIES, HEADER_ROWS, QueryBudgetExceeded, assert_query_budget
+
+    db = SessionLocal()
+    topic = db.query(LegalTopic).order_by(LegalTopic.id).first()
+    quiz = db.query(Quiz).filter(Quiz.topic_id == topic.id).order_by(Quiz.id).first()
+    ids = {"slug": topic.slug, "topic_id": topic.id, "quiz_id": quiz.id,
+           "tag": (json.loads(topic.tags or "[]") or ["none"])[0]}
+    db.close()
+
+    failures, rows = [], []
+    with TestClient(app_module.app) as client:
+        token = client.post("/api/auth/login", data={"username": "budget@example.com", "password": "budget123"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for method, path, body, max_queries, max_rows in BUDGETS:
+            response = client.request(method, fill(path, ids), json=fill(body, ids), headers=headers)
+            if response.status_code >= 400:
+                failures.append(f"{method} {path}: HTTP {response.status_code}")
+                continue
+            ids.update({name: response.json()[field] for name, field in CAPTURE.get((method, path), {}).items()})
+            rows.append({
+                "endpoint": f"{method} {path}",
+                "queries": int(response.headers[HEADER_QUERIES]), "max_queries": max_queries,
+                "rows": int(response.headers[HEADER_ROWS]), "max_rows": max_rows,
+            })
+            try:
+                assert_query_budget(response, max_queries, max_rows)
+            except QueryBudgetExceeded as exc:
+                failures.append(str(exc))
+
+    print(json.dumps(rows, indent=2) if args.report else f"Checked {len(BUDGETS)} endpoints")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures and not args.report:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,34 @@
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, MetaData, inspect, literal
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 import os
+import logging
 
-# Database URL - SQLite
-DATABASE_URL = "sqlite:///./rights360.db"
+# Database URL - SQLite unless DATABASE_URL is set
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./rights360.db")
 
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Only needed for SQLite
+    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}  # Only needed for SQLite
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Own connection per session, outside the request pool: for loads that
+# requests wait on (the catalog's), which must not queue for a connection
+# held by one of those waiting requests
+UnpooledSession = sessionmaker(autocommit=False, autoflush=False, bind=create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
+    poolclass=NullPool
+))
+
 Base = declarative_base()
 
+logger = logging.getLogger(__name__)
+
 # Dependency to get database session
 def get_db():
     db = SessionLocal()
@@ -24,10 +38,49 @@ def get_db():
         db.close()
 
 
+def insert_for(db):
+    """Dialect-specific INSERT that supports ON CONFLICT (upserts)"""
+    if db.bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
 def create_tables():
     """Create all tables in the database"""
     # Import all models to ensure they are registered with Base
-    import models.user_model
-    import models.quiz_model  
-    import models.topic_model
+    import models
+    models.load_all()
     Base.metadata.create_all(bind=engine)
+    # create_all skips existing tables, so add columns and indexes declared since then
+    add_missing_columns()
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except IntegrityError as e:
+                logger.warning("Could not create index %s: %s", index.name, e.orig)
+
+
+def add_missing_columns():
+    """Add model columns that are missing from existing tables"""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+                if column.default is not None and column.default.is_scalar:
+                    value = literal(column.default.arg, column.type).compile(
+                        dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+                    )
+                    ddl += f" DEFAULT {value}"
+                elif not column.nullable:
+                    logger.warning("Skipping NOT NULL column %s.%s without a default", table.name, column.name)
+                    continue
+                conn.exec_driver_sql(ddl)
@@ -5,10 +5,7 @@ Run this script to create tables and populate with sample data
 
 from sqlalchemy.orm import Session
 from database import engine, SessionLocal, create_tables
-from models.user_model import User
-from models.topic_model import LegalTopic, Quiz
-from routers.auth import get_password_hash
-import json
+from services.content_io import import_records
 
 def create_sample_data():
     """Create sample legal topics and quizzes"""
@@ -24,7 +21,7 @@ def create_sample_data():
                 "content": "Gender rights encompass the fundamental human rights that apply to all individuals regardless of their gender identity. These rights include equality before the law, freedom from discrimination, right to education, employment opportunities, and protection from violence. Understanding these rights helps create a more equitable society.",
                 "category": "Civil Rights",
                 "difficulty_level": "beginner",
-                "tags": json.dumps(["gender", "equality", "discrimination", "rights"])
+                "tags": ["gender", "equality", "discrimination", "rights"]
             },
             {
                 "title": "Cyber Laws",
@@ -33,7 +30,7 @@ def create_sample_data():
                 "content": "Cyber laws govern the digital realm and protect individuals from online crimes, harassment, and data breaches. Key areas include privacy protection, intellectual property rights, cyberbullying prevention, and digital financial security. These laws are essential for safe internet usage.",
                 "category": "Technology Law",
                 "difficulty_level": "intermediate",
-                "tags": json.dumps(["cyber", "privacy", "online", "security", "digital"])
+                "tags": ["cyber", "privacy", "online", "security", "digital"]
             },
             {
                 "title": "Consumer Rights",
@@ -42,73 +39,59 @@ def create_sample_data():
                 "content": "Consumer rights protect buyers from unfair trade practices, defective products, and misleading advertisements. Key rights include the right to safety, right to information, right to choose, right to be heard, and right to redress. These rights ensure fair treatment in the marketplace.",
                 "category": "Consumer Protection",
                 "difficulty_level": "beginner", 
-                "tags": json.dumps(["consumer", "purchase", "rights", "protection", "marketplace"])
+                "tags": ["consumer", "purchase", "rights", "protection", "marketplace"]
             }
         ]
-        
-        for topic_data in topics_data:
-            existing_topic = db.query(LegalTopic).filter(LegalTopic.slug == topic_data["slug"]).first()
-            if not existing_topic:
-                topic = LegalTopic(**topic_data)
-                db.add(topic)
-        
-        db.commit()
-        
+
         # Create sample quizzes
         quizzes_data = [
             {
-                "topic_id": 1,  # Gender Rights
+                "topic_slug": "gender-rights",
                 "question": "What is the main purpose of gender rights?",
-                "options": json.dumps([
+                "options": [
                     "To provide special privileges to women",
                     "To ensure equality and protection from discrimination", 
                     "To limit men's rights",
                     "None of the above"
-                ]),
+                ],
                 "correct_answer": 1,
                 "explanation": "Gender rights aim to ensure equality and protection from discrimination for all genders, not to provide special privileges or limit anyone's rights.",
                 "difficulty": "easy"
             },
             {
-                "topic_id": 2,  # Cyber Laws  
+                "topic_slug": "cyber-laws",
                 "question": "Which of the following is a primary concern of cyber privacy laws?",
-                "options": json.dumps([
+                "options": [
                     "Increasing internet speed",
                     "Protecting personal data and information",
                     "Reducing website loading times", 
                     "Enhancing social media features"
-                ]),
+                ],
                 "correct_answer": 1,
                 "explanation": "Cyber privacy laws primarily focus on protecting personal data and information from unauthorized access and misuse.",
                 "difficulty": "medium"
             },
             {
-                "topic_id": 3,  # Consumer Rights
+                "topic_slug": "consumer-rights",
                 "question": "Which right allows consumers to make informed purchasing decisions?",
-                "options": json.dumps([
+                "options": [
                     "Right to safety",
                     "Right to information", 
                     "Right to be heard",
                     "Right to redress"
-                ]),
+                ],
                 "correct_answer": 1,
                 "explanation": "The right to information ensures consumers receive accurate and complete information about products and services to make informed decisions.",
                 "difficulty": "easy"
             }
         ]
         
-        for quiz_data in quizzes_data:
-            # Check if quiz already exists for this topic
-            existing_quiz = db.query(Quiz).filter(
-                Quiz.topic_id == quiz_data["topic_id"],
-                Quiz.question == quiz_data["question"]
-            ).first()
-            
-            if not existing_quiz:
-                quiz = Quiz(**quiz_data)
-                db.add(quiz)
-        
-        db.commit()
+        # Upsert by slug / (topic, question) so re-running is safe
+        records = [{"type": "topic", **topic} for topic in topics_data]
+        records += [{"type": "quiz", **quiz} for quiz in quizzes_data]
+        report = import_records(db, records)
+        for error in report.errors:
+            print(f"❌ {error}")
         print("✅ Sample data created successfully!")
         
     except Exception as e:
@@ -1,28 +1,36 @@
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
+from fastapi.responses import JSONResponse, PlainTextResponse
 import os
 from contextlib import asynccontextmanager
 
 from database import engine, create_tables
-from routers import auth, legal_topics, quizzes, ai_assistant
+from routers import auth, legal_topics, quizzes, ai_assistant, admin, recommendations, sync, exams
+from services import cache, compression, fast_json, lifecycle, limits, metrics, overload, profiler, query_stats
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     create_tables()
+    lifecycle.run_startup()
     yield
-    # Shutdown
+    # Shutdown (after in-flight requests have drained)
+    lifecycle.run_shutdown()
 
 
 app = FastAPI(
     title="Rights 360 API",
     description="Legal Literacy and Empowerment Platform API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=fast_json.DefaultJSONResponse
 )
 
+# Response compression (cached payloads arrive precompressed and pass through)
+app.add_middleware(compression.CompressionMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -32,11 +40,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include routers
-app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
-app.include_router(legal_topics.router, prefix="/api/legal", tags=["legal-topics"])
-app.include_router(quizzes.router, prefix="/api/quiz", tags=["quizzes"])
-app.include_router(ai_assistant.router, prefix="/api/ai", tags=["ai-assistant"])
+# SQL accounting per request (headers with RIGHTS360_DEBUG=1)
+app.add_middleware(query_stats.QueryStatsMiddleware)
+
+# Sampling profiler, only installed when RIGHTS360_PROFILE=1
+if profiler.enabled():
+    app.add_middleware(profiler.ProfilerMiddleware)
+
+# Adaptive concurrency limit and per-route deadlines (sheds low-priority requests first)
+app.add_middleware(overload.LoadSheddingMiddleware)
+
+# Request metrics (outermost, so CORS handling is timed too)
+app.add_middleware(
+    metrics.MetricsMiddleware,
+    groups=["/api/auth", "/api/legal", "/api/quiz", "/api/ai", "/api/admin", "/api/me", "/api/sync", "/api/exams"],
+)
+
+# Include routers, each behind its own concurrency bulkhead (RIGHTS360_BULKHEAD_<NAME>)
+# so one busy router cannot hold every worker thread
+app.include_router(auth.router, prefix="/api/auth", tags=["authentication"],
+                   dependencies=[Depends(limits.bulkhead("auth", 16))])
+app.include_router(legal_topics.router, prefix="/api/legal", tags=["legal-topics"],
+                   dependencies=[Depends(limits.bulkhead("legal", 32))])
+app.include_router(quizzes.router, prefix="/api/quiz", tags=["quizzes"],
+                   dependencies=[Depends(limits.bulkhead("quiz", 32))])
+app.include_router(ai_assistant.router, prefix="/api/ai", tags=["ai-assistant"],
+                   dependencies=[Depends(limits.bulkhead("ai", 8))])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"],
+                   dependencies=[Depends(limits.bulkhead("admin", 4))])
+app.include_router(recommendations.router, prefix="/api/me", tags=["recommendations"],
+                   dependencies=[Depends(limits.bulkhead("me", 16))])
+app.include_router(sync.router, prefix="/api/sync", tags=["sync"],
+                   dependencies=[Depends(limits.bulkhead("sync", 8))])
+app.include_router(exams.router, prefix="/api/exams", tags=["exams"],
+                   dependencies=[Depends(limits.bulkhead("exams", 32))])
 
 
 @app.get("/")
@@ -53,6 +90,17 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.render() + overload.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.exception_handler(overload.DeadlineExceeded)
+async def deadline_exceeded_handler(request, exc):
+    return JSONResponse(status_code=504, content={"detail": "Request took too long, please retry"},
+                        headers={"Retry-After": "1"})
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
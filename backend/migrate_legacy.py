@@ -0,0 +1,184 @@
+"""
+Migrate a database created by the old schema (models.py / seed_data.py)
+
+The old schema used `users` (username/password/role), `modules`, `quizzes`
+(module_id, option_a..option_d) and `progress`. Its `users` and `quizzes`
+tables clash with the current models, so they are renamed to `legacy_*`,
+the current tables are created, and the rows are copied across:
+
+    modules  -> legal_topics   (slug derived from the title)
+    quizzes  -> quizzes        (options as a JSON list, answer letter -> index)
+    users    -> users          (email kept, username becomes the name, admins keep admin)
+    progress -> user_progress
+
+Old SHA-256 password hashes are kept with a "sha256$" prefix and upgraded
+to bcrypt the next time the user logs in.
+
+Run: python migrate_legacy.py [--drop-legacy]
+"""
+
+import argparse
+import re
+
+from sqlalchemy import DateTime, inspect, text
+
+from database import SessionLocal, engine, create_tables
+from models.user_model import User, UserProgress
+from services.content_io import import_records
+
+LEGACY_TABLES = ["users", "modules", "quizzes", "progress"]
+LEGACY_CATEGORY = "General"
+
+
+def _is_legacy(inspector, table: str) -> bool:
+    if not inspector.has_table(table):
+        return False
+    columns = {column["name"] for column in inspector.get_columns(table)}
+    return {
+        "users": "username" in columns,
+        "modules": True,
+        "quizzes": "option_a" in columns,
+        "progress": "module_id" in columns,
+    }[table]
+
+
+def needs_migration() -> bool:
+    inspector = inspect(engine)
+    return any(_is_legacy(inspector, table) for table in LEGACY_TABLES)
+
+
+def slugify(title: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-") or "topic"
+
+
+def _rename_legacy_tables() -> list:
+    """Move old tables out of the way; their indexes would clash with the new ones"""
+    inspector = inspect(engine)
+    renamed = []
+    with engine.begin() as conn:
+        for table in LEGACY_TABLES:
+            if not _is_legacy(inspector, table) or inspector.has_table(f"legacy_{table}"):
+                continue
+            for index in inspector.get_indexes(table):
+                conn.execute(text(f'DROP INDEX IF EXISTS "{index["name"]}"'))
+            conn.execute(text(f'ALTER TABLE "{table}" RENAME TO "legacy_{table}"'))
+            renamed.append(table)
+    return renamed
+
+
+def migrate(drop_legacy: bool = False) -> dict:
+    renamed = _rename_legacy_tables()
+    create_tables()
+
+    inspector = inspect(engine)
+    present = {table for table in LEGACY_TABLES if inspector.has_table(f"legacy_{table}")}
+    counts = {"renamed": renamed}
+    db = SessionLocal()
+    try:
+        # Topics and quizzes go through the bulk importer (upsert by slug / question)
+        module_slugs = {}
+        if "modules" in present:
+            records = []
+            used = set()
+            for module_id, title, description, content in db.execute(text(
+                "SELECT id, title, description, content FROM legacy_modules ORDER BY id"
+            )):
+                slug = base = slugify(title)
+                suffix = 2
+                while slug in used:
+                    slug, suffix = f"{base}-{suffix}", suffix + 1
+                used.add(slug)
+                module_slugs[module_id] = slug
+                records.append({
+                    "type": "topic", "slug": slug, "title": title, "description": description,
+                    "content": content, "category": LEGACY_CATEGORY,
+                })
+
+            if "quizzes" in present:
+                for module_id, question, a, b, c, d, answer in db.execute(text(
+                    "SELECT module_id, question, option_a, option_b, option_c, option_d, correct_answer "
+                    "FROM legacy_quizzes ORDER BY id"
+                )):
+                    if module_id not in module_slugs:
+                        continue
+                    records.append({
+                        "type": "quiz", "topic_slug": module_slugs[module_id], "question": question,
+                        "options": [a, b, c, d], "correct_answer": "ABCD".find((answer or "").strip().upper()),
+                    })
+
+            report = import_records(db, records)
+            counts.update(topics=report.topics_upserted, quizzes=report.quizzes_upserted, errors=report.errors)
+
+        user_ids = {}
+        if "users" in present:
+            existing = dict(db.query(User.email, User.id).all())
+            for legacy_id, username, email, password, role, created_at in db.execute(text(
+                "SELECT id, username, email, password, role, created_at FROM legacy_users ORDER BY id"
+            ).columns(created_at=DateTime)):
+                if email in existing:
+                    user_ids[legacy_id] = existing[email]
+                    continue
+                user = User(
+                    email=email,
+                    name=username,
+                    hashed_password=f"sha256${password}",
+                    is_active=True,
+                    is_admin=role == "admin",
+                    created_at=created_at,
+                )
+                db.add(user)
+                db.flush()
+                user_ids[legacy_id] = existing[email] = user.id
+            counts["users"] = len(user_ids)
+
+        if "progress" in present and module_slugs:
+            topic_ids = {
+                slug: topic_id for slug, topic_id in db.execute(text("SELECT slug, id FROM legal_topics"))
+            }
+            migrated = 0
+            for user_id, module_id, score, completed, completed_at in db.execute(text(
+                "SELECT user_id, module_id, score, completed, completed_at FROM legacy_progress"
+            ).columns(completed_at=DateTime)).all():
+                if user_id not in user_ids or module_id not in module_slugs:
+                    continue
+                topic_id = topic_ids[module_slugs[module_id]]
+                progress = db.query(UserProgress).filter(
+                    UserProgress.user_id == user_ids[user_id],
+                    UserProgress.topic_id == topic_id
+                ).first()
+                if progress:
+                    continue
+                db.add(UserProgress(
+                    user_id=user_ids[user_id],
+                    topic_id=topic_id,
+                    completed=bool(completed),
+                    progress_percentage=100 if completed else max(0, min(100, int(score or 0))),
+                    last_accessed=completed_at,
+                ))
+                migrated += 1
+            counts["progress"] = migrated
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    if drop_legacy:
+        with engine.begin() as conn:
+            for table in ["progress", "quizzes", "modules", "users"]:
+                conn.execute(text(f'DROP TABLE IF EXISTS "legacy_{table}"'))
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate the old modules/quizzes schema")
+    parser.add_argument("--drop-legacy", action="store_true", help="drop legacy_* tables afterwards")
+    args = parser.parse_args()
+
+    if not needs_migration() and not inspect(engine).has_table("legacy_modules"):
+        print("✅ No legacy tables found, nothing to migrate")
+    else:
+        counts = migrate(drop_legacy=args.drop_legacy)
+        print(f"✅ Migrated: {counts}")
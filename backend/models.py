@@ -1,59 +0,0 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Float, Boolean, DateTime
-from sqlalchemy.orm import relationship
-from datetime import datetime
-from database import Base
-
-
-class User(Base):
-    __tablename__ = "users"
-
-    id = Column(Integer, primary_key=True, index=True)
-    username = Column(String, unique=True, index=True, nullable=False)
-    email = Column(String, unique=True, index=True, nullable=False)
-    password = Column(String, nullable=False)
-    role = Column(String, default="user")  # 'user' or 'admin'
-    created_at = Column(DateTime, default=datetime.utcnow)
-
-    progress = relationship("Progress", back_populates="user")
-
-
-class Module(Base):
-    __tablename__ = "modules"
-
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, nullable=False)
-    description = Column(Text, nullable=False)
-    content = Column(Text, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-
-    quizzes = relationship("Quiz", back_populates="module", cascade="all, delete-orphan")
-    progress = relationship("Progress", back_populates="module")
-
-
-class Quiz(Base):
-    __tablename__ = "quizzes"
-
-    id = Column(Integer, primary_key=True, index=True)
-    module_id = Column(Integer, ForeignKey("modules.id"), nullable=False)
-    question = Column(Text, nullable=False)
-    option_a = Column(String, nullable=False)
-    option_b = Column(String, nullable=False)
-    option_c = Column(String, nullable=False)
-    option_d = Column(String, nullable=False)
-    correct_answer = Column(String, nullable=False)  # 'A', 'B', 'C', or 'D'
-
-    module = relationship("Module", back_populates="quizzes")
-
-
-class Progress(Base):
-    __tablename__ = "progress"
-
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    module_id = Column(Integer, ForeignKey("modules.id"), nullable=False)
-    score = Column(Float, default=0.0)
-    completed = Column(Boolean, default=False)
-    completed_at = Column(DateTime, default=datetime.utcnow)
-
-    user = relationship("User", back_populates="progress")
-    module = relationship("Module", back_populates="progress")
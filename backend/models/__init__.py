@@ -1 +1,53 @@
 # Models package
+#
+# The ORM classes live in the submodules below. They are exported lazily
+# (PEP 562) so `from models import Quiz` only imports the module that defines
+# Quiz instead of every model. Relationships name classes of other modules,
+# so every model module is imported before the mappers are configured.
+import importlib
+
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper
+
+_EXPORTS = {
+    "User": "models.user_model",
+    "UserProgress": "models.user_model",
+    "UserRecommendations": "models.user_model",
+    "LegalTopic": "models.topic_model",
+    "Tag": "models.topic_model",
+    "TopicTag": "models.topic_model",
+    "RelatedTopic": "models.topic_model",
+    "ContentChange": "models.topic_model",
+    "Quiz": "models.topic_model",
+    "QuizResult": "models.topic_model",
+    "UserBadge": "models.quiz_model",
+    "UserStreak": "models.quiz_model",
+    "QuizReviewState": "models.quiz_model",
+    "QuizStats": "models.quiz_model",
+    "TopicStats": "models.quiz_model",
+    "ExamSession": "models.quiz_model",
+}
+
+MODEL_MODULES = sorted(set(_EXPORTS.values()))
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'models' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
+
+@event.listens_for(Mapper, "before_configured")
+def load_all():
+    """Import every model module so Base.metadata knows all tables"""
+    for module_name in MODEL_MODULES:
+        importlib.import_module(module_name)
@@ -1,5 +1,5 @@
 # This file is for quiz-related models that might be additional to the ones in topic_model.py
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Float, ForeignKey, Index, LargeBinary
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database import Base
@@ -30,3 +30,61 @@ class UserStreak(Base):
     
     # Relationships
     user = relationship("User")
+
+
+class QuizReviewState(Base):
+    """Spaced-repetition schedule for one (user, quiz) pair"""
+    __tablename__ = "quiz_review_states"
+    __table_args__ = (
+        Index("ix_quiz_review_states_user_due", "user_id", "due_at"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id"), primary_key=True)
+    ease_factor = Column(Float, nullable=False, default=2.5)
+    interval_days = Column(Integer, nullable=False, default=0)
+    repetitions = Column(Integer, nullable=False, default=0)
+    lapses = Column(Integer, nullable=False, default=0)
+    due_at = Column(DateTime, nullable=False)
+    last_reviewed_at = Column(DateTime, nullable=True)
+
+
+class QuizStats(Base):
+    """Running answer statistics for one quiz, updated on every submit (difficulty by a batch job)"""
+    __tablename__ = "quiz_stats"
+
+    quiz_id = Column(Integer, ForeignKey("quizzes.id"), primary_key=True)
+    topic_id = Column(Integer, ForeignKey("legal_topics.id"), nullable=False, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    correct_count = Column(Integer, nullable=False, default=0)
+    time_histogram = Column(Text, nullable=False, default="[]")  # JSON list of counts per time bucket
+    answer_histogram = Column(Text, nullable=False, default="[]")  # JSON list of counts per option
+    observed_difficulty = Column(String(20), nullable=True)  # easy, medium, hard once enough attempts
+    labelled_attempts = Column(Integer, nullable=True)  # attempts when observed_difficulty was last derived
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class TopicStats(Base):
+    """Running answer statistics aggregated over a topic's quizzes"""
+    __tablename__ = "topic_stats"
+
+    topic_id = Column(Integer, ForeignKey("legal_topics.id"), primary_key=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    correct_count = Column(Integer, nullable=False, default=0)
+    time_histogram = Column(Text, nullable=False, default="[]")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class ExamSession(Base):
+    """A timed exam: its drawn question deck and, once finished, the score (see services.exams)"""
+    __tablename__ = "exam_sessions"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    seed = Column(Integer, nullable=False)  # per-session option shuffling
+    quiz_ids = Column(LargeBinary, nullable=False)  # packed little-endian uint32 quiz ids, in deck order
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    score = Column(Integer, nullable=True)
+    answered = Column(Integer, nullable=True)
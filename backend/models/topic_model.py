@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Float, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database import Base
@@ -23,17 +23,64 @@ class LegalTopic(Base):
     user_progress = relationship("UserProgress", back_populates="topic")
 
 
+class Tag(Base):
+    """A normalized topic tag (see services.tags); LegalTopic.tags stays the source"""
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), unique=True, index=True, nullable=False)
+
+
+class TopicTag(Base):
+    __tablename__ = "topic_tags"
+    __table_args__ = (
+        # Topics by tag; the primary key covers tags by topic
+        Index("ix_topic_tags_tag_topic", "tag_id", "topic_id"),
+    )
+
+    topic_id = Column(Integer, ForeignKey("legal_topics.id"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id"), primary_key=True)
+
+
+class RelatedTopic(Base):
+    """Precomputed "read next" neighbours of a topic (see services.related)"""
+    __tablename__ = "related_topics"
+
+    topic_id = Column(Integer, ForeignKey("legal_topics.id"), primary_key=True)
+    rank = Column(Integer, primary_key=True)  # 0 = most similar
+    related_topic_id = Column(Integer, ForeignKey("legal_topics.id"), nullable=False)
+    score = Column(Float, nullable=False)
+
+
+class ContentChange(Base):
+    """One topic or quiz change; `version` is the content version (see services.content_sync)"""
+    __tablename__ = "content_changes"
+    # Versions must never be reused, even after old changes are pruned
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    version = Column(Integer, primary_key=True)
+    entity = Column(String(20), nullable=False)  # "topic" or "quiz"
+    entity_id = Column(Integer, nullable=True)  # None = every row of the entity may have changed
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class Quiz(Base):
     __tablename__ = "quizzes"
+    __table_args__ = (
+        # Natural key used by the bulk importer to upsert questions
+        Index("uq_quizzes_topic_question", "topic_id", "question", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    topic_id = Column(Integer, ForeignKey("legal_topics.id"), nullable=False)
+    topic_id = Column(Integer, ForeignKey("legal_topics.id"), nullable=False, index=True)
     question = Column(Text, nullable=False)
     options = Column(Text, nullable=False)  # JSON string of answer options
     correct_answer = Column(Integer, nullable=False)  # Index of correct option (0-based)
     explanation = Column(Text, nullable=True)
     difficulty = Column(String(20), default="easy")  # easy, medium, hard
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set instead of deleting a quiz that users have answered, so their results stay
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
     topic = relationship("LegalTopic", back_populates="quizzes")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database import Base
@@ -12,6 +12,7 @@ class User(Base):
     hashed_password = Column(String(255), nullable=True)  # Nullable for OAuth users
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
+    is_admin = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -30,6 +31,10 @@ class User(Base):
 
 class UserProgress(Base):
     __tablename__ = "user_progress"
+    __table_args__ = (
+        # One row per user and topic: progress writes upsert on it (see services.progress)
+        Index("uq_user_progress_user_topic", "user_id", "topic_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -43,3 +48,12 @@ class UserProgress(Base):
     # Relationships
     user = relationship("User", back_populates="user_progress")
     topic = relationship("LegalTopic", back_populates="user_progress")
+
+
+class UserRecommendations(Base):
+    """Precomputed next-topic recommendations (see services.recommendations)"""
+    __tablename__ = "user_recommendations"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    topic_ids = Column(Text, nullable=False)  # JSON list of topic ids, best first
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,455 @@
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, ValidationError
+from datetime import datetime, timezone
+import io
+import json
+
+from database import get_db
+from models.user_model import User, UserProgress, UserRecommendations
+from models.topic_model import LegalTopic, Quiz, QuizResult, RelatedTopic
+from models.quiz_model import QuizReviewState, TopicStats
+from routers.auth import get_current_admin
+from services import content_events, profiler
+from services.content_events import ContentEvent
+from services.quiz_stats import move_quiz_stats
+from services.tags import remove_topic_tags, sync_topic_tags
+from services.content_io import import_file, iter_export, DEFAULT_BATCH_SIZE, TopicRecord, QuizFields
+
+router = APIRouter()
+
+class TopicCreate(TopicRecord):
+    pass
+
+class TopicUpdate(BaseModel):
+    slug: Optional[str] = None
+    title: Optional[str] = None
+    category: Optional[str] = None
+    content: Optional[str] = None
+    description: Optional[str] = None
+    difficulty_level: Optional[str] = None
+    tags: Optional[List[str]] = None
+    is_published: Optional[bool] = None
+
+class TopicAdminResponse(BaseModel):
+    id: int
+    slug: str
+    title: str
+    category: str
+    content: str
+    description: Optional[str] = None
+    difficulty_level: str
+    tags: List[str]
+    is_published: bool
+
+class ProfileSummary(BaseModel):
+    id: int
+    method: str
+    path: str
+    route: Optional[str] = None
+    status: int
+    started_at: str
+    duration_ms: float
+    reason: str
+    samples: int
+
+class ProfileListResponse(BaseModel):
+    enabled: bool
+    profiles: List[ProfileSummary]
+
+class QuizCreate(QuizFields):
+    topic_id: int
+
+class QuizUpdate(BaseModel):
+    topic_id: Optional[int] = None
+    question: Optional[str] = None
+    options: Optional[List[str]] = None
+    correct_answer: Optional[int] = None
+    explanation: Optional[str] = None
+    difficulty: Optional[str] = None
+
+class QuizAdminResponse(BaseModel):
+    id: int
+    topic_id: int
+    question: str
+    options: List[str]
+    correct_answer: int
+    explanation: Optional[str] = None
+    difficulty: str
+
+class BatchOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    entity: Literal["topic", "quiz"]
+    id: Optional[int] = None
+    data: Dict[str, Any] = {}
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation]
+
+class BatchResult(BaseModel):
+    op: str
+    entity: str
+    id: int
+
+class BatchResponse(BaseModel):
+    results: List[BatchResult]
+
+def _topic_response(topic: LegalTopic) -> TopicAdminResponse:
+    return TopicAdminResponse(
+        id=topic.id,
+        slug=topic.slug,
+        title=topic.title,
+        category=topic.category,
+        content=topic.content,
+        description=topic.description,
+        difficulty_level=topic.difficulty_level,
+        tags=json.loads(topic.tags) if topic.tags else [],
+        is_published=topic.is_published
+    )
+
+def _quiz_response(quiz: Quiz) -> QuizAdminResponse:
+    return QuizAdminResponse(
+        id=quiz.id,
+        topic_id=quiz.topic_id,
+        question=quiz.question,
+        options=json.loads(quiz.options),
+        correct_answer=quiz.correct_answer,
+        explanation=quiz.explanation,
+        difficulty=quiz.difficulty
+    )
+
+def _validation_error(e: ValidationError) -> HTTPException:
+    first = e.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return HTTPException(status_code=422, detail=f"{location}: {first['msg']}" if location else first["msg"])
+
+def _apply_topic(db: Session, topic: LegalTopic, values: TopicRecord):
+    slug_owner = db.query(LegalTopic.id).filter(LegalTopic.slug == values.slug).first()
+    if slug_owner and slug_owner[0] != topic.id:
+        raise HTTPException(status_code=409, detail=f"Slug '{values.slug}' is already in use")
+    topic.slug = values.slug
+    topic.title = values.title
+    topic.category = values.category
+    topic.content = values.content
+    topic.description = values.description
+    topic.difficulty_level = values.difficulty_level
+    topic.tags = json.dumps(values.tags)
+    topic.is_published = values.is_published
+
+def _apply_quiz(db: Session, quiz: Quiz, values: QuizCreate):
+    if not db.query(LegalTopic.id).filter(LegalTopic.id == values.topic_id).first():
+        raise HTTPException(status_code=404, detail="Topic not found")
+    duplicate = db.query(Quiz.id).filter(
+        Quiz.topic_id == values.topic_id,
+        Quiz.question == values.question
+    ).first()
+    if duplicate and duplicate[0] != quiz.id:
+        raise HTTPException(status_code=409, detail="This topic already has that question")
+    quiz.topic_id = values.topic_id
+    quiz.question = values.question
+    quiz.options = json.dumps(values.options)
+    quiz.correct_answer = values.correct_answer
+    quiz.explanation = values.explanation
+    quiz.difficulty = values.difficulty
+
+def _live_quiz(db: Session, quiz_id: int) -> Quiz:
+    quiz = db.get(Quiz, quiz_id)
+    if not quiz or quiz.deleted_at is not None:
+        raise HTTPException(status_code=404, detail="Quiz not found")
+    return quiz
+
+def _drop_recommended_topic(db: Session, topic_id: int):
+    """Remove a topic from the stored per-user recommendation lists"""
+    # Lists are JSON arrays of ids: LIKE narrows the rows, parsing decides
+    rows = db.query(UserRecommendations.user_id, UserRecommendations.topic_ids).filter(
+        UserRecommendations.topic_ids.like(f"%{topic_id}%")
+    ).all()
+    for user_id, raw in rows:
+        topic_ids = json.loads(raw)
+        if topic_id in topic_ids:
+            db.query(UserRecommendations).filter(UserRecommendations.user_id == user_id).update(
+                {UserRecommendations.topic_ids: json.dumps([i for i in topic_ids if i != topic_id])},
+                synchronize_session=False
+            )
+
+def create_topic(db: Session, data: dict) -> LegalTopic:
+    try:
+        values = TopicCreate.model_validate(data)
+    except ValidationError as e:
+        raise _validation_error(e)
+    topic = LegalTopic()
+    _apply_topic(db, topic, values)
+    db.add(topic)
+    db.flush()
+    sync_topic_tags(db, LegalTopic.id == topic.id)
+    content_events.record(db, ContentEvent("topic", "created", id=topic.id, slug=topic.slug))
+    return topic
+
+def update_topic(db: Session, topic_id: int, data: dict) -> LegalTopic:
+    topic = db.get(LegalTopic, topic_id)
+    if not topic:
+        raise HTTPException(status_code=404, detail="Topic not found")
+    previous_slug = topic.slug
+    try:
+        current = _topic_response(topic).model_dump(exclude={"id"})
+        changes = TopicUpdate.model_validate(data).model_dump(exclude_unset=True)
+        values = TopicCreate.model_validate({**current, **changes})
+    except ValidationError as e:
+        raise _validation_error(e)
+    _apply_topic(db, topic, values)
+    db.flush()
+    sync_topic_tags(db, LegalTopic.id == topic.id)
+    content_events.record(db, ContentEvent(
+        "topic", "updated", id=topic.id, slug=topic.slug,
+        previous_slug=previous_slug if previous_slug != topic.slug else None
+    ))
+    return topic
+
+def delete_topic(db: Session, topic_id: int) -> int:
+    topic = db.get(LegalTopic, topic_id)
+    if not topic:
+        raise HTTPException(status_code=404, detail="Topic not found")
+    if db.query(Quiz.id).filter(Quiz.topic_id == topic_id, Quiz.deleted_at.is_(None)).first():
+        raise HTTPException(status_code=409, detail="Delete the topic's quizzes first")
+    if db.query(Quiz.id).filter(Quiz.topic_id == topic_id).first():
+        raise HTTPException(status_code=409, detail="Users have answered this topic's quizzes; unpublish it instead")
+    db.query(UserProgress).filter(UserProgress.topic_id == topic_id).delete(synchronize_session=False)
+    db.query(TopicStats).filter(TopicStats.topic_id == topic_id).delete(synchronize_session=False)
+    db.query(RelatedTopic).filter(
+        or_(RelatedTopic.topic_id == topic_id, RelatedTopic.related_topic_id == topic_id)
+    ).delete(synchronize_session=False)
+    _drop_recommended_topic(db, topic_id)
+    remove_topic_tags(db, topic_id)
+    db.delete(topic)
+    db.flush()
+    content_events.record(db, ContentEvent("topic", "deleted", id=topic_id, slug=topic.slug))
+    return topic_id
+
+def create_quiz(db: Session, data: dict) -> Quiz:
+    try:
+        values = QuizCreate.model_validate(data)
+    except ValidationError as e:
+        raise _validation_error(e)
+    # A deleted quiz with the same question is restored rather than duplicated
+    quiz = db.query(Quiz).filter(
+        Quiz.topic_id == values.topic_id,
+        Quiz.question == values.question,
+        Quiz.deleted_at.isnot(None)
+    ).first() or Quiz()
+    quiz.deleted_at = None
+    _apply_quiz(db, quiz, values)
+    db.add(quiz)
+    db.flush()
+    content_events.record(db, ContentEvent("quiz", "created", id=quiz.id, topic_id=quiz.topic_id))
+    return quiz
+
+def update_quiz(db: Session, quiz_id: int, data: dict) -> Quiz:
+    quiz = _live_quiz(db, quiz_id)
+    previous_topic_id = quiz.topic_id
+    try:
+        current = _quiz_response(quiz).model_dump(exclude={"id"})
+        changes = QuizUpdate.model_validate(data).model_dump(exclude_unset=True)
+        values = QuizCreate.model_validate({**current, **changes})
+    except ValidationError as e:
+        raise _validation_error(e)
+    _apply_quiz(db, quiz, values)
+    if quiz.topic_id != previous_topic_id:
+        # Its answers now count towards the new topic's statistics
+        move_quiz_stats(db, quiz_id, quiz.topic_id)
+        content_events.record(db, ContentEvent("quiz", "deleted", id=quiz_id, topic_id=previous_topic_id))
+    db.flush()
+    content_events.record(db, ContentEvent("quiz", "updated", id=quiz.id, topic_id=quiz.topic_id))
+    return quiz
+
+def delete_quiz(db: Session, quiz_id: int) -> int:
+    """Delete a quiz with its statistics and review schedule.
+
+    A quiz that users have answered is only marked deleted, so their results stay.
+    """
+    quiz = _live_quiz(db, quiz_id)
+    move_quiz_stats(db, quiz_id, None)
+    db.query(QuizReviewState).filter(QuizReviewState.quiz_id == quiz_id).delete(synchronize_session=False)
+    topic_id = quiz.topic_id
+    if db.query(QuizResult.id).filter(QuizResult.quiz_id == quiz_id).first():
+        quiz.deleted_at = datetime.now(timezone.utc)
+    else:
+        db.delete(quiz)
+    db.flush()
+    content_events.record(db, ContentEvent("quiz", "deleted", id=quiz_id, topic_id=topic_id))
+    return quiz_id
+
+class ImportResponse(BaseModel):
+    processed: int
+    topics_upserted: int
+    quizzes_upserted: int
+    error_count: int
+    errors: List[str]
+
+@router.post("/topics", response_model=TopicAdminResponse, status_code=201)
+def admin_create_topic(
+    topic_data: TopicCreate,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Create a legal topic"""
+    topic = create_topic(db, topic_data.model_dump())
+    db.commit()
+    return _topic_response(topic)
+
+@router.patch("/topics/{topic_id}", response_model=TopicAdminResponse)
+def admin_update_topic(
+    topic_id: int,
+    topic_data: TopicUpdate,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Update some fields of a legal topic"""
+    topic = update_topic(db, topic_id, topic_data.model_dump(exclude_unset=True))
+    db.commit()
+    return _topic_response(topic)
+
+@router.delete("/topics/{topic_id}", status_code=204)
+def admin_delete_topic(
+    topic_id: int,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Delete a legal topic that has no quizzes"""
+    delete_topic(db, topic_id)
+    db.commit()
+
+@router.post("/quizzes", response_model=QuizAdminResponse, status_code=201)
+def admin_create_quiz(
+    quiz_data: QuizCreate,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Create a quiz question"""
+    quiz = create_quiz(db, quiz_data.model_dump())
+    db.commit()
+    return _quiz_response(quiz)
+
+@router.patch("/quizzes/{quiz_id}", response_model=QuizAdminResponse)
+def admin_update_quiz(
+    quiz_id: int,
+    quiz_data: QuizUpdate,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Update some fields of a quiz question"""
+    quiz = update_quiz(db, quiz_id, quiz_data.model_dump(exclude_unset=True))
+    db.commit()
+    return _quiz_response(quiz)
+
+@router.delete("/quizzes/{quiz_id}", status_code=204)
+def admin_delete_quiz(
+    quiz_id: int,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Delete a quiz question (users' answers to it are kept)"""
+    delete_quiz(db, quiz_id)
+    db.commit()
+
+_BATCH_HANDLERS = {
+    ("create", "topic"): lambda db, op: create_topic(db, op.data).id,
+    ("update", "topic"): lambda db, op: update_topic(db, op.id, op.data).id,
+    ("delete", "topic"): lambda db, op: delete_topic(db, op.id),
+    ("create", "quiz"): lambda db, op: create_quiz(db, op.data).id,
+    ("update", "quiz"): lambda db, op: update_quiz(db, op.id, op.data).id,
+    ("delete", "quiz"): lambda db, op: delete_quiz(db, op.id),
+}
+
+@router.post("/batch", response_model=BatchResponse)
+def admin_batch(
+    batch: BatchRequest,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Apply several topic/quiz edits in one transaction (all or nothing)"""
+    results = []
+    try:
+        for index, operation in enumerate(batch.operations):
+            if operation.op != "create" and operation.id is None:
+                raise HTTPException(status_code=422, detail=f"operation {index}: id is required")
+            try:
+                entity_id = _BATCH_HANDLERS[(operation.op, operation.entity)](db, operation)
+            except HTTPException as e:
+                raise HTTPException(status_code=e.status_code, detail=f"operation {index}: {e.detail}")
+            results.append(BatchResult(op=operation.op, entity=operation.entity, id=entity_id))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return BatchResponse(results=results)
+
+@router.post("/content/import", response_model=ImportResponse)
+def import_content(
+    file: UploadFile = File(...),
+    kind: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Bulk upsert topics and quizzes from a JSONL or CSV upload"""
+    if kind not in (None, "topic", "quiz"):
+        raise HTTPException(status_code=400, detail="kind must be 'topic' or 'quiz'")
+    fmt = "csv" if (file.filename or "").lower().endswith(".csv") else "jsonl"
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    try:
+        report = import_file(db, stream, fmt, kind, batch_size=max(1, batch_size))
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+    finally:
+        stream.detach()
+
+    return ImportResponse(
+        processed=report.processed,
+        topics_upserted=report.topics_upserted,
+        quizzes_upserted=report.quizzes_upserted,
+        error_count=report.error_count,
+        errors=report.errors
+    )
+
+@router.get("/content/export")
+def export_content(
+    format: str = "jsonl",
+    kind: Optional[str] = None,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Stream all topics and quizzes as JSONL, or one record kind as CSV"""
+    if format not in ("jsonl", "csv"):
+        raise HTTPException(status_code=400, detail="format must be 'jsonl' or 'csv'")
+    if format == "csv" and kind not in ("topic", "quiz"):
+        raise HTTPException(status_code=400, detail="CSV export needs kind 'topic' or 'quiz'")
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"content-{kind or 'all'}.{format}"
+    return StreamingResponse(
+        iter_export(db, format, kind),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/profiles", response_model=ProfileListResponse)
+def list_profiles(current_user: User = Depends(get_current_admin)):
+    """Recent request profiles kept by the sampling profiler (newest first)"""
+    return ProfileListResponse(
+        enabled=profiler.enabled(),
+        profiles=[ProfileSummary(**profile.summary()) for profile in profiler.store.list()]
+    )
+
+@router.get("/profiles/{profile_id}")
+def download_profile(profile_id: int, current_user: User = Depends(get_current_admin)):
+    """Download one profile as collapsed stacks (flamegraph.pl / speedscope input)"""
+    profile = profiler.store.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(
+        profile.collapsed(),
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile.id}.folded"'}
+    )
@@ -1,14 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional
+import functools
+import hashlib
 
 from database import get_db
 from models.user_model import User
 from routers.auth import get_current_user
+from services.compression import cached_response
+from services.fast_json import dumps
 from services.gemini_service import gemini_service
+from services.limits import rate_limit
+from services.single_flight import SingleFlight
 
-router = APIRouter()
+# Per-user token bucket over every AI endpoint (RIGHTS360_AI_RATE_PER_MINUTE /
+# RIGHTS360_AI_BURST); shared across workers when the cache tier is Redis
+router = APIRouter(dependencies=[Depends(rate_limit("ai", per_minute=20, burst=10))])
+
+# Answers come from a small set of canned texts, so each encoded (and
+# compressed) body is cached under its content hash
+ANSWER_CACHE_PREFIX = "answers:"
+ANSWER_CACHE_TTL = 3600
+
+def _answer_response(request: Request, payload: dict):
+    body = dumps(payload)
+    key = ANSWER_CACHE_PREFIX + hashlib.blake2b(body, digest_size=16).hexdigest()
+    return cached_response(request, key, lambda: body, ttl=ANSWER_CACHE_TTL)
+
+# Identical explain requests in flight at once (a class on the same topic) share one generation
+explanations = SingleFlight("explanations", ttl=5.0)
 
 class ChatMessage(BaseModel):
     message: str
@@ -28,6 +49,7 @@ class TopicResponse(BaseModel):
 
 @router.post("/assistant", response_model=ChatResponse)
 async def chat_with_assistant(
+    request: Request,
     chat_request: ChatMessage,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -38,7 +60,7 @@ async def chat_with_assistant(
             question=chat_request.message,
             context=chat_request.context or ""
         )
-        return ChatResponse(response=response, success=True)
+        return _answer_response(request, ChatResponse(response=response, success=True).model_dump())
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -47,17 +69,22 @@ async def chat_with_assistant(
 
 @router.post("/explain-topic", response_model=TopicResponse)
 async def explain_legal_topic(
+    request: Request,
     topic_request: LegalTopicRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get AI-generated explanation for a legal topic"""
     try:
-        explanation = await gemini_service.generate_legal_explanation(
-            topic=topic_request.topic,
-            complexity_level=topic_request.complexity_level
+        explanation = await explanations.do_async(
+            (topic_request.topic, topic_request.complexity_level),
+            functools.partial(
+                gemini_service.generate_legal_explanation,
+                topic=topic_request.topic,
+                complexity_level=topic_request.complexity_level
+            )
         )
-        return TopicResponse(explanation=explanation, success=True)
+        return _answer_response(request, TopicResponse(explanation=explanation, success=True).model_dump())
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -66,6 +93,7 @@ async def explain_legal_topic(
 
 @router.post("/summarize", response_model=ChatResponse)
 async def summarize_document(
+    request: Request,
     document_data: dict,  # {"text": "document content"}
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -80,7 +108,7 @@ async def summarize_document(
             )
         
         summary = await gemini_service.summarize_legal_document(document_text)
-        return ChatResponse(response=summary, success=True)
+        return _answer_response(request, ChatResponse(response=summary, success=True).model_dump())
     except Exception as e:
         raise HTTPException(
             status_code=500,
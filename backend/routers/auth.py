@@ -4,6 +4,8 @@ from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from typing import Optional
 import bcrypt
+import hashlib
+import hmac
 from jose import JWTError, jwt
 import os
 from decouple import config
@@ -48,7 +50,15 @@ class TokenData(BaseModel):
     email: Optional[str] = None
 
 # Utility functions
+# Prefix of SHA-256 hashes carried over from the legacy schema (see migrate_legacy.py)
+LEGACY_HASH_PREFIX = "sha256$"
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
+    if not hashed_password:
+        return False
+    if hashed_password.startswith(LEGACY_HASH_PREFIX):
+        digest = hashlib.sha256(plain_password.encode('utf-8')).hexdigest()
+        return hmac.compare_digest(digest, hashed_password[len(LEGACY_HASH_PREFIX):])
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
 def get_password_hash(password: str) -> str:
@@ -73,6 +83,10 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
         return None
     if not verify_password(password, user.hashed_password):
         return None
+    if user.hashed_password.startswith(LEGACY_HASH_PREFIX):
+        # Upgrade migrated SHA-256 hashes to bcrypt on first successful login
+        user.hashed_password = get_password_hash(password)
+        db.commit()
     return user
 
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
@@ -94,6 +108,14 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         raise credentials_exception
     return user
 
+def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to perform this action"
+        )
+    return current_user
+
 # Routes
 @router.post("/register", response_model=UserResponse)
 def register_user(user: UserCreate, db: Session = Depends(get_db)):
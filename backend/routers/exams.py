@@ -0,0 +1,134 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from datetime import timedelta
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from database import get_db
+from models.user_model import User
+from routers.auth import get_current_user
+from services import catalog, exams
+
+router = APIRouter()
+
+MAX_PAGE_SIZE = 50
+
+class ExamStart(BaseModel):
+    question_count: int = Field(20, ge=1, le=100)
+    duration_minutes: int = Field(30, ge=1, le=180)
+    topic_ids: Optional[List[int]] = None
+    category: Optional[str] = None
+
+class ExamSessionResponse(BaseModel):
+    id: int
+    total_questions: int
+    expires_at: str
+    remaining_seconds: int
+
+class ExamQuestion(BaseModel):
+    position: int
+    quiz_id: int
+    topic_id: int
+    question: str
+    options: List[str]
+    difficulty: str
+
+class ExamPageResponse(BaseModel):
+    exam_id: int
+    page: int
+    pages: int
+    remaining_seconds: int
+    questions: List[ExamQuestion]
+
+class ExamAnswer(BaseModel):
+    quiz_id: int
+    selected_answer: int  # index into the options as shown on the exam page
+    time_taken: Optional[int] = None
+
+class ExamFinish(BaseModel):
+    answers: List[ExamAnswer] = Field(max_length=100)
+
+class ExamAnswerResult(BaseModel):
+    quiz_id: int
+    selected_answer: Optional[int] = None
+    is_correct: bool
+    correct_answer: Optional[int] = None
+    explanation: Optional[str] = None
+
+class ExamResultResponse(BaseModel):
+    exam_id: int
+    score: int
+    answered: int
+    total_questions: int
+    results: List[ExamAnswerResult]
+
+def _session_response(deck: exams.Deck) -> ExamSessionResponse:
+    return ExamSessionResponse(
+        id=deck.id,
+        total_questions=len(deck.quiz_ids),
+        expires_at=deck.expires_at.isoformat(),
+        remaining_seconds=deck.remaining_seconds()
+    )
+
+def _own_deck(db: Session, exam_id: int, user: User) -> exams.Deck:
+    deck = exams.get(db, exam_id)
+    if deck is None or deck.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Exam not found")
+    return deck
+
+@router.post("", response_model=ExamSessionResponse)
+def start_exam(
+    exam: ExamStart,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Start a timed exam with a deck drawn across topics and difficulties"""
+    deck = exams.start(db, current_user.id, exam.question_count, timedelta(minutes=exam.duration_minutes),
+                       exam.topic_ids, exam.category)
+    if deck is None:
+        raise HTTPException(status_code=404, detail="No quizzes found")
+    return _session_response(deck)
+
+@router.get("/{exam_id}", response_model=ExamPageResponse)
+def get_exam_page(
+    exam_id: int,
+    page: int = 0,
+    page_size: int = 10,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """One page of an exam's questions (served from memory; correct answers are not included)"""
+    deck = _own_deck(db, exam_id, current_user)
+    if not deck.accepts_answers():
+        raise HTTPException(status_code=409, detail="Exam is over")
+    page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
+    pages = -(-len(deck.quiz_ids) // page_size)
+    if not 0 <= page < pages:
+        raise HTTPException(status_code=404, detail="Page not found")
+
+    return ExamPageResponse(
+        exam_id=deck.id,
+        page=page,
+        pages=pages,
+        remaining_seconds=deck.remaining_seconds(),
+        questions=exams.page(deck, catalog.current(), page, page_size)
+    )
+
+@router.post("/{exam_id}/finish", response_model=ExamResultResponse)
+def finish_exam(
+    exam_id: int,
+    submission: ExamFinish,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Grade an exam and record every answer at once"""
+    deck = _own_deck(db, exam_id, current_user)
+    if not deck.accepts_answers():
+        raise HTTPException(status_code=409, detail="Exam is over")
+
+    answers = {answer.quiz_id: (answer.selected_answer, answer.time_taken) for answer in submission.answers}
+    result = exams.finish(db, deck, catalog.current(), answers)
+    if result is None:
+        raise HTTPException(status_code=409, detail="Exam is over")
+
+    return ExamResultResponse(exam_id=deck.id, total_questions=len(deck.quiz_ids), **result)
@@ -1,17 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
-from pydantic import BaseModel
+from sqlalchemy import select
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
 
 from database import get_db
+from models.topic_model import RelatedTopic
 from models.user_model import User, UserProgress
-from models.topic_model import LegalTopic
 from routers.auth import get_current_user
+from services import catalog, content_events, progress, suggest
+from services.cache import get_cache
+from services.compression import cached_response
+from services.fast_json import dumps
 from services.gemini_service import gemini_service
+from services.single_flight import SingleFlight
+from services.tags import facets
 
 router = APIRouter()
 
+# Encoded topic listings and bodies; dropped whenever a topic changes
+TOPIC_CACHE_PREFIX = "topics:"
+TOPIC_CACHE_TTL = 300
+
+# Concurrent cache misses for the same payload (a class opening a topic at
+# once) share one build and encoding
+topic_reads = SingleFlight("topics", ttl=2.0)
+
+# Bumped on every topic change so a payload built from pre-change rows is not cached
+_topic_cache_generation = 0
+
+@content_events.subscribe
+def _invalidate_topic_cache(events):
+    global _topic_cache_generation
+    topic_events = [event for event in events if event.entity == "topic"]
+    if topic_events:
+        _topic_cache_generation += 1
+        topic_reads.forget()
+        if all(event.action == "related" for event in topic_events):
+            # Only neighbour lists were rewritten (services.related): keep the topic bodies and lists
+            get_cache().delete_prefix(f"{TOPIC_CACHE_PREFIX}related:")
+        else:
+            get_cache().delete_prefix(TOPIC_CACHE_PREFIX)
+
+def _cached_json(request: Request, key: str, build):
+    """Encoded (and precompressed) JSON from the cache, built on a miss"""
+    generation = _topic_cache_generation
+    return cached_response(
+        request, key, lambda: topic_reads.do(("json", key), lambda: dumps(build())), ttl=TOPIC_CACHE_TTL,
+        before_store=lambda: generation == _topic_cache_generation
+    )
+
 class TopicResponse(BaseModel):
     id: int
     title: str
@@ -32,64 +71,130 @@ class UserProgressResponse(BaseModel):
     progress_percentage: int
     last_accessed: str
 
+class FacetsResponse(BaseModel):
+    category: Dict[str, int]
+    difficulty_level: Dict[str, int]
+    tag: Dict[str, int]
+
+class SuggestionResponse(BaseModel):
+    text: str
+    kind: str
+    slug: Optional[str] = None
+
+class RelatedTopicResponse(BaseModel):
+    id: int
+    title: str
+    slug: str
+    description: Optional[str] = None
+    difficulty_level: Optional[str] = None
+    category: str
+    score: float
+
 class ProgressUpdate(BaseModel):
     progress_percentage: int
     completed: bool = False
 
+class BatchProgressEntry(ProgressUpdate):
+    topic_id: int
+    client_timestamp: Optional[datetime] = None
+
+class BatchProgressUpdate(BaseModel):
+    updates: List[BatchProgressEntry] = Field(max_length=500)
+
+class BatchProgressResponse(BaseModel):
+    applied: int
+    unknown_topic_ids: List[int]
+
+def _progress_response(topic_id: int, entry: progress.Entry) -> UserProgressResponse:
+    return UserProgressResponse(
+        topic_id=topic_id,
+        completed=entry.completed,
+        progress_percentage=entry.progress_percentage,
+        last_accessed=entry.last_accessed.isoformat()
+    )
+
 @router.get("/topics", response_model=List[TopicResponse])
 def get_legal_topics(
+    request: Request,
     category: Optional[str] = None,
     difficulty: Optional[str] = None,
-    db: Session = Depends(get_db)
+    tag: Optional[str] = None
 ):
     """Get all published legal topics with optional filtering"""
-    query = db.query(LegalTopic).filter(LegalTopic.is_published == True)
-    
-    if category:
-        query = query.filter(LegalTopic.category == category)
-    if difficulty:
-        query = query.filter(LegalTopic.difficulty_level == difficulty)
+    def build():
+        return [topic.as_dict() for topic in catalog.current().published_topics(category, difficulty, tag)]
     
-    return query.all()
+    return _cached_json(request, f"{TOPIC_CACHE_PREFIX}list:{category!r}:{difficulty!r}:{tag!r}", build)
+
+@router.get("/facets", response_model=FacetsResponse)
+def get_topic_facets(
+    request: Request,
+    category: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    tag: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Count published topics per category, difficulty level and tag (within the given filters)"""
+    return _cached_json(
+        request, f"{TOPIC_CACHE_PREFIX}facets:{category!r}:{difficulty!r}:{tag!r}",
+        lambda: facets(db, category, difficulty, tag)
+    )
+
+@router.get("/suggest", response_model=List[SuggestionResponse])
+def suggest_topics(prefix: str = "", limit: int = 8):
+    """Typeahead suggestions (topic titles, tags, common questions) for a typed prefix"""
+    return [
+        SuggestionResponse(text=s.text, kind=s.kind, slug=s.slug)
+        for s in suggest.search(prefix, limit)
+    ]
 
 @router.get("/topics/{slug}", response_model=TopicResponse)
 def get_topic_by_slug(
+    request: Request,
     slug: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific legal topic by slug"""
-    topic = db.query(LegalTopic).filter(
-        LegalTopic.slug == slug,
-        LegalTopic.is_published == True
-    ).first()
-    
-    if not topic:
+    topic = catalog.current().published_topic(slug)
+    if topic is None:
         raise HTTPException(
             status_code=404,
             detail="Topic not found"
         )
-    
-    # Update user progress
-    progress = db.query(UserProgress).filter(
-        UserProgress.user_id == current_user.id,
-        UserProgress.topic_id == topic.id
-    ).first()
-    
-    if not progress:
-        progress = UserProgress(
-            user_id=current_user.id,
-            topic_id=topic.id,
-            progress_percentage=0,
-            completed=False
+    progress.visit(db, current_user.id, topic.id)
+
+    # The article body is long and rarely changes: cache it encoded and precompressed
+    return _cached_json(request, f"{TOPIC_CACHE_PREFIX}body:{slug}", topic.as_dict)
+
+@router.get("/topics/{slug}/related", response_model=List[RelatedTopicResponse])
+def get_related_topics(request: Request, slug: str, db: Session = Depends(get_db)):
+    """Topics to read next, from the precomputed related_topics table (see services.related)"""
+    topic = catalog.current().published_topic(slug)
+    if topic is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Topic not found"
         )
-        db.add(progress)
-    else:
-        progress.last_accessed = func.now()
-    
-    db.commit()
-    
-    return topic
+
+    def build():
+        snapshot = catalog.current()
+        related = db.execute(
+            select(RelatedTopic.related_topic_id, RelatedTopic.score)
+            .where(RelatedTopic.topic_id == topic.id)
+            .order_by(RelatedTopic.rank)
+        ).all()
+        return [
+            {
+                "id": other.id, "title": other.title, "slug": other.slug, "description": other.description,
+                "difficulty_level": other.difficulty_level, "category": other.category, "score": score,
+            }
+            for other, score in ((snapshot.topics.get(related_id), score) for related_id, score in related)
+            # The table is refreshed offline: skip topics unpublished since
+            if other is not None and other.is_published
+        ]
+
+    return _cached_json(request, f"{TOPIC_CACHE_PREFIX}related:{slug}", build)
 
 @router.post("/topics/{topic_id}/progress", response_model=UserProgressResponse)
 def update_topic_progress(
@@ -98,40 +203,45 @@ def update_topic_progress(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Update user progress for a topic"""
+    """Update user progress for a topic and return the resulting progress
+
+    Updates are monotonic: progress_percentage never goes down (a lower value
+    than already recorded is ignored) and completed/last_accessed follow the
+    latest update. The response is the merge of this update with the stored
+    row and any still-buffered updates (written in bulk, see services.progress).
+    """
     # Verify topic exists
-    topic = db.query(LegalTopic).filter(LegalTopic.id == topic_id).first()
-    if not topic:
+    if topic_id not in catalog.current().topics:
         raise HTTPException(
             status_code=404,
             detail="Topic not found"
         )
     
-    # Get or create user progress
-    progress = db.query(UserProgress).filter(
-        UserProgress.user_id == current_user.id,
-        UserProgress.topic_id == topic_id
-    ).first()
-    
-    if not progress:
-        progress = UserProgress(
-            user_id=current_user.id,
-            topic_id=topic_id
-        )
-        db.add(progress)
-    
-    progress.progress_percentage = progress_data.progress_percentage
-    progress.completed = progress_data.completed
-    
-    db.commit()
-    db.refresh(progress)
-    
-    return UserProgressResponse(
-        topic_id=topic_id,
-        completed=progress.completed,
-        progress_percentage=progress.progress_percentage,
-        last_accessed=progress.last_accessed.isoformat()
+    entry = progress.entry(progress_data.progress_percentage, progress_data.completed)
+    merged = progress.buffer.add(current_user.id, {topic_id: entry})[topic_id]
+    row = db.scalars(select(UserProgress).where(
+        UserProgress.user_id == current_user.id, UserProgress.topic_id == topic_id
+    )).first()
+    if row is not None:
+        merged = progress.merge(progress.stored(row), merged)
+    return _progress_response(topic_id, merged)
+
+@router.post("/progress/batch", response_model=BatchProgressResponse)
+def update_progress_batch(
+    batch: BatchProgressUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Apply many progress updates at once (percentage only grows, latest client timestamp wins)"""
+    topics = catalog.current().topics
+    unknown = sorted({update.topic_id for update in batch.updates if update.topic_id not in topics})
+    merged = progress.merge_all(
+        (update.topic_id, progress.entry(update.progress_percentage, update.completed, update.client_timestamp))
+        for update in batch.updates
+        if update.topic_id in topics
     )
+    progress.apply(db, current_user.id, merged)
+    return BatchProgressResponse(applied=len(merged), unknown_topic_ids=unknown)
 
 @router.get("/user/progress", response_model=List[UserProgressResponse])
 def get_user_progress(
@@ -142,22 +252,25 @@ def get_user_progress(
     progress_records = db.query(UserProgress).filter(
         UserProgress.user_id == current_user.id
     ).all()
+    # Updates still in the write buffer are merged in, so a user reads their own writes
+    pending = progress.buffer.pending(current_user.id)
     
-    return [
-        UserProgressResponse(
-            topic_id=p.topic_id,
-            completed=p.completed,
-            progress_percentage=p.progress_percentage,
-            last_accessed=p.last_accessed.isoformat()
-        )
-        for p in progress_records
-    ]
+    responses = []
+    for p in progress_records:
+        if p.topic_id in pending:
+            merged = progress.merge(progress.stored(p), pending.pop(p.topic_id))
+            responses.append(_progress_response(p.topic_id, merged))
+        else:
+            responses.append(UserProgressResponse(
+                topic_id=p.topic_id,
+                completed=p.completed,
+                progress_percentage=p.progress_percentage,
+                last_accessed=p.last_accessed.isoformat()
+            ))
+    responses.extend(_progress_response(topic_id, entry) for topic_id, entry in pending.items())
+    return responses
 
 @router.get("/categories")
-def get_topic_categories(db: Session = Depends(get_db)):
+def get_topic_categories(request: Request):
     """Get all available topic categories"""
-    categories = db.query(LegalTopic.category).filter(
-        LegalTopic.is_published == True
-    ).distinct().all()
-    
-    return [category[0] for category in categories]
+    return _cached_json(request, f"{TOPIC_CACHE_PREFIX}categories", lambda: list(catalog.current().categories))
@@ -7,11 +7,25 @@ import random
 
 from database import get_db
 from models.user_model import User
-from models.topic_model import Quiz, QuizResult, LegalTopic
+from models.topic_model import Quiz, QuizResult
+from models.quiz_model import QuizStats, TopicStats
 from routers.auth import get_current_user
+from services.spaced_repetition import next_quiz_for_user, record_review
+from services.quiz_stats import median_from_histogram, record_attempt
+from services import catalog, content_events
+from services.fast_json import EncodedJSONResponse, dumps, rows_response
+from services.single_flight import SingleFlight
 
 router = APIRouter()
 
+# Identical concurrent quiz list requests (a class starting the same topic)
+# share one fetch and encoding, kept briefly
+quiz_lists = SingleFlight("quiz lists", ttl=2.0)
+
+@content_events.subscribe
+def _forget_quiz_lists(events):
+    quiz_lists.forget()
+
 class QuizResponse(BaseModel):
     id: int
     topic_id: int
@@ -34,6 +48,21 @@ class QuizResultResponse(BaseModel):
     explanation: Optional[str] = None
     score: int
 
+class QuizStatsResponse(BaseModel):
+    quiz_id: int
+    attempts: int
+    correct_rate: Optional[float] = None
+    median_time_taken: Optional[float] = None
+    answer_distribution: List[int]
+    difficulty: str
+    observed_difficulty: Optional[str] = None
+
+class TopicStatsResponse(BaseModel):
+    topic_id: int
+    attempts: int
+    correct_rate: Optional[float] = None
+    median_time_taken: Optional[float] = None
+
 @router.get("/random", response_model=QuizResponse)
 def get_random_quiz(
     topic_id: Optional[int] = None,
@@ -42,30 +71,56 @@ def get_random_quiz(
     db: Session = Depends(get_db)
 ):
     """Get a random quiz question"""
-    query = db.query(Quiz)
+    snapshot = catalog.current()
     
     if topic_id:
         # Verify topic exists
-        topic = db.query(LegalTopic).filter(LegalTopic.id == topic_id).first()
-        if not topic:
+        if topic_id not in snapshot.topics:
             raise HTTPException(status_code=404, detail="Topic not found")
-        query = query.filter(Quiz.topic_id == topic_id)
+        candidates = snapshot.quizzes_by_topic.get(topic_id, ())
+        if difficulty:
+            candidates = [quiz for quiz in candidates if quiz.effective_difficulty == difficulty]
+    elif difficulty:
+        candidates = snapshot.quizzes_by_difficulty.get(difficulty, ())
+    else:
+        candidates = snapshot.all_quizzes
     
-    if difficulty:
-        query = query.filter(Quiz.difficulty == difficulty)
-    
-    quizzes = query.all()
-    if not quizzes:
+    if not candidates:
         raise HTTPException(status_code=404, detail="No quizzes found")
+    quiz = random.choice(candidates)
     
-    # Select random quiz
-    quiz = random.choice(quizzes)
+    return QuizResponse(
+        id=quiz.id,
+        topic_id=quiz.topic_id,
+        question=quiz.question,
+        options=list(quiz.options),
+        explanation=quiz.explanation,
+        difficulty=quiz.effective_difficulty
+    )
+
+@router.get("/next", response_model=QuizResponse)
+def get_next_quiz(
+    topic_id: Optional[int] = None,
+    difficulty: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the next due (or weakest) quiz question for spaced repetition"""
+    quiz = next_quiz_for_user(db, current_user.id, topic_id=topic_id, difficulty=difficulty)
+    if not quiz:
+        raise HTTPException(status_code=404, detail="No quizzes found")
     
-    # Parse options from JSON
-    try:
-        options = json.loads(quiz.options)
-    except json.JSONDecodeError:
-        options = []
+    # Options come parsed from the catalog; a quiz committed by another worker
+    # may not have reached this one's snapshot yet
+    record = catalog.current().quizzes.get(quiz.id)
+    if record is not None:
+        options, difficulty = list(record.options), record.effective_difficulty
+    else:
+        try:
+            options = json.loads(quiz.options)
+        except json.JSONDecodeError:
+            options = []
+        difficulty = quiz.difficulty
     
     return QuizResponse(
         id=quiz.id,
@@ -73,7 +128,7 @@ def get_random_quiz(
         question=quiz.question,
         options=options,
         explanation=quiz.explanation,
-        difficulty=quiz.difficulty
+        difficulty=difficulty
     )
 
 @router.get("/topic/{topic_id}", response_model=List[QuizResponse])
@@ -85,35 +140,72 @@ def get_quizzes_by_topic(
     db: Session = Depends(get_db)
 ):
     """Get quizzes for a specific topic"""
-    # Verify topic exists
-    topic = db.query(LegalTopic).filter(LegalTopic.id == topic_id).first()
-    if not topic:
-        raise HTTPException(status_code=404, detail="Topic not found")
-    
-    query = db.query(Quiz).filter(Quiz.topic_id == topic_id)
+    def fetch():
+        snapshot = catalog.current()
+        # Verify topic exists
+        if topic_id not in snapshot.topics:
+            raise HTTPException(status_code=404, detail="Topic not found")
+        
+        quizzes = snapshot.quizzes_by_topic.get(topic_id, ())
+        # Filter on observed difficulty once a quiz has enough attempts
+        if difficulty:
+            quizzes = [quiz for quiz in quizzes if quiz.effective_difficulty == difficulty]
+        
+        return dumps([
+            {"id": quiz.id, "topic_id": quiz.topic_id, "question": quiz.question, "options": quiz.options,
+             "explanation": quiz.explanation, "difficulty": quiz.effective_difficulty}
+            for quiz in quizzes[:limit]
+        ])
     
-    if difficulty:
-        query = query.filter(Quiz.difficulty == difficulty)
+    # Catalog records straight to JSON bytes; QuizResponse documents the shape
+    return EncodedJSONResponse(quiz_lists.do((topic_id, difficulty, limit), fetch))
+
+@router.get("/topic/{topic_id}/stats", response_model=TopicStatsResponse)
+def get_topic_stats(
+    topic_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get answer statistics aggregated over a topic's quizzes"""
+    stats = db.get(TopicStats, topic_id)
+    if not stats:
+        if topic_id not in catalog.current().topics:
+            raise HTTPException(status_code=404, detail="Topic not found")
+        return TopicStatsResponse(topic_id=topic_id, attempts=0)
     
-    quizzes = query.limit(limit).all()
+    return TopicStatsResponse(
+        topic_id=topic_id,
+        attempts=stats.attempts,
+        correct_rate=stats.correct_count / stats.attempts if stats.attempts else None,
+        median_time_taken=median_from_histogram(json.loads(stats.time_histogram or "[]"))
+    )
+
+@router.get("/{quiz_id}/stats", response_model=QuizStatsResponse)
+def get_quiz_stats(
+    quiz_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get attempts, correct rate, median time and answer distribution for a quiz"""
+    row = db.query(Quiz.difficulty, QuizStats).outerjoin(
+        QuizStats, QuizStats.quiz_id == Quiz.id
+    ).filter(Quiz.id == quiz_id, Quiz.deleted_at.is_(None)).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Quiz not found")
     
-    results = []
-    for quiz in quizzes:
-        try:
-            options = json.loads(quiz.options)
-        except json.JSONDecodeError:
-            options = []
-        
-        results.append(QuizResponse(
-            id=quiz.id,
-            topic_id=quiz.topic_id,
-            question=quiz.question,
-            options=options,
-            explanation=quiz.explanation,
-            difficulty=quiz.difficulty
-        ))
+    difficulty, stats = row
+    if not stats:
+        return QuizStatsResponse(quiz_id=quiz_id, attempts=0, answer_distribution=[], difficulty=difficulty)
     
-    return results
+    return QuizStatsResponse(
+        quiz_id=quiz_id,
+        attempts=stats.attempts,
+        correct_rate=stats.correct_count / stats.attempts if stats.attempts else None,
+        median_time_taken=median_from_histogram(json.loads(stats.time_histogram or "[]")),
+        answer_distribution=json.loads(stats.answer_histogram or "[]"),
+        difficulty=stats.observed_difficulty or difficulty,
+        observed_difficulty=stats.observed_difficulty
+    )
 
 @router.post("/submit", response_model=QuizResultResponse)
 def submit_quiz_answer(
@@ -122,15 +214,13 @@ def submit_quiz_answer(
     db: Session = Depends(get_db)
 ):
     """Submit a quiz answer and get results"""
-    # Get the quiz
-    quiz = db.query(Quiz).filter(Quiz.id == submission.quiz_id).first()
+    # Get the quiz (with its options already parsed)
+    quiz = catalog.current().quizzes.get(submission.quiz_id)
     if not quiz:
         raise HTTPException(status_code=404, detail="Quiz not found")
     
-    # Parse options to validate selected answer
-    try:
-        options = json.loads(quiz.options)
-    except json.JSONDecodeError:
+    options = quiz.options
+    if not options:
         raise HTTPException(status_code=500, detail="Invalid quiz format")
     
     if submission.selected_answer < 0 or submission.selected_answer >= len(options):
@@ -148,6 +238,8 @@ def submit_quiz_answer(
         time_taken=submission.time_taken
     )
     db.add(quiz_result)
+    record_review(db, current_user.id, quiz.id, is_correct, submission.time_taken)
+    record_attempt(db, quiz, submission.selected_answer, is_correct, submission.time_taken, len(options))
     db.commit()
     
     return QuizResultResponse(
@@ -163,17 +255,14 @@ def get_user_quiz_results(
     db: Session = Depends(get_db)
 ):
     """Get user's quiz results"""
-    results = db.query(QuizResult).filter(
+    results = db.query(
+        QuizResult.quiz_id,
+        QuizResult.is_correct,
+        QuizResult.selected_answer,
+        QuizResult.time_taken,
+        QuizResult.created_at
+    ).filter(
         QuizResult.user_id == current_user.id
     ).all()
     
-    return [
-        {
-            "quiz_id": result.quiz_id,
-            "is_correct": result.is_correct,
-            "selected_answer": result.selected_answer,
-            "time_taken": result.time_taken,
-            "created_at": result.created_at.isoformat()
-        }
-        for result in results
-    ]
+    return rows_response(("quiz_id", "is_correct", "selected_answer", "time_taken", "created_at"), results)
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from pydantic import BaseModel
+import json
+
+from database import get_db
+from models.user_model import User, UserRecommendations
+from routers.auth import get_current_user
+from services import catalog, progress
+
+router = APIRouter()
+
+class RecommendedTopicResponse(BaseModel):
+    id: int
+    title: str
+    slug: str
+    description: Optional[str] = None
+    difficulty_level: Optional[str] = None
+    category: str
+
+@router.get("/recommendations", response_model=List[RecommendedTopicResponse])
+def get_recommendations(
+    limit: int = 10,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Unfinished topics picked for the current user by the recommendations batch job"""
+    snapshot = catalog.current()
+    stored = db.scalar(
+        select(UserRecommendations.topic_ids).where(UserRecommendations.user_id == current_user.id)
+    )
+    # Includes completions still in the write buffer, so a topic just finished is not offered
+    finished = progress.completed_topics(db, current_user.id)
+
+    # Lists are computed offline: skip topics finished or unpublished since
+    topics = [snapshot.topics.get(topic_id) for topic_id in json.loads(stored or "[]")]
+    topics = [topic for topic in topics if topic is not None and topic.is_published and topic.id not in finished]
+    if not topics:
+        # Not scored yet (new user) or everything recommended is done
+        topics = [topic for topic in snapshot.published if topic.id not in finished]
+
+    return [
+        RecommendedTopicResponse(
+            id=topic.id,
+            title=topic.title,
+            slug=topic.slug,
+            description=topic.description,
+            difficulty_level=topic.difficulty_level,
+            category=topic.category
+        )
+        for topic in topics[:max(limit, 0)]
+    ]
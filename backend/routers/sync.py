@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+
+from database import get_db
+from models.user_model import User
+from routers.auth import get_current_user
+from services import content_sync
+from services.cache import get_cache
+from services.compression import cached_response
+from services.fast_json import dumps
+from services.single_flight import SingleFlight
+
+router = APIRouter()
+
+# Bodies are keyed by content version, so they never go stale; the TTL only bounds memory.
+# Full snapshots are keyed by version alone: every client that needs one shares it.
+SYNC_CACHE_PREFIX = "sync:"
+SYNC_CACHE_TTL = 3600
+
+# Clients polling at the same version share one build
+sync_builds = SingleFlight("sync", ttl=2.0)
+
+@router.get("")
+def sync_content(
+    request: Request,
+    since: int = 0,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Topics and quizzes changed after content version `since` (see services.content_sync)"""
+    version = content_sync.current_version(db)
+    changes = content_sync.changed_since(db, since, version)
+    if changes is None:
+        key = f"{SYNC_CACHE_PREFIX}full:{version}"
+    else:
+        key = f"{SYNC_CACHE_PREFIX}{since}:{version}"
+
+    def build():
+        if changes is None:
+            return dumps(content_sync.snapshot(db, version))
+        return dumps(content_sync.delta(db, version, *changes))
+
+    return cached_response(request, key, lambda: sync_builds.do(key, build), ttl=SYNC_CACHE_TTL)
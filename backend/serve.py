@@ -0,0 +1,180 @@
+"""
+Production launcher for the Rights 360 API
+
+    python serve.py --workers 4 --port 8000
+
+With one worker this runs a single uvicorn server. With several it works
+as a pre-fork server:
+
+1. The parent creates the tables, imports the app and runs the preload hooks
+   (models, parsed quiz options, ...), then binds the listening socket.
+2. It forks N workers that share the socket and the preloaded memory.
+   Content invalidations are forwarded between workers through Redis
+   pub/sub (CACHE_URL=redis://...) or local Unix sockets in
+   RIGHTS360_BUS_DIR (a temporary directory unless set).
+3. On SIGTERM/SIGINT every worker stops accepting connections, drains
+   in-flight requests (up to --graceful-timeout seconds) and runs the
+   shutdown hooks, which flush write buffers. Workers that crash are
+   restarted.
+
+A worker restarted after a crash is forked from the parent's preload-time
+caches; before serving it replays the content changes committed since
+preload (see services.content_sync.catch_up).
+
+Platforms without fork() (Windows) run a single worker: separately spawned
+processes would have no invalidation bus, so their catalogs would never
+see changes made through another worker.
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+
+import uvicorn
+
+logger = logging.getLogger("rights360.serve")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the Rights 360 API")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")))
+    parser.add_argument("--graceful-timeout", type=int, default=30,
+                        help="seconds to drain in-flight requests on shutdown")
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args()
+
+
+def make_config(app, args) -> uvicorn.Config:
+    return uvicorn.Config(
+        app,
+        host=args.host,
+        port=args.port,
+        log_level=args.log_level,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        proxy_headers=True,
+    )
+
+
+def run_worker(config: uvicorn.Config, sock):
+    # Fresh signal handlers: uvicorn installs its own graceful ones
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def spawn(config, sock) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            run_worker(config, sock)
+        except Exception:
+            logger.exception("Worker crashed")
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def serve_prefork(args):
+    from services.cache import BUS_DIR_ENV, CACHE_URL_ENV
+
+    bus_dir = None
+    if not os.getenv(CACHE_URL_ENV, "").startswith(("redis://", "rediss://", "unix://")):
+        # A preset directory lets jobs such as services.related join the bus
+        if not os.getenv(BUS_DIR_ENV):
+            bus_dir = tempfile.mkdtemp(prefix="rights360-bus-")
+            os.environ[BUS_DIR_ENV] = bus_dir
+        logger.info("No shared CACHE_URL set; caches are per worker, invalidated over %s", os.environ[BUS_DIR_ENV])
+
+    from database import create_tables, engine
+    from services import lifecycle
+
+    create_tables()
+    import main
+
+    lifecycle.run_preload()
+    # Never share pooled connections across fork
+    engine.dispose()
+
+    config = make_config(main.app, args)
+    sock = config.bind_socket()
+    workers = {spawn(config, sock) for _ in range(args.workers)}
+    logger.info("Started %d workers: %s", len(workers), sorted(workers))
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    try:
+        while not stopping:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                time.sleep(0.5)
+                continue
+            workers.discard(pid)
+            if not stopping:
+                logger.warning("Worker %d exited with status %d; restarting", pid, status)
+                workers.add(spawn(config, sock))
+
+        # Graceful shutdown: workers drain, run shutdown hooks and exit
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + args.graceful_timeout + 5
+        while workers and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid:
+                workers.discard(pid)
+            else:
+                time.sleep(0.1)
+        for pid in workers:
+            logger.warning("Worker %d did not stop in time; killing it", pid)
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+    finally:
+        sock.close()
+        if bus_dir:
+            shutil.rmtree(bus_dir, ignore_errors=True)
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=args.log_level.upper(), format="%(levelname)s:     %(message)s")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    if args.workers > 1 and not hasattr(os, "fork"):
+        logger.warning("Multiple workers need fork(); running a single worker")
+        args.workers = 1
+    if args.workers <= 1:
+        import main as app_module
+
+        uvicorn.Server(make_config(app_module.app, args)).run()
+    else:
+        serve_prefork(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+Pluggable cache tier and cross-worker invalidation
+
+The backend is chosen with CACHE_URL:
+
+- memory:// (default): an in-process dict; right for a single worker
+- redis://host:port/db: any Redis-compatible server (Redis, Valkey, KeyDB,
+  or a local stand-in) shared by every worker; needs the `redis` package
+
+Values are bytes, so the same entries work in either backend.
+
+Per-worker state such as parsed-option caches or catalog snapshots still
+needs to hear about changes made in other workers. Committed content events
+are therefore forwarded over an invalidation bus: Redis pub/sub when
+CACHE_URL is Redis, otherwise Unix datagram sockets in RIGHTS360_BUS_DIR,
+which the multi-worker launcher (serve.py) creates.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from dataclasses import asdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from services import content_events, content_sync, lifecycle
+from services.content_events import ContentEvent
+
+logger = logging.getLogger(__name__)
+
+CACHE_URL_ENV = "CACHE_URL"
+BUS_DIR_ENV = "RIGHTS360_BUS_DIR"
+KEY_PREFIX = "rights360:"
+INVALIDATION_CHANNEL = KEY_PREFIX + "invalidate"
+
+
+class CacheBackend:
+    """Interface shared by the cache backends"""
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+    def delete(self, *keys: str):
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """Bounded in-process cache with optional per-entry TTL"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[Optional[float], bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                # Evict the oldest insertion (dicts keep insertion order)
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (expires_at, value)
+
+    def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str):
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache(CacheBackend):
+    """Cache stored in a Redis-compatible server shared by all workers"""
+
+    def __init__(self, url: str):
+        import redis  # optional dependency
+
+        self.url = url
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(KEY_PREFIX + key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        if ttl:
+            self.client.set(KEY_PREFIX + key, value, px=int(ttl * 1000))
+        else:
+            self.client.set(KEY_PREFIX + key, value)
+
+    def delete(self, *keys: str):
+        if keys:
+            self.client.delete(*(KEY_PREFIX + key for key in keys))
+
+    def delete_prefix(self, prefix: str):
+        batch = []
+        for key in self.client.scan_iter(match=KEY_PREFIX + prefix + "*", count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                self.client.delete(*batch)
+                batch.clear()
+        if batch:
+            self.client.delete(*batch)
+
+    def clear(self):
+        self.delete_prefix("")
+
+
+def _encode_events(events: List[ContentEvent]) -> bytes:
+    return json.dumps({"pid": os.getpid(), "events": [asdict(e) for e in events]}).encode()
+
+
+def _decode_events(payload: bytes) -> Tuple[int, List[ContentEvent]]:
+    message = json.loads(payload)
+    return message["pid"], [ContentEvent(**e) for e in message["events"]]
+
+
+class SocketBus:
+    """Broadcast invalidations between local workers over Unix datagram sockets.
+
+    Every worker binds <bus dir>/<pid>.sock and sends each message to the
+    other sockets in the directory, so no broker process is needed.
+    """
+
+    MAX_MESSAGE = 60000
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.path = os.path.join(directory, f"{os.getpid()}.sock")
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.sock.bind(self.path)
+        self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._closed = False
+
+    def publish(self, events: List[ContentEvent]):
+        for chunk in _chunks(events, self.MAX_MESSAGE):
+            payload = _encode_events(chunk)
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if path == self.path or not name.endswith(".sock"):
+                    continue
+                try:
+                    self._sender.sendto(payload, path)
+                except OSError:
+                    # Worker gone (or its queue is full); it will rebuild on restart
+                    pass
+
+    def listen(self):
+        while not self._closed:
+            try:
+                payload = self.sock.recv(self.MAX_MESSAGE + 4096)
+            except OSError:
+                return
+            _receive(payload)
+
+    def close(self):
+        self._closed = True
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+        self.sock.close()
+        self._sender.close()
+
+
+class RedisBus:
+    """Broadcast invalidations with Redis pub/sub"""
+
+    def __init__(self, cache: RedisCache):
+        self.client = cache.client
+        self.pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self.pubsub.subscribe(INVALIDATION_CHANNEL)
+        self._closed = False
+
+    def publish(self, events: List[ContentEvent]):
+        self.client.publish(INVALIDATION_CHANNEL, _encode_events(events))
+
+    def listen(self):
+        while not self._closed:
+            try:
+                message = self.pubsub.get_message(timeout=1.0)
+            except Exception:
+                if self._closed:
+                    return
+                logger.exception("Invalidation bus connection failed; retrying")
+                time.sleep(1.0)
+                continue
+            if message and message.get("type") == "message":
+                _receive(message["data"])
+
+    def close(self):
+        self._closed = True
+        self.pubsub.close()
+
+
+def _chunks(events: List[ContentEvent], limit: int) -> Iterable[List[ContentEvent]]:
+    """Split large event lists (bulk imports) so each datagram stays small"""
+    chunk, size = [], 0
+    for event in events:
+        event_size = len(json.dumps(asdict(event)))
+        if chunk and size + event_size > limit:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(event)
+        size += event_size
+    if chunk:
+        yield chunk
+
+
+def _receive(payload: bytes):
+    try:
+        sender, events = _decode_events(payload)
+    except (ValueError, TypeError, KeyError):
+        logger.warning("Ignoring malformed invalidation message")
+        return
+    if sender != os.getpid():
+        content_events.deliver(events)
+
+
+_cache: Optional[CacheBackend] = None
+_bus = None
+
+
+def get_cache() -> CacheBackend:
+    """Return the process-wide cache backend selected by CACHE_URL"""
+    global _cache
+    if _cache is None:
+        url = os.getenv(CACHE_URL_ENV, "memory://")
+        if url.startswith(("redis://", "rediss://", "unix://")):
+            _cache = RedisCache(url)
+        else:
+            _cache = MemoryCache()
+    return _cache
+
+
+def start_bus():
+    """Start forwarding content events to and from other workers"""
+    global _bus
+    if _bus is not None:
+        return
+    cache = get_cache()
+    if isinstance(cache, RedisCache):
+        _bus = RedisBus(cache)
+    elif os.getenv(BUS_DIR_ENV):
+        _bus = SocketBus(os.environ[BUS_DIR_ENV])
+    else:
+        return
+    content_events.set_remote_publisher(_bus.publish)
+    threading.Thread(target=_bus.listen, name="invalidation-bus", daemon=True).start()
+    # Changes made before this worker listened (e.g. while it restarted after a crash)
+    content_sync.catch_up()
+
+
+def stop_bus():
+    global _bus
+    if _bus is None:
+        return
+    content_events.set_remote_publisher(None)
+    _bus.close()
+    _bus = None
+
+
+lifecycle.on_startup(start_bus)
+lifecycle.on_shutdown(stop_bus)
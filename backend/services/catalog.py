@@ -0,0 +1,267 @@
+"""
+Immutable in-memory content catalog
+
+Topics and quizzes change rarely and are read on almost every request, so
+each worker keeps a snapshot of them: compact `__slots__` records plus
+prebuilt indexes (topics by id, slug, category, difficulty and normalized
+tag; quizzes by id, topic and effective difficulty). Catalog reads are dict
+lookups that never touch the database.
+
+A snapshot is never modified. On a content event, a new snapshot is built
+(copy-on-write: only the changed rows are re-read, the rest are carried
+over) and swapped in with a single assignment, so a request that already
+holds the previous snapshot keeps a consistent view. Each snapshot has a
+version number that increases with every swap.
+
+The snapshot loads in the preload stage, so forked workers share it
+copy-on-write, or on first use.
+"""
+
+import json
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models.quiz_model import QuizStats
+from models.topic_model import LegalTopic, Quiz
+from services import content_events, lifecycle
+from services.tags import normalize_tags, parse_tags
+
+# Events touching more rows than this rebuild the snapshot from scratch
+MAX_INCREMENTAL_ROWS = 200
+
+TOPIC_FIELDS = (
+    "id", "title", "slug", "description", "content",
+    "difficulty_level", "category", "tags", "is_published"
+)
+QUIZ_FIELDS = ("id", "topic_id", "question", "options", "correct_answer", "explanation", "difficulty",
+               "observed_difficulty")
+
+
+class _Record:
+    """Read-only record: attributes are set once in __init__"""
+
+    __slots__ = ()
+    FIELDS: Tuple[str, ...] = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.FIELDS, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class TopicRecord(_Record):
+    __slots__ = TOPIC_FIELDS
+    FIELDS = TOPIC_FIELDS
+
+
+class QuizRecord(_Record):
+    """A quiz with its options parsed (an empty tuple if malformed)"""
+
+    __slots__ = QUIZ_FIELDS
+    FIELDS = QUIZ_FIELDS
+
+    @property
+    def effective_difficulty(self) -> str:
+        """Observed difficulty once tuned, else the hand-set label"""
+        return self.observed_difficulty or self.difficulty
+
+
+class Catalog:
+    __slots__ = (
+        "version", "topics", "topics_by_slug", "published", "published_by_category",
+        "published_by_difficulty", "published_by_tag", "categories", "quizzes", "all_quizzes", "quizzes_by_topic",
+        "quizzes_by_difficulty",
+    )
+
+    def __init__(self, version: int, topics: Dict[int, TopicRecord], quizzes: Dict[int, QuizRecord]):
+        self.version = version
+        self.topics = topics
+        self.quizzes = quizzes
+        self.topics_by_slug = {topic.slug: topic for topic in topics.values()}
+
+        published = tuple(topic for _, topic in sorted(topics.items()) if topic.is_published)
+        by_category, by_difficulty, by_tag = defaultdict(list), defaultdict(list), defaultdict(list)
+        for topic in published:
+            by_category[topic.category].append(topic)
+            by_difficulty[topic.difficulty_level].append(topic)
+            for tag in parse_tags(topic.tags):
+                by_tag[tag].append(topic)
+        self.published = published
+        self.published_by_category = {key: tuple(value) for key, value in by_category.items()}
+        self.published_by_difficulty = {key: tuple(value) for key, value in by_difficulty.items()}
+        self.published_by_tag = {key: tuple(value) for key, value in by_tag.items()}
+        self.categories = tuple(by_category)
+
+        self.all_quizzes = tuple(quiz for _, quiz in sorted(quizzes.items()))
+        by_topic, by_quiz_difficulty = defaultdict(list), defaultdict(list)
+        for quiz in self.all_quizzes:
+            by_topic[quiz.topic_id].append(quiz)
+            by_quiz_difficulty[quiz.effective_difficulty].append(quiz)
+        self.quizzes_by_topic = {key: tuple(value) for key, value in by_topic.items()}
+        self.quizzes_by_difficulty = {key: tuple(value) for key, value in by_quiz_difficulty.items()}
+
+    def published_topic(self, slug: str) -> Optional[TopicRecord]:
+        topic = self.topics_by_slug.get(slug)
+        return topic if topic is not None and topic.is_published else None
+
+    def published_topics(self, category: Optional[str] = None, difficulty: Optional[str] = None,
+                         tag: Optional[str] = None) -> Tuple[TopicRecord, ...]:
+        # Start from the narrowest index, then filter on the rest
+        if tag:
+            names = normalize_tags([tag])
+            topics = self.published_by_tag.get(names[0], ()) if names else ()
+        elif category:
+            topics = self.published_by_category.get(category, ())
+            category = None
+        elif difficulty:
+            topics = self.published_by_difficulty.get(difficulty, ())
+            difficulty = None
+        else:
+            return self.published
+        if category or difficulty:
+            topics = tuple(
+                t for t in topics
+                if (not category or t.category == category) and (not difficulty or t.difficulty_level == difficulty)
+            )
+        return topics
+
+
+def _parse_options(raw: Optional[str]) -> Tuple[str, ...]:
+    try:
+        return tuple(json.loads(raw or "[]"))
+    except (json.JSONDecodeError, TypeError):
+        return ()
+
+
+def _topic_rows(db: Session, where=None) -> Iterable[TopicRecord]:
+    query = select(*(getattr(LegalTopic, field) for field in TOPIC_FIELDS))
+    if where is not None:
+        query = query.where(where)
+    return (TopicRecord(*row) for row in db.execute(query))
+
+
+def _quiz_rows(db: Session, where=None) -> Iterable[QuizRecord]:
+    query = select(
+        Quiz.id, Quiz.topic_id, Quiz.question, Quiz.options, Quiz.correct_answer, Quiz.explanation,
+        Quiz.difficulty, QuizStats.observed_difficulty
+    ).outerjoin(QuizStats, QuizStats.quiz_id == Quiz.id).where(Quiz.deleted_at.is_(None))
+    if where is not None:
+        query = query.where(where)
+    return (
+        QuizRecord(quiz_id, topic_id, question, _parse_options(options), correct_answer, explanation,
+                   difficulty, observed)
+        for quiz_id, topic_id, question, options, correct_answer, explanation, difficulty, observed
+        in db.execute(query)
+    )
+
+
+_snapshot: Optional[Catalog] = None
+_lock = threading.Lock()
+
+
+def current() -> Catalog:
+    """The current snapshot (loaded on first use)"""
+    snapshot = _snapshot
+    if snapshot is not None:
+        return snapshot
+    with _lock:
+        # Requests that raced here wait for the first one's load instead of each loading
+        if _snapshot is not None:
+            return _snapshot
+        return _load()
+
+
+def reload() -> Catalog:
+    """Build a complete snapshot from the database and swap it in"""
+    with _lock:
+        return _load()
+
+
+def _load() -> Catalog:
+    # Called with _lock held
+    from database import UnpooledSession
+
+    global _snapshot
+    db = UnpooledSession()
+    try:
+        topics = {topic.id: topic for topic in _topic_rows(db)}
+        quizzes = {quiz.id: quiz for quiz in _quiz_rows(db)}
+    finally:
+        db.close()
+    _snapshot = Catalog(_snapshot.version + 1 if _snapshot else 1, topics, quizzes)
+    return _snapshot
+
+
+def _update(events) -> Optional[Catalog]:
+    """Copy-on-write: re-read only the rows the events name (None = reload everything)"""
+    from database import UnpooledSession
+
+    global _snapshot
+    old = _snapshot
+    topic_ids, slugs, quiz_ids, quiz_topics = set(), set(), set(), set()
+    for event in events:
+        if event.entity == "topic":
+            if event.id is not None:
+                topic_ids.add(event.id)
+            for slug in (event.slug, event.previous_slug):
+                if slug is not None:
+                    slugs.add(slug)
+        elif event.entity == "quiz":
+            if event.id is not None:
+                quiz_ids.add(event.id)
+            elif event.topic_id is not None:
+                quiz_topics.add(event.topic_id)
+            else:
+                return None
+    # Known slugs resolve to ids; new ones are looked up by slug
+    topic_ids.update(old.topics_by_slug[slug].id for slug in slugs if slug in old.topics_by_slug)
+    slugs.difference_update(old.topics_by_slug)
+    if len(topic_ids) + len(slugs) + len(quiz_ids) + len(quiz_topics) > MAX_INCREMENTAL_ROWS:
+        return None
+
+    topics, quizzes = dict(old.topics), dict(old.quizzes)
+    db = UnpooledSession()
+    try:
+        if topic_ids or slugs:
+            for topic_id in topic_ids:
+                topics.pop(topic_id, None)
+            for topic in _topic_rows(db, LegalTopic.id.in_(topic_ids) | LegalTopic.slug.in_(slugs)):
+                topics[topic.id] = topic
+        if quiz_ids or quiz_topics:
+            for quiz_id in quiz_ids:
+                quizzes.pop(quiz_id, None)
+            for topic_id in quiz_topics:
+                for quiz in old.quizzes_by_topic.get(topic_id, ()):
+                    quizzes.pop(quiz.id, None)
+            for quiz in _quiz_rows(db, Quiz.id.in_(quiz_ids) | Quiz.topic_id.in_(quiz_topics)):
+                quizzes[quiz.id] = quiz
+    finally:
+        db.close()
+    _snapshot = Catalog(old.version + 1, topics, quizzes)
+    return _snapshot
+
+
+@content_events.subscribe
+def _on_content_change(events):
+    # Subscribed when this module is imported, i.e. before the routers' cache
+    # invalidation, so caches are never refilled from the previous snapshot
+    # "related" events only rewrite neighbour lists, which the catalog does not hold
+    events = [event for event in events if event.entity in ("topic", "quiz") and event.action != "related"]
+    if _snapshot is None or not events:
+        return
+    with _lock:
+        updated = _update(events)
+    if updated is None:
+        reload()
+
+
+lifecycle.on_preload(reload)
@@ -0,0 +1,220 @@
+"""
+Response compression
+
+CompressionMiddleware compresses response bodies of at least MIN_SIZE bytes
+with the best encoding the client accepts: brotli and zstd when their
+packages are installed, gzip always. Streaming responses are gzipped
+incrementally.
+
+Cacheable payloads (topic bodies and listings, canned assistant answers)
+go through `cached_response()` instead. It keeps the identity body and each
+compressed variant in the cache tier, compressed once at a high level per
+content version. Those responses already carry Content-Encoding, so the
+middleware leaves them alone.
+"""
+
+import gzip
+import zlib
+from typing import Callable, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from services.cache import get_cache
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+MIN_SIZE = 512
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+# Server preference when the client accepts several equally
+PREFERENCE = [name for name, module in (("br", brotli), ("zstd", zstandard)) if module is not None] + ["gzip"]
+
+# Per-request compression favours speed; cached variants are compressed once
+FAST_LEVELS = {"br": 4, "zstd": 3, "gzip": 6}
+CACHED_LEVELS = {"br": 11, "zstd": 19, "gzip": 9}
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    level = FAST_LEVELS[encoding] if level is None else level
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def _accepted(header: str) -> Dict[str, float]:
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the encoding to use for an Accept-Encoding header, or None for identity"""
+    if not accept_encoding:
+        return None
+    accepted = _accepted(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in PREFERENCE:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def cached_response(request: Request, key: str, build: Callable[[], bytes], ttl: Optional[float] = None,
+                    media_type: str = "application/json", before_store: Callable[[], bool] = lambda: True) -> Response:
+    """Serve `build()`'s bytes from the cache, with precompressed variants.
+
+    `before_store` is checked before writing a freshly built body; returning
+    False (content changed meanwhile) serves the body without caching it.
+    """
+    cache = get_cache()
+    body = cache.get(key)
+    hit = body is not None
+    store = False
+    if not hit:
+        body = build()
+        store = before_store()
+        if store:
+            cache.set(key, body, ttl=ttl)
+
+    headers = {"Vary": "Accept-Encoding"}
+    encoding = negotiate(request.headers.get("accept-encoding")) if len(body) >= MIN_SIZE else None
+    if encoding is None:
+        return Response(body, media_type=media_type, headers=headers)
+
+    # Variants share the body's key prefix, so invalidating the body drops them too
+    variant_key = f"{key}#{encoding}"
+    cacheable = hit or store
+    compressed = cache.get(variant_key) if cacheable else None
+    if compressed is None:
+        compressed = compress(body, encoding, CACHED_LEVELS[encoding])
+        if cacheable:
+            cache.set(variant_key, compressed, ttl=ttl)
+    headers["Content-Encoding"] = encoding
+    return Response(compressed, media_type=media_type, headers=headers)
+
+
+class CompressionMiddleware:
+    """Compresses eligible responses that are not already encoded"""
+
+    def __init__(self, app, minimum_size: int = MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = negotiate(accept)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        accepted = _accepted(accept)
+        gzip_ok = accepted.get("gzip", accepted.get("*", 0.0)) > 0
+        await _CompressingResponder(self.app, encoding, self.minimum_size, gzip_ok)(scope, receive, send)
+
+
+class _CompressingResponder:
+    def __init__(self, app, encoding: str, minimum_size: int, gzip_ok: bool):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.gzip_ok = gzip_ok
+        self.start = None
+        self.active = False  # compressing this response
+        self.streaming = None  # zlib compressor for streamed bodies
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    def _eligible(self, headers) -> bool:
+        content_type = ""
+        for name, value in headers:
+            lowered = name.lower()
+            if lowered == b"content-encoding":
+                return False
+            if lowered == b"content-type":
+                content_type = value.decode("latin-1")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def _headers(self, encoding: str, length: Optional[int]):
+        headers, vary = [], []
+        for name, value in self.start["headers"]:
+            lowered = name.lower()
+            if lowered == b"vary":
+                vary.append(value)
+            elif lowered != b"content-length":
+                headers.append((name, value))
+        headers.append((b"content-encoding", encoding.encode()))
+        headers.append((b"vary", b", ".join(vary + [b"Accept-Encoding"])))
+        if length is not None:
+            headers.append((b"content-length", str(length).encode()))
+        return headers
+
+    async def send_wrapper(self, message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            self.active = self._eligible(message.get("headers", []))
+            if not self.active:
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or not self.active:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.streaming is None and not more_body:
+            # Whole body in one message
+            if len(body) < self.minimum_size:
+                await self.send(self.start)
+            else:
+                body = compress(body, self.encoding)
+                await self.send({**self.start, "headers": self._headers(self.encoding, len(body))})
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        if self.streaming is None:
+            if not self.gzip_ok:
+                self.active = False
+                await self.send(self.start)
+                await self.send(message)
+                return
+            # Streamed body: gzip incrementally, flushing each chunk
+            self.streaming = zlib.compressobj(FAST_LEVELS["gzip"], zlib.DEFLATED, 31)
+            await self.send({**self.start, "headers": self._headers("gzip", None)})
+        chunk = self.streaming.compress(body)
+        if more_body:
+            chunk += self.streaming.flush(zlib.Z_SYNC_FLUSH)
+        else:
+            chunk += self.streaming.flush()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -0,0 +1,103 @@
+"""
+Content change events for cache invalidation
+
+Write paths call `record(db, ContentEvent(...))` while they change topics or
+quizzes. The events are held on the session and delivered to subscribers
+only after the transaction commits (and dropped on rollback), so caches never
+see changes that did not happen. Each commit delivers its events as one list.
+
+Subscribers run in an empty context rather than the committing request's:
+reloading a cache serves every later request, so it must not inherit that
+request's deadline (services.overload) or be counted in its queries.
+"""
+
+import contextvars
+import logging
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "pending_content_events"
+
+Subscriber = Callable[[List["ContentEvent"]], None]
+_subscribers: List[Subscriber] = []
+# Forwards committed events to other worker processes (see services.cache)
+_remote_publisher: Optional[Subscriber] = None
+
+
+@dataclass(frozen=True)
+class ContentEvent:
+    entity: str  # "topic" or "quiz"
+    action: str  # "created", "updated", "deleted", or "related" (a topic's neighbour list only)
+    id: Optional[int] = None  # None means "all quizzes of topic_id" / "topic with slug"
+    topic_id: Optional[int] = None
+    slug: Optional[str] = None
+    previous_slug: Optional[str] = None
+
+
+def subscribe(callback: Subscriber) -> Subscriber:
+    """Register a callback for committed content changes (usable as a decorator)"""
+    if callback not in _subscribers:
+        _subscribers.append(callback)
+    return callback
+
+
+def unsubscribe(callback: Subscriber):
+    if callback in _subscribers:
+        _subscribers.remove(callback)
+
+
+def record(db: Session, content_event: ContentEvent):
+    """Queue an event to be published when `db` commits"""
+    db.info.setdefault(_PENDING_KEY, []).append(content_event)
+
+
+def pending(db: Session) -> List[ContentEvent]:
+    """Events recorded on `db` that its next commit will publish"""
+    return list(db.info.get(_PENDING_KEY, ()))
+
+
+def set_remote_publisher(callback: Optional[Subscriber]):
+    global _remote_publisher
+    _remote_publisher = callback
+
+
+def deliver(events: List[ContentEvent]):
+    """Deliver events to this process's subscribers; one failing cache must not block the rest"""
+    for callback in list(_subscribers):
+        try:
+            contextvars.Context().run(callback, events)
+        except Exception:
+            logger.exception("Content event subscriber %r failed", callback)
+
+
+def publish(events: List[ContentEvent]):
+    """Deliver events locally and forward them to the other workers"""
+    if not events:
+        return
+    deliver(events)
+    if _remote_publisher is not None:
+        try:
+            contextvars.Context().run(_remote_publisher, events)
+        except Exception:
+            logger.exception("Forwarding content events to other workers failed")
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session):
+    events = session.info.pop(_PENDING_KEY, None)
+    if events:
+        publish(events)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+# Every process that commits content changes must also log their versions
+from services import content_sync  # noqa: E402,F401
@@ -0,0 +1,401 @@
+"""
+Bulk import/export of legal topics and quizzes
+
+Records are streamed from JSONL or CSV, validated in batches and upserted
+with INSERT ... ON CONFLICT (topics by slug, quizzes by topic + question),
+one transaction per chunk. Export streams the same record format back out.
+
+Record format (one per JSONL line; CSV files use the same field names):
+    {"type": "topic", "slug": "...", "title": "...", "category": "...", "content": "...", ...}
+    {"type": "quiz", "topic_slug": "...", "question": "...", "options": [...], "correct_answer": 1, ...}
+"""
+
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, List, Optional, TextIO
+
+from pydantic import BaseModel, ValidationError, field_validator, model_validator
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from database import insert_for
+from models.topic_model import LegalTopic, Quiz
+from services import content_events
+from services.content_events import ContentEvent
+from services.tags import sync_topic_tags
+
+DEFAULT_BATCH_SIZE = 1000
+# Keep at most this many error messages in a report
+MAX_REPORTED_ERRORS = 100
+
+
+def _parse_list(value):
+    """CSV cells carry lists as JSON or as "a|b|c" """
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith("["):
+            return json.loads(value)
+        return [item.strip() for item in value.split("|") if item.strip()]
+    return value
+
+
+class TopicRecord(BaseModel):
+    slug: str
+    title: str
+    category: str
+    content: str
+    description: Optional[str] = None
+    difficulty_level: str = "beginner"
+    tags: List[str] = []
+    is_published: bool = True
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def parse_tags(cls, value):
+        return _parse_list(value) if value not in (None, "") else []
+
+    @field_validator("difficulty_level")
+    @classmethod
+    def check_level(cls, value):
+        if value not in ("beginner", "intermediate", "advanced"):
+            raise ValueError("difficulty_level must be beginner, intermediate or advanced")
+        return value
+
+
+class QuizFields(BaseModel):
+    question: str
+    options: List[str]
+    correct_answer: int
+    explanation: Optional[str] = None
+    difficulty: str = "easy"
+
+    @field_validator("options", mode="before")
+    @classmethod
+    def parse_options(cls, value):
+        return _parse_list(value)
+
+    @field_validator("difficulty")
+    @classmethod
+    def check_difficulty(cls, value):
+        if value not in ("easy", "medium", "hard"):
+            raise ValueError("difficulty must be easy, medium or hard")
+        return value
+
+    @model_validator(mode="after")
+    def check_answer(self):
+        if len(self.options) < 2:
+            raise ValueError("a quiz needs at least two options")
+        if not 0 <= self.correct_answer < len(self.options):
+            raise ValueError("correct_answer is out of range")
+        return self
+
+
+class QuizRecord(QuizFields):
+    topic_slug: str
+
+
+@dataclass
+class ImportReport:
+    processed: int = 0
+    topics_upserted: int = 0
+    quizzes_upserted: int = 0
+    errors: List[str] = field(default_factory=list)
+    error_count: int = 0
+
+    def add_error(self, line: int, message: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"record {line}: {message}")
+
+
+def read_records(stream: TextIO, fmt: str = "jsonl", kind: Optional[str] = None) -> Iterator[dict]:
+    """Yield raw records from a JSONL or CSV text stream.
+
+    `kind` sets the record type for CSV files without a `type` column.
+    Unparseable lines are yielded as {"_error": ...} so they are reported
+    with the right line number instead of aborting the import.
+    """
+    if fmt == "csv":
+        for row in csv.DictReader(stream):
+            record = {key: value for key, value in row.items() if value != ""}
+            if kind and "type" not in record:
+                record["type"] = kind
+            yield record
+        return
+
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield {"_error": f"invalid JSON ({e.msg})"}
+            continue
+        if kind and "type" not in record:
+            record["type"] = kind
+        yield record
+
+
+def _upsert_topics(db: Session, topics: List[TopicRecord]) -> int:
+    # Last record wins when a batch repeats a slug
+    rows = {
+        topic.slug: {
+            "slug": topic.slug,
+            "title": topic.title,
+            "description": topic.description,
+            "content": topic.content,
+            "difficulty_level": topic.difficulty_level,
+            "category": topic.category,
+            "tags": json.dumps(topic.tags),
+            "is_published": topic.is_published,
+        }
+        for topic in topics
+    }
+    insert = insert_for(db)
+    stmt = insert(LegalTopic)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LegalTopic.slug],
+        set_={
+            **{name: stmt.excluded[name] for name in next(iter(rows.values())) if name != "slug"},
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt, list(rows.values()))
+    sync_topic_tags(db, LegalTopic.slug.in_(list(rows)))
+    for slug in rows:
+        content_events.record(db, ContentEvent("topic", "updated", slug=slug))
+    return len(rows)
+
+
+def _upsert_quizzes(db: Session, quizzes: List[tuple], report: ImportReport) -> int:
+    slugs = {record.topic_slug for _, record in quizzes}
+    topic_ids = dict(db.execute(select(LegalTopic.slug, LegalTopic.id).where(LegalTopic.slug.in_(slugs))).all())
+
+    rows = {}
+    for line, record in quizzes:
+        topic_id = topic_ids.get(record.topic_slug)
+        if topic_id is None:
+            report.add_error(line, f"unknown topic_slug '{record.topic_slug}'")
+            continue
+        rows[(topic_id, record.question)] = {
+            "topic_id": topic_id,
+            "question": record.question,
+            "options": json.dumps(record.options),
+            "correct_answer": record.correct_answer,
+            "explanation": record.explanation,
+            "difficulty": record.difficulty,
+        }
+    if not rows:
+        return 0
+
+    insert = insert_for(db)
+    stmt = insert(Quiz)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Quiz.topic_id, Quiz.question],
+        # Importing a deleted quiz again restores it
+        set_={**{name: stmt.excluded[name] for name in ("options", "correct_answer", "explanation", "difficulty")},
+              "deleted_at": None},
+    )
+    db.execute(stmt, list(rows.values()))
+    # Upserts do not report row ids, so invalidate per topic
+    for topic_id in {topic_id for topic_id, _ in rows}:
+        content_events.record(db, ContentEvent("quiz", "updated", topic_id=topic_id))
+    return len(rows)
+
+
+def import_records(
+    db: Session,
+    records: Iterable[dict],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: Optional[Callable[[ImportReport], None]] = None,
+) -> ImportReport:
+    """Validate and upsert records in chunks, committing once per chunk.
+
+    Topics in a chunk are written before its quizzes, so a quiz may refer to
+    a topic defined earlier in the same file.
+    """
+    report = ImportReport()
+    batch: List[tuple] = []
+
+    def flush():
+        topics: List[TopicRecord] = []
+        quizzes: List[tuple] = []
+        for line, raw in batch:
+            if "_error" in raw:
+                report.add_error(line, raw["_error"])
+                continue
+            record_type = raw.get("type")
+            try:
+                if record_type == "topic":
+                    topics.append(TopicRecord.model_validate(raw))
+                elif record_type == "quiz":
+                    quizzes.append((line, QuizRecord.model_validate(raw)))
+                else:
+                    report.add_error(line, f"unknown record type {record_type!r}")
+            except ValidationError as e:
+                first = e.errors()[0]
+                location = ".".join(str(part) for part in first["loc"])
+                report.add_error(line, f"{location}: {first['msg']}" if location else first["msg"])
+
+        try:
+            if topics:
+                report.topics_upserted += _upsert_topics(db, topics)
+            if quizzes:
+                report.quizzes_upserted += _upsert_quizzes(db, quizzes, report)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        report.processed += len(batch)
+        batch.clear()
+        if progress:
+            progress(report)
+
+    for line, raw in enumerate(records, start=1):
+        batch.append((line, raw))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    return report
+
+
+def import_file(db: Session, stream: TextIO, fmt: str = "jsonl", kind: Optional[str] = None,
+                batch_size: int = DEFAULT_BATCH_SIZE,
+                progress: Optional[Callable[[ImportReport], None]] = None) -> ImportReport:
+    return import_records(db, read_records(stream, fmt, kind), batch_size=batch_size, progress=progress)
+
+
+def export_records(db: Session, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[dict]:
+    """Yield every topic, then every quiz, in import record format"""
+    topic_columns = (
+        LegalTopic.slug, LegalTopic.title, LegalTopic.category, LegalTopic.content,
+        LegalTopic.description, LegalTopic.difficulty_level, LegalTopic.tags, LegalTopic.is_published,
+    )
+    topics = db.execute(
+        select(*topic_columns).order_by(LegalTopic.id).execution_options(yield_per=batch_size)
+    )
+    for slug, title, category, content, description, level, tags, published in topics:
+        yield {
+            "type": "topic",
+            "slug": slug,
+            "title": title,
+            "category": category,
+            "content": content,
+            "description": description,
+            "difficulty_level": level,
+            "tags": json.loads(tags) if tags else [],
+            "is_published": published,
+        }
+
+    quizzes = db.execute(
+        select(
+            LegalTopic.slug, Quiz.question, Quiz.options, Quiz.correct_answer,
+            Quiz.explanation, Quiz.difficulty,
+        ).join(LegalTopic, LegalTopic.id == Quiz.topic_id)
+        .where(Quiz.deleted_at.is_(None))
+        .order_by(Quiz.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for slug, question, options, correct_answer, explanation, difficulty in quizzes:
+        yield {
+            "type": "quiz",
+            "topic_slug": slug,
+            "question": question,
+            "options": json.loads(options) if options else [],
+            "correct_answer": correct_answer,
+            "explanation": explanation,
+            "difficulty": difficulty,
+        }
+
+
+CSV_FIELDS = {
+    "topic": ["slug", "title", "category", "content", "description", "difficulty_level", "tags", "is_published"],
+    "quiz": ["topic_slug", "question", "options", "correct_answer", "explanation", "difficulty"],
+}
+
+
+def iter_export(db: Session, fmt: str = "jsonl", kind: Optional[str] = None,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[str]:
+    """Yield the export as text chunks (one per record, plus a CSV header).
+
+    CSV holds a single record type, so `kind` is required for CSV.
+    """
+    records = export_records(db, batch_size=batch_size)
+    if fmt != "csv":
+        for record in records:
+            if kind is None or record["type"] == kind:
+                yield json.dumps(record, ensure_ascii=False) + "\n"
+        return
+
+    if kind not in CSV_FIELDS:
+        raise ValueError("CSV export needs kind 'topic' or 'quiz'")
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS[kind], extrasaction="ignore")
+    writer.writeheader()
+    for record in records:
+        if record["type"] != kind:
+            continue
+        for name in ("tags", "options"):
+            if name in record:
+                record[name] = json.dumps(record[name], ensure_ascii=False)
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import time
+
+    from database import SessionLocal, create_tables
+
+    parser = argparse.ArgumentParser(description="Import or export topics and quizzes")
+    sub = parser.add_subparsers(dest="command", required=True)
+    import_parser = sub.add_parser("import", help="Upsert records from a JSONL or CSV file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=["jsonl", "csv"], default=None)
+    import_parser.add_argument("--kind", choices=["topic", "quiz"], default=None)
+    import_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    export_parser = sub.add_parser("export", help="Write all records to a file ('-' for stdout)")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    export_parser.add_argument("--kind", choices=["topic", "quiz"], default=None)
+    args = parser.parse_args()
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        if args.command == "import":
+            fmt = args.format or ("csv" if args.path.endswith(".csv") else "jsonl")
+            started = time.perf_counter()
+
+            def show_progress(report: ImportReport):
+                rate = report.processed / max(time.perf_counter() - started, 1e-9)
+                print(f"  {report.processed} records ({rate:,.0f}/s), {report.error_count} errors", file=sys.stderr)
+
+            with open(args.path, newline="", encoding="utf-8") as f:
+                report = import_file(db, f, fmt, args.kind, args.batch_size, progress=show_progress)
+            print(f"✅ Imported {report.topics_upserted} topics and {report.quizzes_upserted} quizzes "
+                  f"in {time.perf_counter() - started:.1f}s")
+            for error in report.errors:
+                print(f"❌ {error}")
+        else:
+            out = sys.stdout if args.path == "-" else open(args.path, "w", newline="", encoding="utf-8")
+            try:
+                for chunk in iter_export(db, args.format, args.kind):
+                    out.write(chunk)
+            finally:
+                if out is not sys.stdout:
+                    out.close()
+    finally:
+        db.close()
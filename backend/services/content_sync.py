@@ -0,0 +1,202 @@
+"""
+Content versions and delta sync
+
+Every commit that records content events (see services.content_events)
+also writes one content_changes row per changed topic or quiz, in the same
+transaction. The rows' autoincrement `version` is the content version: it
+only grows, and versions become visible in order (SQLite serializes
+writers; on PostgreSQL, where sequence values can commit out of order, a
+logging writer locks content_changes until it commits). So a client that
+has everything up to version v asks for the rows changed after v and gets
+back:
+
+    {"version": <current>, "full": false,
+     "topics": [...], "quizzes": [...],                 # inserted or updated
+     "deleted": {"topics": [...], "quizzes": [...]}}    # ids to drop
+
+Only published topics and the quizzes of published topics are sent; a topic
+that was unpublished is listed as deleted, and a changed topic's quizzes are
+re-sent (or deleted) with it. A change row without entity_id means every
+row of that entity may have changed; clients behind one, new clients
+(since=0) and clients more than MAX_DELTA_CHANGES behind get a full snapshot
+("full": true) instead.
+
+The same log lets a worker forked from the launcher catch up: its caches
+were built at preload, so at startup `catch_up` delivers the changes
+committed since then (while it was not yet listening to the invalidation
+bus, e.g. a worker restarted after a crash) as content events.
+"""
+
+import json
+import logging
+from typing import Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, func, select, text
+from sqlalchemy.orm import Session
+
+from models.quiz_model import QuizStats
+from models.topic_model import ContentChange, LegalTopic, Quiz
+from services import content_events, lifecycle
+from services.content_events import ContentEvent
+
+logger = logging.getLogger(__name__)
+
+# A client further behind than this gets a full snapshot
+MAX_DELTA_CHANGES = 500
+
+TOPIC_COLUMNS = (
+    LegalTopic.id, LegalTopic.title, LegalTopic.slug, LegalTopic.description, LegalTopic.content,
+    LegalTopic.difficulty_level, LegalTopic.category, LegalTopic.tags, LegalTopic.is_published,
+)
+
+
+@event.listens_for(Session, "before_commit")
+def _log_changes(session: Session):
+    # Related-topic lists (services.related) are not part of the synced content
+    events = [e for e in content_events.pending(session) if e.action != "related"]
+    if not events:
+        return
+    session.flush()
+    if session.get_bind().dialect.name == "postgresql":
+        # Versions must appear in commit order: a client synced to v must never see a
+        # lower version commit later. Held until commit, so logging writers take turns.
+        session.execute(text("LOCK TABLE content_changes IN EXCLUSIVE MODE"))
+    changes = set()
+    for content_event in events:
+        if content_event.id is not None:
+            changes.add((content_event.entity, content_event.id))
+        elif content_event.entity == "topic" and content_event.slug is not None:
+            topic_id = session.scalar(select(LegalTopic.id).where(LegalTopic.slug == content_event.slug))
+            if topic_id is not None:
+                changes.add(("topic", topic_id))
+        elif content_event.entity == "quiz" and content_event.topic_id is not None:
+            changes.update(("quiz", quiz_id) for quiz_id in session.scalars(
+                select(Quiz.id).where(Quiz.topic_id == content_event.topic_id)))
+        else:
+            changes.add((content_event.entity, None))
+    if changes:
+        session.execute(ContentChange.__table__.insert(), [
+            {"entity": entity, "entity_id": entity_id}
+            for entity, entity_id in sorted(changes, key=lambda change: (change[0], change[1] or 0))
+        ])
+
+
+def current_version(db: Session) -> int:
+    return db.scalar(select(func.max(ContentChange.version))) or 0
+
+
+# Content version when the preload hooks ran; the caches they built include it
+_preloaded_version: Optional[int] = None
+
+
+@lifecycle.on_preload
+def _remember_version():
+    # Registered when content_events is imported, so this runs before any cache loads
+    from database import SessionLocal
+
+    global _preloaded_version
+    db = SessionLocal()
+    try:
+        _preloaded_version = current_version(db)
+    finally:
+        db.close()
+
+
+def catch_up() -> int:
+    """Deliver content changes committed since preload to this process's caches.
+
+    Called once the invalidation bus is listening, so no change falls between
+    the two. Returns the number of changed rows.
+    """
+    from database import SessionLocal
+
+    global _preloaded_version
+    since, _preloaded_version = _preloaded_version, None
+    if since is None:
+        return 0
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(ContentChange.entity, ContentChange.entity_id)
+            .where(ContentChange.version > since)
+            .distinct()
+        ).all()
+    finally:
+        db.close()
+    if not rows:
+        return 0
+    events = [ContentEvent(entity, "updated", id=entity_id) for entity, entity_id in rows if entity_id is not None]
+    if len(events) < len(rows):
+        # Unkeyed changes: every topic and quiz may differ
+        events += [ContentEvent("topic", "updated"), ContentEvent("quiz", "updated")]
+    content_events.deliver(events)
+    logger.info("Caught up with %d content changes since preload", len(rows))
+    return len(rows)
+
+
+def changed_since(db: Session, since: int, version: int) -> Optional[Tuple[Set[int], Set[int]]]:
+    """(topic ids, quiz ids) changed in (since, version], or None when a full snapshot is needed"""
+    if since <= 0 or since > version:
+        return None
+    rows = db.execute(
+        select(ContentChange.entity, ContentChange.entity_id)
+        .where(ContentChange.version > since, ContentChange.version <= version)
+        .distinct()
+        .limit(MAX_DELTA_CHANGES + 1)
+    ).all()
+    if len(rows) > MAX_DELTA_CHANGES or any(entity_id is None for _, entity_id in rows):
+        return None
+    return ({entity_id for entity, entity_id in rows if entity == "topic"},
+            {entity_id for entity, entity_id in rows if entity == "quiz"})
+
+
+def _parse_options(raw: Optional[str]) -> list:
+    try:
+        return json.loads(raw or "[]")
+    except json.JSONDecodeError:
+        return []
+
+
+def _topics(db: Session, ids: Optional[Iterable[int]] = None) -> List[dict]:
+    query = select(*TOPIC_COLUMNS).where(LegalTopic.is_published == True).order_by(LegalTopic.id)
+    if ids is not None:
+        query = query.where(LegalTopic.id.in_(list(ids)))
+    return [dict(row._mapping) for row in db.execute(query)]
+
+
+def _quizzes(db: Session, ids: Optional[Iterable[int]] = None) -> List[dict]:
+    # Same fields as the quiz list endpoint: no correct answer, observed difficulty once tuned
+    query = select(
+        Quiz.id, Quiz.topic_id, Quiz.question, Quiz.options, Quiz.explanation,
+        func.coalesce(QuizStats.observed_difficulty, Quiz.difficulty).label("difficulty"),
+    ).join(LegalTopic, LegalTopic.id == Quiz.topic_id).outerjoin(
+        QuizStats, QuizStats.quiz_id == Quiz.id
+    ).where(LegalTopic.is_published == True, Quiz.deleted_at.is_(None)).order_by(Quiz.id)
+    if ids is not None:
+        query = query.where(Quiz.id.in_(list(ids)))
+    return [{**row._mapping, "options": _parse_options(row.options)} for row in db.execute(query)]
+
+
+def snapshot(db: Session, version: int) -> dict:
+    """Everything a client needs, as of `version`"""
+    return {"version": version, "full": True, "topics": _topics(db), "quizzes": _quizzes(db),
+            "deleted": {"topics": [], "quizzes": []}}
+
+
+def delta(db: Session, version: int, topic_ids: Set[int], quiz_ids: Set[int]) -> dict:
+    """Rows of the changed topics and quizzes; the ones no longer visible are listed as deleted"""
+    # A changed topic's quizzes appear or disappear with it
+    if topic_ids:
+        quiz_ids = quiz_ids | set(db.scalars(select(Quiz.id).where(Quiz.topic_id.in_(list(topic_ids)))))
+    topics = _topics(db, topic_ids) if topic_ids else []
+    quizzes = _quizzes(db, quiz_ids) if quiz_ids else []
+    return {
+        "version": version,
+        "full": False,
+        "topics": topics,
+        "quizzes": quizzes,
+        "deleted": {
+            "topics": sorted(topic_ids - {topic["id"] for topic in topics}),
+            "quizzes": sorted(quiz_ids - {quiz["id"] for quiz in quizzes}),
+        },
+    }
@@ -0,0 +1,229 @@
+"""
+Timed exam sessions
+
+Starting an exam draws its whole deck in one query: quizzes of published
+topics are ranked in random order within each (topic, effective difficulty)
+stratum with ROW_NUMBER(), and ordering by that rank takes one question
+from every stratum before a second from any, so a deck covers as many
+topics and difficulties as its size allows. The deck is stored compactly
+in exam_sessions: the quiz ids packed as uint32 plus a random seed.
+
+Each question's options are shown in an order derived from the seed and
+the quiz id, so every page request shows the same order without storing
+it, and answers are mapped back through the same permutation at finish.
+
+Pages are served from an in-memory LRU of decks (well under a kilobyte per
+session) and quiz content from the catalog; only a deck this worker has
+not seen yet costs a query. Answers stay on the client until finish,
+which grades them and writes every QuizResult row in one bulk INSERT.
+Exam answers do not update the spaced-repetition schedule or the running
+quiz statistics; `rebuild_quiz_stats` picks them up from QuizResult.
+"""
+
+import random
+import secrets
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from models.quiz_model import ExamSession, QuizStats
+from models.topic_model import LegalTopic, Quiz, QuizResult
+from services.catalog import Catalog
+
+MAX_CACHED_DECKS = 20000
+FINISH_GRACE = timedelta(seconds=30)  # answers sent right at the deadline still count
+_MASK64 = (1 << 64) - 1
+
+
+@dataclass
+class Deck:
+    id: int
+    user_id: int
+    seed: int
+    quiz_ids: array
+    expires_at: datetime
+    finished: bool = False
+
+    def remaining_seconds(self, now: Optional[datetime] = None) -> int:
+        now = now or datetime.now(timezone.utc)
+        return max(int((self.expires_at - now).total_seconds()), 0)
+
+    def accepts_answers(self, now: Optional[datetime] = None) -> bool:
+        return not self.finished and (now or datetime.now(timezone.utc)) <= self.expires_at + FINISH_GRACE
+
+
+def pack(quiz_ids: Sequence[int]) -> bytes:
+    ids = array("I", quiz_ids)
+    if sys.byteorder == "big":
+        ids.byteswap()
+    return ids.tobytes()
+
+
+def unpack(raw: bytes) -> array:
+    ids = array("I")
+    ids.frombytes(raw)
+    if sys.byteorder == "big":
+        ids.byteswap()
+    return ids
+
+
+def option_order(seed: int, quiz_id: int, count: int) -> List[int]:
+    """Original option indexes in the order this session shows them"""
+    # Fisher-Yates driven by a 64-bit LCG: a few µs, unlike seeding random.Random per
+    # question, and stable across Python versions for sessions stored before an upgrade
+    state = (seed * 0x9E3779B97F4A7C15 + quiz_id) & _MASK64
+    order = list(range(count))
+    for i in range(count - 1, 0, -1):
+        state = (state * 6364136223846793005 + 1442695040888963407) & _MASK64
+        j = (state >> 33) % (i + 1)
+        order[i], order[j] = order[j], order[i]
+    return order
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite returns naive timestamps; they are stored in UTC
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+class DeckCache:
+    """Least recently used decks by exam id"""
+
+    def __init__(self, max_entries: int = MAX_CACHED_DECKS):
+        self.max_entries = max_entries
+        self._decks: "OrderedDict[int, Deck]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, exam_id: int) -> Optional[Deck]:
+        with self._lock:
+            deck = self._decks.get(exam_id)
+            if deck is not None:
+                self._decks.move_to_end(exam_id)
+            return deck
+
+    def put(self, deck: Deck):
+        with self._lock:
+            self._decks[deck.id] = deck
+            self._decks.move_to_end(deck.id)
+            while len(self._decks) > self.max_entries:
+                self._decks.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._decks.clear()
+
+
+decks = DeckCache()
+
+
+def draw(db: Session, count: int, topic_ids: Optional[Sequence[int]] = None,
+         category: Optional[str] = None) -> List[int]:
+    """Up to `count` quiz ids stratified by topic and difficulty, in random order"""
+    difficulty = func.coalesce(QuizStats.observed_difficulty, Quiz.difficulty)
+    ranked = select(
+        Quiz.id,
+        func.row_number().over(partition_by=(Quiz.topic_id, difficulty), order_by=func.random()).label("stratum_rank"),
+    ).join(LegalTopic, LegalTopic.id == Quiz.topic_id).outerjoin(
+        QuizStats, QuizStats.quiz_id == Quiz.id
+    ).where(LegalTopic.is_published == True, Quiz.deleted_at.is_(None))
+    if topic_ids:
+        ranked = ranked.where(Quiz.topic_id.in_(list(topic_ids)))
+    if category:
+        ranked = ranked.where(LegalTopic.category == category)
+    ranked = ranked.subquery()
+    quiz_ids = list(db.scalars(
+        select(ranked.c.id).order_by(ranked.c.stratum_rank, func.random()).limit(count)))
+    # Rounds come out stratum by stratum; mix them so topics do not repeat in a fixed cycle
+    random.shuffle(quiz_ids)
+    return quiz_ids
+
+
+def start(db: Session, user_id: int, count: int, duration: timedelta,
+          topic_ids: Optional[Sequence[int]] = None, category: Optional[str] = None) -> Optional[Deck]:
+    """Draw and store a new exam (committed); None when no quiz matches"""
+    quiz_ids = draw(db, count, topic_ids, category)
+    if not quiz_ids:
+        return None
+    started_at, seed = datetime.now(timezone.utc), secrets.randbits(31)
+    session = ExamSession(user_id=user_id, seed=seed, quiz_ids=pack(quiz_ids),
+                          started_at=started_at, expires_at=started_at + duration)
+    db.add(session)
+    db.flush()
+    deck = Deck(session.id, user_id, seed, array("I", quiz_ids), started_at + duration)
+    db.commit()
+    decks.put(deck)
+    return deck
+
+
+def get(db: Session, exam_id: int) -> Optional[Deck]:
+    deck = decks.get(exam_id)
+    if deck is None:
+        session = db.get(ExamSession, exam_id)
+        if session is None:
+            return None
+        deck = Deck(session.id, session.user_id, session.seed, unpack(session.quiz_ids),
+                    _utc(session.expires_at), session.finished_at is not None)
+        decks.put(deck)
+    return deck
+
+
+def page(deck: Deck, snapshot: Catalog, number: int, size: int) -> List[dict]:
+    """Questions of one page with options in this session's order (no answers)"""
+    questions = []
+    start_position = number * size
+    for position, quiz_id in enumerate(deck.quiz_ids[start_position:start_position + size], start_position):
+        quiz = snapshot.quizzes.get(quiz_id)
+        if quiz is None:
+            continue  # deleted or unpublished since the exam started
+        order = option_order(deck.seed, quiz_id, len(quiz.options))
+        questions.append({
+            "position": position, "quiz_id": quiz_id, "topic_id": quiz.topic_id, "question": quiz.question,
+            "options": [quiz.options[index] for index in order], "difficulty": quiz.effective_difficulty,
+        })
+    return questions
+
+
+def finish(db: Session, deck: Deck, snapshot: Catalog, answers: Dict[int, Tuple[int, Optional[int]]]) -> Optional[dict]:
+    """Grade {quiz id: (shown option index, time taken)} and write the results (committed)
+
+    Returns None if the exam was already finished (possibly by another worker).
+    """
+    results, rows = [], []
+    for quiz_id in deck.quiz_ids:
+        quiz = snapshot.quizzes.get(quiz_id)
+        if quiz is None or not quiz.options:
+            continue
+        order = option_order(deck.seed, quiz_id, len(quiz.options))
+        selected, time_taken = answers.get(quiz_id, (None, None))
+        if selected is not None and not 0 <= selected < len(order):
+            selected = None
+        is_correct = selected is not None and order[selected] == quiz.correct_answer
+        results.append({
+            "quiz_id": quiz_id, "selected_answer": selected, "is_correct": is_correct,
+            "correct_answer": order.index(quiz.correct_answer) if quiz.correct_answer in order else None,
+            "explanation": quiz.explanation,
+        })
+        if selected is not None:
+            rows.append({"user_id": deck.user_id, "quiz_id": quiz_id, "selected_answer": order[selected],
+                         "is_correct": is_correct, "time_taken": time_taken})
+    score = sum(row["is_correct"] for row in rows)
+
+    claimed = db.execute(
+        update(ExamSession)
+        .where(ExamSession.id == deck.id, ExamSession.finished_at.is_(None))
+        .values(finished_at=datetime.now(timezone.utc), score=score, answered=len(rows))
+    ).rowcount
+    deck.finished = True
+    if not claimed:
+        db.rollback()
+        return None
+    if rows:
+        db.execute(QuizResult.__table__.insert(), rows)
+    db.commit()
+    return {"score": score, "answered": len(rows), "results": results}
@@ -0,0 +1,57 @@
+"""
+Fast JSON responses
+
+List endpoints select plain column tuples and encode them straight to bytes
+with orjson, returning a Response so FastAPI skips the second response_model
+validation (the model still documents the schema). Cached endpoints keep the
+encoded bytes and serve them with EncodedJSONResponse.
+
+orjson is optional; without it the stdlib encoder is used with the same
+output shape.
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+# App-wide default for endpoints that still return models or dicts
+DefaultJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def rows_to_dicts(columns: Sequence[str], rows: Iterable[Sequence],
+                  transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """Zip selected column tuples into dicts, optionally reshaping each one"""
+    items = [dict(zip(columns, row)) for row in rows]
+    if transform is not None:
+        items = [transform(item) for item in items]
+    return items
+
+
+class EncodedJSONResponse(Response):
+    """A response whose body is already JSON-encoded bytes"""
+
+    media_type = "application/json"
+
+
+def rows_response(columns: Sequence[str], rows: Iterable[Sequence],
+                  transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None) -> EncodedJSONResponse:
+    return EncodedJSONResponse(dumps(rows_to_dicts(columns, rows, transform)))
@@ -1,9 +1,12 @@
 import os
+import re
 from typing import Optional
 from dotenv import load_dotenv
 from pathlib import Path
 # Note: google.generativeai import removed - AI is completely disabled
 
+from services import spelling
+
 # Get the backend directory path
 BACKEND_DIR = Path(__file__).parent.parent
 ENV_FILE = BACKEND_DIR / ".env"
@@ -127,11 +130,36 @@ Always keep copies of contracts and consult a lawyer for complex agreements.""",
 - Keep records of creation dates
 - Consider professional legal advice for valuable IP"""
     }
+
+    # Phrases that point at a common question when the question itself is worded differently
+    KEYWORDS = {
+        "consumer rights": "what are my consumer rights",
+        "tenant rights": "what are my rights as a tenant",
+        "employee rights": "what are my employee rights",
+        "cyberbullying": "what is cyberbullying",
+        "contract": "what is a contract",
+        "intellectual property": "what is intellectual property",
+    }
+
+    # Correctly spelled words the answers happen not to use; the speller must
+    # leave them alone rather than "fix" them to a nearby answer word
+    EVERYDAY_WORDS = (
+        "sue", "sued", "suing", "court", "judge", "lawyer", "attorney", "police", "claim",
+        "refund", "return", "landlord", "deposit", "rent", "evict", "eviction", "lease",
+        "boss", "fired", "wage", "wages", "salary", "paid", "pay", "job", "work", "hours",
+        "online", "post", "posted", "photo", "bully", "harass", "threat", "threats",
+        "sign", "signed", "broke", "break", "copy", "copied", "song", "book", "idea",
+        "i", "me", "my", "we", "you", "he", "she", "they", "it", "is", "am", "are", "was",
+        "do", "does", "did", "can", "could", "should", "would", "will", "want", "need",
+        "how", "what", "why", "when", "where", "who", "which", "if", "to", "the", "a", "an",
+        "help", "get", "got", "buy", "bought", "sell", "sold", "said", "say", "tell", "told",
+    )
     
     def __init__(self):
         # Don't store API key, always get it fresh
         self._model_name = None
         self.model = None
+        self._speller = None
         # AI is completely disabled - only common questions are used
         # No model initialization needed
     
@@ -169,27 +197,40 @@ Please ask about one of these topics for an instant explanation!"""
     def _check_common_questions(self, question: str) -> Optional[str]:
         """Check if question matches a common question and return pre-written answer"""
         question_lower = question.lower().strip()
-        
+        answer = self._match_common_question(question_lower)
+        if answer is None:
+            # Retry with typos fixed ("tennant rights", "cyber bulling"). A
+            # corrected fragment like "wht" -> "what" is part of every question,
+            # so only a whole question or whole keyword counts after correction
+            corrected = self._get_speller().correct(question_lower)
+            if corrected != question_lower:
+                answer = self._match_common_question(corrected, strict=True)
+        return answer
+
+    def _match_common_question(self, question_lower: str, strict: bool = False) -> Optional[str]:
         # Check for exact or close matches
         for common_q, answer in self.COMMON_QUESTIONS.items():
-            if common_q in question_lower or question_lower in common_q:
+            if common_q in question_lower or (not strict and question_lower in common_q):
                 return answer
         
         # Check for keyword matches
-        keywords = {
-            "consumer rights": self.COMMON_QUESTIONS["what are my consumer rights"],
-            "tenant rights": self.COMMON_QUESTIONS["what are my rights as a tenant"],
-            "employee rights": self.COMMON_QUESTIONS["what are my employee rights"],
-            "cyberbullying": self.COMMON_QUESTIONS["what is cyberbullying"],
-            "contract": self.COMMON_QUESTIONS["what is a contract"],
-            "intellectual property": self.COMMON_QUESTIONS["what is intellectual property"],
-        }
-        
-        for keyword, answer in keywords.items():
-            if keyword in question_lower:
-                return answer
+        for keyword, common_q in self.KEYWORDS.items():
+            if strict:
+                if re.search(r"\b%s\b" % re.escape(keyword), question_lower):
+                    return self.COMMON_QUESTIONS[common_q]
+            elif keyword in question_lower:
+                return self.COMMON_QUESTIONS[common_q]
         
         return None
+
+    def _get_speller(self) -> spelling.SymSpell:
+        """Typo index over the questions, keywords and answers (built on first use)"""
+        if self._speller is None:
+            self._speller = spelling.build(
+                [*self.COMMON_QUESTIONS, *self.KEYWORDS, *self.COMMON_QUESTIONS.values()],
+                known=self.EVERYDAY_WORDS,
+            )
+        return self._speller
     
     async def answer_legal_question(self, question: str, context: str = "") -> str:
         """Answer a legal question in simple terms"""
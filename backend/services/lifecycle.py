@@ -0,0 +1,68 @@
+"""
+Process lifecycle hooks
+
+Modules register work to run at three points:
+
+- preload: once in the launcher process before workers are forked, so
+  warmed data is shared copy-on-write (also run at startup when there is no
+  launcher, e.g. `uvicorn main:app`)
+- startup: in every worker when the app starts serving
+- shutdown: in every worker after in-flight requests have drained; write
+  buffers flush here
+
+Hooks run in registration order (shutdown in reverse order); a failing hook
+is logged and does not stop the others.
+"""
+
+import logging
+import os
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+Hook = Callable[[], None]
+
+_preload: List[Hook] = []
+_startup: List[Hook] = []
+_shutdown: List[Hook] = []
+
+# Set by the launcher once preload hooks have run in the parent process
+PRELOADED_ENV = "RIGHTS360_PRELOADED"
+
+
+def on_preload(hook: Hook) -> Hook:
+    _preload.append(hook)
+    return hook
+
+
+def on_startup(hook: Hook) -> Hook:
+    _startup.append(hook)
+    return hook
+
+
+def on_shutdown(hook: Hook) -> Hook:
+    _shutdown.append(hook)
+    return hook
+
+
+def _run(hooks: List[Hook], stage: str):
+    for hook in hooks:
+        try:
+            hook()
+        except Exception:
+            logger.exception("%s hook %s failed", stage, getattr(hook, "__qualname__", hook))
+
+
+def run_preload():
+    _run(_preload, "preload")
+    os.environ[PRELOADED_ENV] = "1"
+
+
+def run_startup():
+    if not os.environ.get(PRELOADED_ENV):
+        _run(_preload, "preload")
+    _run(_startup, "startup")
+
+
+def run_shutdown():
+    _run(list(reversed(_shutdown)), "shutdown")
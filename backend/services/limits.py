@@ -0,0 +1,169 @@
+"""
+Rate limits and concurrency bulkheads
+
+RateLimit is a token bucket per key (the user id), usable as a route
+dependency. Buckets live in process memory, or in Redis when CACHE_URL points
+at one so every worker shares them (an atomic Lua script does the refill and
+take).
+
+Bulkhead caps how many requests of one router are in progress at once, so
+a burst on one router (e.g. the AI assistant) cannot take every threadpool
+thread and starve the others. It is attached as a router dependency, so
+it is held from before the endpoint's own dependencies run until the
+response has been sent.
+
+Both reject immediately with 429 and a Retry-After header instead of
+queueing.
+"""
+
+import math
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, status
+
+from models.user_model import User
+from routers.auth import get_current_user
+from services.cache import RedisCache, get_cache
+
+MAX_MEMORY_BUCKETS = 50000
+
+
+def _env_number(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+class MemoryRateStore:
+    """Token buckets in process memory"""
+
+    def __init__(self, max_buckets: int = MAX_MEMORY_BUCKETS):
+        self.max_buckets = max_buckets
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # key -> (tokens, updated at)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> Tuple[bool, float]:
+        """Take `cost` tokens; return (allowed, seconds until enough tokens)"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                allowed, retry_after = True, 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                allowed, retry_after = False, (cost - tokens) / rate
+            if len(self._buckets) > self.max_buckets:
+                self._evict_full(now, rate, burst)
+        return allowed, retry_after
+
+    def _evict_full(self, now: float, rate: float, burst: float):
+        # A bucket that has refilled completely is the same as no bucket
+        for key, (tokens, updated) in list(self._buckets.items()):
+            if tokens + (now - updated) * rate >= burst:
+                del self._buckets[key]
+
+
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class RedisRateStore:
+    """Token buckets shared by all workers through Redis"""
+
+    def __init__(self, cache: RedisCache):
+        self._script = cache.client.register_script(_TOKEN_BUCKET_LUA)
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> Tuple[bool, float]:
+        allowed, retry_after = self._script(keys=[f"rights360:rate:{key}"], args=[rate, burst, cost])
+        return bool(int(allowed)), float(retry_after)
+
+
+_store = None
+
+
+def get_rate_store():
+    """Shared store when the cache tier is Redis, otherwise per process"""
+    global _store
+    if _store is None:
+        cache = get_cache()
+        _store = RedisRateStore(cache) if isinstance(cache, RedisCache) else MemoryRateStore()
+    return _store
+
+
+def too_many_requests(detail: str, retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class RateLimit:
+    """Per-user token bucket: `per_minute` sustained, bursts of up to `burst`"""
+
+    def __init__(self, name: str, per_minute: float, burst: float):
+        self.name = name
+        self.rate = per_minute / 60.0
+        self.burst = burst
+
+    def __call__(self, current_user: User = Depends(get_current_user)):
+        allowed, retry_after = get_rate_store().take(f"{self.name}:{current_user.id}", self.rate, self.burst)
+        if not allowed:
+            raise too_many_requests(f"Rate limit exceeded for {self.name} requests", retry_after)
+
+
+class Bulkhead:
+    """At most `limit` requests of one router in progress at a time"""
+
+    RETRY_AFTER = 1
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.active = 0
+
+    async def __call__(self):
+        # Runs on the event loop, so the counter needs no lock
+        if self.active >= self.limit:
+            raise too_many_requests(f"Too many concurrent {self.name} requests", self.RETRY_AFTER)
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+
+
+def bulkhead(name: str, default_limit: int) -> Bulkhead:
+    """Bulkhead sized by RIGHTS360_BULKHEAD_<NAME> (falls back to `default_limit`)"""
+    return Bulkhead(name, int(_env_number(f"RIGHTS360_BULKHEAD_{name.upper()}", default_limit)))
+
+
+def rate_limit(name: str, per_minute: float, burst: Optional[float] = None) -> RateLimit:
+    """Rate limit tuned by RIGHTS360_<NAME>_RATE_PER_MINUTE and RIGHTS360_<NAME>_BURST"""
+    prefix = f"RIGHTS360_{name.upper()}"
+    per_minute = _env_number(f"{prefix}_RATE_PER_MINUTE", per_minute)
+    return RateLimit(name, per_minute, _env_number(f"{prefix}_BURST", burst if burst is not None else per_minute))
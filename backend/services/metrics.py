@@ -0,0 +1,184 @@
+"""
+Request metrics in Prometheus text format
+
+MetricsMiddleware is a pure ASGI middleware that records, per route template
+(e.g. /api/quiz/{quiz_id}/stats rather than the raw path):
+
+- rights360_http_request_duration_seconds: latency histogram
+- rights360_http_requests_total: request counter by status code
+- rights360_http_requests_in_flight: gauge per router group (/api/quiz, ...)
+
+The hot path only touches plain dicts and lists owned by the current thread,
+so no lock is taken while serving; `render()` merges the per-thread shards
+when /metrics is scraped. Each worker process keeps its own counters, so with
+several workers a scrape reports the worker that answered it (label
+`worker` is the pid).
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+OTHER_GROUP = "other"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Shard:
+    """Counters written by a single thread"""
+
+    __slots__ = ("latency", "statuses", "in_flight")
+
+    def __init__(self):
+        # (method, route) -> [bucket counts..., +Inf count, sum of seconds]
+        self.latency: Dict[Tuple[str, str], List[float]] = {}
+        # (method, route, status) -> count
+        self.statuses: Dict[Tuple[str, str, int], int] = {}
+        # group -> requests started minus requests finished on this thread
+        self.in_flight: Dict[str, int] = {}
+
+
+_local = threading.local()
+_shards: List[_Shard] = []
+_shards_lock = threading.Lock()
+
+
+def _shard() -> _Shard:
+    shard = getattr(_local, "shard", None)
+    if shard is None:
+        shard = _local.shard = _Shard()
+        with _shards_lock:
+            _shards.append(shard)
+    return shard
+
+
+def observe(method: str, route: str, status: int, seconds: float):
+    shard = _shard()
+    key = (method, route)
+    series = shard.latency.get(key)
+    if series is None:
+        series = shard.latency[key] = [0.0] * (len(LATENCY_BUCKETS) + 2)
+    series[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+    series[-1] += seconds
+    status_key = (method, route, status)
+    shard.statuses[status_key] = shard.statuses.get(status_key, 0) + 1
+
+
+def reset():
+    with _shards_lock:
+        for shard in _shards:
+            shard.latency.clear()
+            shard.statuses.clear()
+            shard.in_flight.clear()
+
+
+class MetricsMiddleware:
+    """Times every HTTP request and counts it under its route template"""
+
+    def __init__(self, app, groups: Iterable[str] = ()):
+        self.app = app
+        # Longest prefix first so /api/quiz-admin would not match /api/quiz
+        self.groups = sorted(groups, key=len, reverse=True)
+
+    def _group(self, path: str) -> str:
+        for prefix in self.groups:
+            if path.startswith(prefix) and (len(path) == len(prefix) or path[len(prefix)] == "/"):
+                return prefix
+        return OTHER_GROUP
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        shard = _shard()
+        group = self._group(scope["path"])
+        shard.in_flight[group] = shard.in_flight.get(group, 0) + 1
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ROUTE
+            observe(scope["method"], template, status, elapsed)
+            # A task never changes threads, so this is still the shard we incremented
+            shard.in_flight[group] -= 1
+
+
+def _merge():
+    latency: Dict[Tuple[str, str], List[float]] = {}
+    statuses: Dict[Tuple[str, str, int], int] = {}
+    in_flight: Dict[str, int] = {}
+    with _shards_lock:
+        shards = list(_shards)
+    for shard in shards:
+        for key, series in list(shard.latency.items()):
+            total = latency.setdefault(key, [0.0] * len(series))
+            for i, value in enumerate(series):
+                total[i] += value
+        for key, count in list(shard.statuses.items()):
+            statuses[key] = statuses.get(key, 0) + count
+        for group, count in list(shard.in_flight.items()):
+            in_flight[group] = in_flight.get(group, 0) + count
+    return latency, statuses, in_flight
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def render() -> str:
+    """Return all metrics in the Prometheus text exposition format"""
+    latency, statuses, in_flight = _merge()
+    worker = os.getpid()
+    lines = [
+        "# HELP rights360_http_request_duration_seconds Request latency by route",
+        "# TYPE rights360_http_request_duration_seconds histogram",
+    ]
+    for (method, route), series in sorted(latency.items()):
+        base = _labels(worker=worker, method=method, route=route)
+        cumulative = 0.0
+        for bound, count in zip(LATENCY_BUCKETS, series):
+            cumulative += count
+            lines.append(f'rights360_http_request_duration_seconds_bucket{{{base},le="{bound}"}} {_number(cumulative)}')
+        cumulative += series[len(LATENCY_BUCKETS)]
+        lines.append(f'rights360_http_request_duration_seconds_bucket{{{base},le="+Inf"}} {_number(cumulative)}')
+        lines.append(f"rights360_http_request_duration_seconds_sum{{{base}}} {series[-1]!r}")
+        lines.append(f"rights360_http_request_duration_seconds_count{{{base}}} {_number(cumulative)}")
+
+    lines += [
+        "# HELP rights360_http_requests_total Requests by route and status code",
+        "# TYPE rights360_http_requests_total counter",
+    ]
+    for (method, route, status), count in sorted(statuses.items()):
+        lines.append(f"rights360_http_requests_total{{{_labels(worker=worker, method=method, route=route, status=status)}}} {count}")
+
+    lines += [
+        "# HELP rights360_http_requests_in_flight Requests currently being served by router group",
+        "# TYPE rights360_http_requests_in_flight gauge",
+    ]
+    for group, count in sorted(in_flight.items()):
+        lines.append(f"rights360_http_requests_in_flight{{{_labels(worker=worker, group=group)}}} {count}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,215 @@
+"""
+Adaptive load shedding and request deadlines
+
+LoadSheddingMiddleware classifies every /api request by RULES into a
+priority, a deadline and a latency target, and admits it against an
+adaptive concurrency limit (AIMD):
+
+- the limit grows by 1/limit for every request that finishes within its
+  latency target while the limit is actually in use, and shrinks by
+  BACKOFF (at most once per target window) when one is slow or runs out
+  of time
+- CRITICAL requests (quiz submits, auth, progress writes) are always
+  admitted; NORMAL ones while in-flight < limit; LOW ones (listings,
+  stats, admin analytics) only while in-flight < limit * LOW_PRIORITY_SHARE
+
+Shed requests get an immediate 503 with Retry-After, before they reach
+the threadpool or the database.
+
+The deadline is stored in a ContextVar that follows the request into the
+threadpool. Statements started after it has passed are refused, and a
+SQLite progress handler interrupts one that runs past it; both surface as
+DeadlineExceeded, which main.py turns into a 504.
+"""
+
+import fnmatch
+import os
+import re
+import sqlite3
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+CRITICAL, NORMAL, LOW = "critical", "normal", "low"
+
+# method ("*" = any), path pattern, priority, deadline in seconds (None = none),
+# latency target in ms (None = not used to adapt the limit). First match wins.
+RULES = [
+    ("POST", "/api/quiz/submit", CRITICAL, 10.0, 500),
+    ("POST", "/api/legal/topics/*/progress", CRITICAL, 10.0, 500),
+    ("POST", "/api/legal/progress/batch", CRITICAL, 10.0, 500),
+    ("POST", "/api/exams/*/finish", CRITICAL, 10.0, 500),
+    ("*", "/api/auth/*", CRITICAL, 10.0, None),  # bcrypt dominates, not load
+    ("*", "/api/ai/*", NORMAL, None, None),  # has its own rate limit and bulkhead
+    ("GET", "/api/admin/content/export", LOW, None, None),  # long streaming download
+    ("GET", "/api/admin/*", LOW, 2.0, 1000),
+    # Imports commit chunk by chunk: cutting one off would leave it half applied
+    ("POST", "/api/admin/content/import", NORMAL, None, None),
+    ("POST", "/api/admin/batch", NORMAL, None, None),
+    ("*", "/api/admin/*", NORMAL, 30.0, None),
+    ("GET", "/api/legal/topics", LOW, 2.0, 250),
+    ("GET", "/api/legal/categories", LOW, 2.0, 250),
+    ("GET", "/api/legal/facets", LOW, 2.0, 250),
+    ("GET", "/api/legal/suggest", LOW, 1.0, 50),  # typeahead: stale suggestions are useless
+    ("GET", "/api/legal/topics/*/related", LOW, 2.0, 250),
+    ("GET", "/api/legal/user/progress", LOW, 2.0, 250),
+    ("GET", "/api/quiz/results", LOW, 2.0, 250),
+    ("GET", "/api/quiz/*/stats", LOW, 2.0, 250),
+    ("GET", "/api/me/recommendations", LOW, 2.0, 250),
+    ("GET", "/api/sync", LOW, 5.0, 500),  # polling clients can come back later
+]
+DEFAULT_RULE = (NORMAL, 5.0, 500)
+
+LOW_PRIORITY_SHARE = 0.5
+BACKOFF = 0.9
+PROGRESS_HANDLER_STEPS = 10000  # SQLite VM instructions between deadline checks
+
+_SHED_BODY = b'{"detail":"Server is busy, please retry shortly"}'
+_SHED_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_SHED_BODY)).encode()),
+    (b"retry-after", b"1"),
+]
+
+
+class DeadlineExceeded(Exception):
+    """The current request ran out of time before or during a query"""
+
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def _expired() -> bool:
+    deadline = _deadline.get()
+    return deadline is not None and time.monotonic() > deadline
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _refuse_late_statements(conn, cursor, statement, parameters, context, executemany):
+    if _expired():
+        raise DeadlineExceeded("Request deadline exceeded before query")
+
+
+@event.listens_for(Pool, "connect")
+def _install_progress_handler(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        # A non-zero return aborts the running statement with "interrupted"
+        dbapi_connection.set_progress_handler(_expired, PROGRESS_HANDLER_STEPS)
+
+
+@event.listens_for(Engine, "handle_error")
+def _interrupted_by_deadline(context):
+    if isinstance(context.original_exception, sqlite3.OperationalError) and _expired():
+        return DeadlineExceeded("Request deadline exceeded during query")
+
+
+class AIMDLimit:
+    """Additive-increase / multiplicative-decrease concurrency limit"""
+
+    def __init__(self, initial: float = 32, minimum: float = 4, maximum: float = 512):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self.shed: Dict[str, int] = {CRITICAL: 0, NORMAL: 0, LOW: 0}
+        self._next_decrease = 0.0
+
+    def admit(self, priority: str) -> bool:
+        if priority == CRITICAL:
+            allowed = True
+        elif priority == LOW:
+            allowed = self.in_flight < self.limit * LOW_PRIORITY_SHARE
+        else:
+            allowed = self.in_flight < self.limit
+        if allowed:
+            self.in_flight += 1
+        else:
+            self.shed[priority] += 1
+        return allowed
+
+    def release(self, seconds: float, target: Optional[float], overloaded: bool):
+        """Finish a request; `target` is its latency target in seconds (None = no feedback)"""
+        in_use = self.in_flight * 2 >= self.limit
+        self.in_flight -= 1
+        if target is None:
+            return
+        if overloaded or seconds > target:
+            now = time.monotonic()
+            if now >= self._next_decrease:
+                self.limit = max(self.minimum, self.limit * BACKOFF)
+                self._next_decrease = now + target
+        elif in_use:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+
+limiter = AIMDLimit()
+
+
+def _compile(rules) -> List[Tuple[str, "re.Pattern", str, Optional[float], Optional[float]]]:
+    return [
+        (method, re.compile(fnmatch.translate(pattern)), priority, deadline,
+         None if target_ms is None else target_ms / 1000.0)
+        for method, pattern, priority, deadline, target_ms in rules
+    ]
+
+
+class LoadSheddingMiddleware:
+    """Admits /api requests against an adaptive limit and sets their deadline"""
+
+    def __init__(self, app, rules=RULES, limit: Optional[AIMDLimit] = None):
+        self.app = app
+        self.rules = _compile(rules)
+        self.limit = limit or limiter
+
+    def classify(self, method: str, path: str):
+        for rule_method, pattern, priority, deadline, target in self.rules:
+            if (rule_method == "*" or rule_method == method) and pattern.match(path):
+                return priority, deadline, target
+        priority, deadline, target_ms = DEFAULT_RULE
+        return priority, deadline, target_ms / 1000.0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        priority, deadline, target = self.classify(scope["method"], scope["path"])
+        if not self.limit.admit(priority):
+            await send({"type": "http.response.start", "status": 503, "headers": _SHED_HEADERS})
+            await send({"type": "http.response.body", "body": _SHED_BODY})
+            return
+
+        status = 500
+        started = time.monotonic()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = _deadline.set(started + deadline if deadline is not None else None)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _deadline.reset(token)
+            self.limit.release(time.monotonic() - started, target, status in (503, 504))
+
+
+def render() -> str:
+    """The shared limiter's state in the Prometheus text format"""
+    worker = os.getpid()
+    lines = [
+        "# HELP rights360_concurrency_limit Adaptive concurrency limit",
+        "# TYPE rights360_concurrency_limit gauge",
+        f'rights360_concurrency_limit{{worker="{worker}"}} {limiter.limit:.3f}',
+        "# HELP rights360_requests_shed_total Requests rejected with 503 by priority",
+        "# TYPE rights360_requests_shed_total counter",
+    ]
+    lines += [f'rights360_requests_shed_total{{worker="{worker}",priority="{priority}"}} {count}'
+              for priority, count in limiter.shed.items()]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,196 @@
+"""
+Opt-in sampling profiler for requests
+
+Enabled with RIGHTS360_PROFILE=1; when it is off the middleware is not even
+installed, so there is no overhead. When on:
+
+- a background thread samples the stacks of the worker's busy threads every
+  RIGHTS360_PROFILE_INTERVAL_MS while requests are in flight
+- 1 in RIGHTS360_PROFILE_SAMPLE_RATE requests is kept (0 keeps none), as is
+  every request slower than RIGHTS360_PROFILE_SLOW_MS
+- kept profiles go into a ring buffer of RIGHTS360_PROFILE_BUFFER entries
+
+Stacks are stored in collapsed format ("outer;inner;leaf count"), which
+flamegraph.pl and speedscope read directly. Samples cover every busy thread
+of the worker during the request, so under concurrency a profile can include
+work done for other requests.
+"""
+
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional, Set
+
+PROFILE_ENV = "RIGHTS360_PROFILE"
+
+# Innermost frames that mean "waiting for work", not "doing work"
+_IDLE_MODULES = ("selectors.py", "threading.py", "queue.py", os.path.join("concurrent", "futures", "thread.py"))
+MAX_DEPTH = 128
+
+
+def enabled() -> bool:
+    return os.getenv(PROFILE_ENV, "").lower() in ("1", "true", "yes")
+
+
+def _setting(name: str, default: float) -> float:
+    return float(os.getenv(f"RIGHTS360_PROFILE_{name}", default))
+
+
+class Profile:
+    __slots__ = ("id", "method", "path", "route", "status", "started_at", "duration_ms", "reason", "samples", "stacks")
+
+    def __init__(self, profile_id: int, method: str, path: str):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.status = 500
+        self.started_at = datetime.now(timezone.utc)
+        self.duration_ms = 0.0
+        self.reason = ""
+        self.samples = 0
+        self.stacks: Counter = Counter()
+
+    def summary(self) -> Dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 3),
+            "reason": self.reason,
+            "samples": self.samples,
+        }
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _collapse(frame) -> Optional[str]:
+    if frame.f_code.co_filename.endswith(_IDLE_MODULES):
+        return None
+    labels: List[str] = []
+    while frame is not None and len(labels) < MAX_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class Sampler:
+    """Samples thread stacks into every profile currently being watched"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._watched: Set[Profile] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, profile: Profile):
+        with self._lock:
+            self._watched.add(profile)
+            if self._thread is None or not self._thread.is_alive():
+                # Started lazily so every forked worker gets its own thread
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def unwatch(self, profile: Profile):
+        with self._lock:
+            self._watched.discard(profile)
+
+    def _run(self):
+        own = threading.get_ident()
+        while True:
+            with self._lock:
+                watched = list(self._watched)
+                if not watched:
+                    self._wake.clear()
+            if not watched:
+                self._wake.wait()
+                continue
+            stacks = []
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    stack = _collapse(frame)
+                    if stack is not None:
+                        stacks.append(stack)
+            for profile in watched:
+                profile.samples += 1
+                profile.stacks.update(stacks)
+            time.sleep(self.interval)
+
+
+class ProfileStore:
+    """Ring buffer of the most recent kept profiles"""
+
+    def __init__(self, size: int):
+        self._profiles: Deque[Profile] = deque(maxlen=size)
+
+    def add(self, profile: Profile):
+        self._profiles.append(profile)
+
+    def list(self) -> List[Profile]:
+        return list(reversed(self._profiles))
+
+    def get(self, profile_id: int) -> Optional[Profile]:
+        for profile in list(self._profiles):
+            if profile.id == profile_id:
+                return profile
+        return None
+
+    def clear(self):
+        self._profiles.clear()
+
+
+store = ProfileStore(int(_setting("BUFFER", 50)))
+
+
+class ProfilerMiddleware:
+    """Profiles sampled and slow HTTP requests into `store`"""
+
+    def __init__(self, app, sample_rate: Optional[int] = None, slow_ms: Optional[float] = None,
+                 interval_ms: Optional[float] = None):
+        self.app = app
+        self.sample_rate = int(_setting("SAMPLE_RATE", 100) if sample_rate is None else sample_rate)
+        self.slow_ms = _setting("SLOW_MS", 500) if slow_ms is None else slow_ms
+        self.sampler = Sampler((_setting("INTERVAL_MS", 5) if interval_ms is None else interval_ms) / 1000)
+        self._ids = itertools.count(1)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(next(self._ids), scope["method"], scope["path"])
+        sampled = self.sample_rate > 0 and profile.id % self.sample_rate == 0
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+            await send(message)
+
+        self.sampler.watch(profile)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.sampler.unwatch(profile)
+            profile.duration_ms = (time.perf_counter() - started) * 1000
+            slow = profile.duration_ms >= self.slow_ms
+            if sampled or slow:
+                route = scope.get("route")
+                profile.route = getattr(route, "path_format", None) or getattr(route, "path", None)
+                profile.reason = "slow" if slow else "sampled"
+                store.add(profile)
@@ -0,0 +1,339 @@
+"""
+Topic progress writes: merge rules, bulk upsert and a per-user write buffer
+
+Clients report progress many times while a user scrolls through a topic,
+sometimes out of order and from several devices. Every update carries the
+client's timestamp (clamped to the server clock, so a fast clock cannot win
+forever) and updates of the same user and topic are merged with:
+
+- progress_percentage only grows: the highest value wins
+- completed and last_accessed: last writer (latest timestamp) wins
+
+The same rules apply in SQL against the stored row, so merging is order
+independent: buffers in different workers and a batch from a device that
+was offline can be written in any order.
+
+Single updates (POST /topics/{id}/progress) go to `buffer`, which coalesces
+a user's repeated updates in memory and writes everything pending in one
+upsert every FLUSH_INTERVAL seconds, when MAX_PENDING entries pile up, and
+at shutdown. A crash loses at most one interval of progress. When the bulk
+upsert fails, the entries are written one by one so a single bad row cannot
+hold back everyone else's; a row is put back for the next flush until it
+has failed MAX_ATTEMPTS times, then dropped and logged. The endpoint answers
+with the update merged with the stored row and the buffer, so single
+updates are monotonic like the rest: reporting 40% after 80% returns 80%.
+Batches (POST /progress/batch) are merged with the user's buffered entries
+and written straight away. Opening a topic (`visit`) writes the user's buffered entries
+too, then creates the row or only moves last_accessed, so it never undoes
+a completion.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import case, func, inspect, or_, select, update
+from sqlalchemy.orm import Session
+
+from database import insert_for
+from models.user_model import UserProgress
+from services import lifecycle
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 1.0  # seconds between background writes
+MAX_PENDING = 10000  # buffered entries that trigger an early write
+MAX_ATTEMPTS = 3  # failed flushes after which a buffered row is dropped
+UNIQUE_INDEX = "uq_user_progress_user_topic"
+
+
+@dataclass(frozen=True)
+class Entry:
+    progress_percentage: int
+    completed: bool
+    last_accessed: datetime  # UTC
+
+
+def entry(progress_percentage: int, completed: bool, client_timestamp: Optional[datetime] = None) -> Entry:
+    """An update as reported by a client, with its timestamp normalized"""
+    now = datetime.now(timezone.utc)
+    if client_timestamp is None:
+        timestamp = now
+    else:
+        if client_timestamp.tzinfo is None:
+            client_timestamp = client_timestamp.replace(tzinfo=timezone.utc)
+        timestamp = min(client_timestamp.astimezone(timezone.utc), now)
+    return Entry(min(max(progress_percentage, 0), 100), completed, timestamp)
+
+
+def stored(row: UserProgress) -> Entry:
+    """A stored row as an entry (SQLite returns naive UTC timestamps)"""
+    last_accessed = row.last_accessed or datetime.now(timezone.utc)
+    if last_accessed.tzinfo is None:
+        last_accessed = last_accessed.replace(tzinfo=timezone.utc)
+    return Entry(row.progress_percentage or 0, bool(row.completed), last_accessed)
+
+
+def merge(current: Optional[Entry], new: Entry) -> Entry:
+    if current is None:
+        return new
+    latest = new if new.last_accessed >= current.last_accessed else current
+    return Entry(max(current.progress_percentage, new.progress_percentage), latest.completed, latest.last_accessed)
+
+
+def merge_all(updates: Iterable[Tuple[int, Entry]], into: Optional[Dict[int, Entry]] = None) -> Dict[int, Entry]:
+    """Merge (topic id, entry) pairs per topic"""
+    merged = into if into is not None else {}
+    for topic_id, update_entry in updates:
+        merged[topic_id] = merge(merged.get(topic_id), update_entry)
+    return merged
+
+
+def write(db: Session, entries: Dict[Tuple[int, int], Entry]):
+    """Upsert {(user id, topic id): entry} in one statement (caller commits)"""
+    if not entries:
+        return
+    table = UserProgress.__table__
+    stmt = insert_for(db)(table)
+    excluded = stmt.excluded
+    newer = excluded.last_accessed >= func.coalesce(table.c.last_accessed, excluded.last_accessed)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.topic_id],
+        set_={
+            "progress_percentage": case(
+                (excluded.progress_percentage > func.coalesce(table.c.progress_percentage, 0),
+                 excluded.progress_percentage),
+                else_=table.c.progress_percentage,
+            ),
+            "completed": case((newer, excluded.completed), else_=table.c.completed),
+            "last_accessed": case((newer, excluded.last_accessed), else_=table.c.last_accessed),
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt, [
+        {"user_id": user_id, "topic_id": topic_id, "progress_percentage": value.progress_percentage,
+         "completed": value.completed, "last_accessed": value.last_accessed}
+        for (user_id, topic_id), value in sorted(entries.items())
+    ])
+
+
+class ProgressBuffer:
+    """Pending progress per user, merged in memory and written in bulk"""
+
+    def __init__(self, interval: float = FLUSH_INTERVAL, max_pending: int = MAX_PENDING,
+                 max_attempts: int = MAX_ATTEMPTS):
+        self.interval = interval
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self._pending: Dict[int, Dict[int, Entry]] = {}
+        self._failures: Dict[Tuple[int, int], int] = {}  # failed flushes per (user id, topic id)
+        self._size = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, user_id: int, updates: Dict[int, Entry]) -> Dict[int, Entry]:
+        """Buffer a user's {topic id: entry}; returns the merged pending entries of those topics"""
+        with self._lock:
+            pending = self._pending.setdefault(user_id, {})
+            before = len(pending)
+            for topic_id, update_entry in updates.items():
+                pending[topic_id] = merge(pending.get(topic_id), update_entry)
+            self._size += len(pending) - before
+            if self._thread is None or not self._thread.is_alive():
+                # Started lazily so every forked worker gets its own thread
+                self._thread = threading.Thread(target=self._run, name="progress-writer", daemon=True)
+                self._thread.start()
+            if self._size >= self.max_pending:
+                self._wake.set()
+            return {topic_id: pending[topic_id] for topic_id in updates}
+
+    def pending(self, user_id: int) -> Dict[int, Entry]:
+        with self._lock:
+            return dict(self._pending.get(user_id, {}))
+
+    def take(self, user_id: Optional[int] = None) -> Dict[Tuple[int, int], Entry]:
+        """Remove and return pending entries (of one user, or everyone's)"""
+        with self._lock:
+            if user_id is None:
+                users, self._pending = self._pending, {}
+            else:
+                users = {user_id: self._pending.pop(user_id)} if user_id in self._pending else {}
+            taken = {(uid, topic_id): value for uid, topics in users.items() for topic_id, value in topics.items()}
+            self._size -= len(taken)
+            return taken
+
+    def restore(self, entries: Dict[Tuple[int, int], Entry]):
+        """Put back entries whose write failed; newer updates merge with them"""
+        by_user: Dict[int, Dict[int, Entry]] = {}
+        for (user_id, topic_id), value in entries.items():
+            by_user.setdefault(user_id, {})[topic_id] = value
+        for user_id, updates in by_user.items():
+            self.add(user_id, updates)
+
+    def flush(self) -> int:
+        """Write everything pending now; returns the number of rows written"""
+        entries = self.take()
+        if not entries:
+            return 0
+        failed: Dict[Tuple[int, int], Entry] = {}
+        try:
+            _write_committed(entries)
+        except Exception:
+            logger.warning("Writing %d buffered progress rows failed; writing them one by one",
+                           len(entries), exc_info=True)
+            for key, value in sorted(entries.items()):
+                try:
+                    _write_committed({key: value})
+                except Exception:
+                    failed[key] = value
+        self._retry(entries, failed)
+        return len(entries) - len(failed)
+
+    def _retry(self, entries: Dict[Tuple[int, int], Entry], failed: Dict[Tuple[int, int], Entry]):
+        """Count the failures of a flush; restore rows still under max_attempts, drop the rest"""
+        retry = {}
+        with self._lock:
+            for key in entries.keys() - failed.keys():
+                self._failures.pop(key, None)
+            for key, value in failed.items():
+                attempts = self._failures.pop(key, 0) + 1
+                if attempts < self.max_attempts:
+                    self._failures[key] = attempts
+                    retry[key] = value
+                else:
+                    logger.error("Dropping buffered progress of user %d on topic %d after %d failed writes: %r",
+                                 key[0], key[1], attempts, value)
+        if failed:
+            logger.warning("%d buffered progress rows failed to write, %d kept for the next flush",
+                           len(failed), len(retry))
+        self.restore(retry)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Writing buffered progress failed; retrying in %.1fs", self.interval)
+
+
+def _write_committed(entries: Dict[Tuple[int, int], Entry]):
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        write(db, entries)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+buffer = ProgressBuffer()
+
+
+def apply(db: Session, user_id: int, updates: Dict[int, Entry]):
+    """Write a user's updates, with whatever they have buffered, in one upsert"""
+    entries = buffer.take(user_id)
+    for topic_id, update_entry in updates.items():
+        entries[(user_id, topic_id)] = merge(entries.get((user_id, topic_id)), update_entry)
+    try:
+        write(db, entries)
+        db.commit()
+    except Exception:
+        db.rollback()
+        buffer.restore(entries)
+        raise
+
+
+def visit(db: Session, user_id: int, topic_id: int):
+    """Record that a user opened a topic (committed): a new row at 0%, or a newer last_accessed"""
+    entries = buffer.take(user_id)
+    table = UserProgress.__table__
+    stmt = insert_for(db)(table).values(
+        user_id=user_id, topic_id=topic_id, progress_percentage=0, completed=False,
+        last_accessed=datetime.now(timezone.utc),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.topic_id],
+        set_={"last_accessed": stmt.excluded.last_accessed, "updated_at": func.now()},
+    )
+    try:
+        write(db, entries)
+        db.execute(stmt)
+        db.commit()
+    except Exception:
+        db.rollback()
+        buffer.restore(entries)
+        raise
+
+
+def completed_topics(db: Session, user_id: int) -> Set[int]:
+    """Ids of the topics a user has completed, counting their buffered updates"""
+    pending = buffer.pending(user_id)
+    rows = db.scalars(select(UserProgress).where(
+        UserProgress.user_id == user_id,
+        or_(UserProgress.completed == True, UserProgress.topic_id.in_(list(pending))),
+    ))
+    completed = set()
+    for row in rows:
+        value = stored(row)
+        if row.topic_id in pending:
+            value = merge(value, pending.pop(row.topic_id))
+        if value.completed:
+            completed.add(row.topic_id)
+    completed.update(topic_id for topic_id, value in pending.items() if value.completed)
+    return completed
+
+
+def _flush_buffer():
+    try:
+        written = buffer.flush()
+    except Exception:
+        logger.exception("Could not write buffered progress at shutdown")
+        return
+    if written:
+        logger.info("Wrote %d buffered progress rows", written)
+
+
+@lifecycle.on_preload
+def ensure_unique_index():
+    """Merge duplicate (user, topic) rows left by the old get-or-create so the upsert index can be built"""
+    from database import SessionLocal, engine
+
+    if any(index["name"] == UNIQUE_INDEX for index in inspect(engine).get_indexes(UserProgress.__tablename__)):
+        return
+    db = SessionLocal()
+    try:
+        duplicates = db.execute(
+            select(UserProgress.user_id, UserProgress.topic_id, func.max(UserProgress.id).label("keep"),
+                   func.max(UserProgress.progress_percentage).label("progress_percentage"),
+                   func.max(case((UserProgress.completed == True, 1), else_=0)).label("completed"),
+                   func.max(UserProgress.last_accessed).label("last_accessed"))
+            .group_by(UserProgress.user_id, UserProgress.topic_id)
+            .having(func.count() > 1)
+        ).all()
+        for row in duplicates:
+            db.execute(update(UserProgress).where(UserProgress.id == row.keep).values(
+                progress_percentage=row.progress_percentage, completed=bool(row.completed),
+                last_accessed=row.last_accessed))
+            db.query(UserProgress).filter(
+                UserProgress.user_id == row.user_id, UserProgress.topic_id == row.topic_id,
+                UserProgress.id != row.keep,
+            ).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+    next(index for index in UserProgress.__table__.indexes if index.name == UNIQUE_INDEX).create(
+        bind=engine, checkfirst=True)
+    if duplicates:
+        logger.info("Merged duplicate progress rows of %d user/topic pairs", len(duplicates))
+
+
+lifecycle.on_shutdown(_flush_buffer)
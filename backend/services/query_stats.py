@@ -0,0 +1,174 @@
+"""
+Per-request SQL accounting
+
+Engine events count the statements, DB time and rows of whatever is being
+tracked in the current context (a request via QueryStatsMiddleware, or a
+`track()` block). Rows are counted with a row factory on tracked SQLite
+cursors and from cursor.rowcount elsewhere.
+
+Every request repeating the same statement N_PLUS_ONE_THRESHOLD times or
+more (typically a lazy-loaded relationship in a loop) is logged as a
+possible N+1. With RIGHTS360_DEBUG=1 each response also carries
+X-DB-Queries, X-DB-Time-ms and X-DB-Rows headers and a log line per request.
+
+`query_budget()` and `assert_query_budget()` turn the numbers into
+assertions; bench/query_budgets.py checks every endpoint against its budget.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+DEBUG_ENV = "RIGHTS360_DEBUG"
+N_PLUS_ONE_THRESHOLD = 5
+
+HEADER_QUERIES = "x-db-queries"
+HEADER_TIME = "x-db-time-ms"
+HEADER_ROWS = "x-db-rows"
+
+
+class QueryStats:
+    __slots__ = ("queries", "db_time", "rows", "statements")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.statements: Counter = Counter()
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD):
+        """Statements executed at least `threshold` times, most frequent first"""
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+    def summary(self) -> str:
+        return f"queries={self.queries} db_ms={self.db_time * 1000:.2f} rows={self.rows}"
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def debug_enabled() -> bool:
+    return os.getenv(DEBUG_ENV, "").lower() in ("1", "true", "yes")
+
+
+def _count_row(cursor, row):
+    stats = _current.get()
+    if stats is not None:
+        stats.rows += 1
+    return row
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is None:
+        return
+    if isinstance(cursor, sqlite3.Cursor):
+        cursor.row_factory = _count_row
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    started = conn.info.get("query_started")
+    if started:
+        stats.db_time += time.perf_counter() - started.pop()
+    stats.queries += 1
+    stats.statements[statement] += 1
+    if not isinstance(cursor, sqlite3.Cursor) and cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+
+
+@contextmanager
+def track() -> Iterator[QueryStats]:
+    """Account the statements run inside the block (in this context)"""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def _check(label: str, queries: int, max_queries: int, rows: int = 0, max_rows: Optional[int] = None, detail=""):
+    if queries > max_queries:
+        raise QueryBudgetExceeded(f"{label}: {queries} queries, budget is {max_queries}{detail}")
+    if max_rows is not None and rows > max_rows:
+        raise QueryBudgetExceeded(f"{label}: {rows} rows, budget is {max_rows}{detail}")
+
+
+@contextmanager
+def query_budget(max_queries: int, max_rows: Optional[int] = None, label: str = "block") -> Iterator[QueryStats]:
+    """Fail if the block runs more than `max_queries` statements (or reads more than `max_rows` rows)"""
+    with track() as stats:
+        yield stats
+    detail = "".join(f"\n  {count}x {sql[:200]}" for sql, count in stats.statements.most_common(5))
+    _check(label, stats.queries, max_queries, stats.rows, max_rows, detail)
+
+
+def assert_query_budget(response, max_queries: int, max_rows: Optional[int] = None):
+    """Check a test-client response against a budget (needs RIGHTS360_DEBUG=1)"""
+    if HEADER_QUERIES not in response.headers:
+        raise RuntimeError(f"Response has no {HEADER_QUERIES} header; set {DEBUG_ENV}=1")
+    request = response.request
+    _check(
+        f"{request.method} {request.url.path}",
+        int(response.headers[HEADER_QUERIES]), max_queries,
+        int(response.headers[HEADER_ROWS]), max_rows,
+    )
+
+
+class QueryStatsMiddleware:
+    """Tracks SQL per HTTP request; logs N+1 patterns and, in debug mode, adds headers"""
+
+    def __init__(self, app, debug: Optional[bool] = None):
+        self.app = app
+        self.debug = debug_enabled() if debug is None else debug
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_wrapper(message):
+            # The endpoint has finished its queries by the time headers go out
+            if self.debug and message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (HEADER_QUERIES.encode(), str(stats.queries).encode()),
+                    (HEADER_TIME.encode(), f"{stats.db_time * 1000:.2f}".encode()),
+                    (HEADER_ROWS.encode(), str(stats.rows).encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            target = f"{scope['method']} {scope['path']}"
+            for sql, count in stats.repeated():
+                logger.warning("Possible N+1 in %s: statement ran %d times: %s", target, count, " ".join(sql.split())[:300])
+            if self.debug:
+                logger.info("%s %s", target, stats.summary())
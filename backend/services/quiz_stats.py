@@ -0,0 +1,348 @@
+"""
+Per-quiz and per-topic difficulty analytics
+
+Statistics are kept as fixed-size counters and histograms so each submit is
+an O(1) update; the median answer time is read back from the time histogram.
+`rebuild_quiz_stats` recomputes everything from QuizResult with NumPy.
+
+Submits only count. The observed difficulty, which quiz lists filter on, is
+re-derived by `relabel_quizzes`, a batch job run with
+`python -m services.quiz_stats [--watch SECONDS]`, once a quiz has had
+MIN_NEW_ATTEMPTS more attempts. A label only moves once the correct rate is
+RELABEL_MARGIN past a cutoff, so a quiz whose rate sits on a cutoff does not
+flip (and reload every catalog) back and forth. The job joins the
+invalidation bus (same CACHE_URL, or serve.py's RIGHTS360_BUS_DIR) so the
+server's workers pick up new labels as soon as they commit.
+"""
+
+import argparse
+import json
+import logging
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from database import insert_for
+from models.quiz_model import QuizStats, TopicStats
+from models.topic_model import Quiz, QuizResult
+from services import content_events
+from services.content_events import ContentEvent
+
+logger = logging.getLogger(__name__)
+
+# Upper edges (seconds) of the answer-time buckets; one overflow bucket follows
+TIME_BUCKETS = [5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300]
+N_TIME_BUCKETS = len(TIME_BUCKETS) + 1
+
+# A quiz needs this many attempts before its observed difficulty is trusted
+MIN_ATTEMPTS_FOR_TUNING = 20
+EASY_CORRECT_RATE = 0.8
+MEDIUM_CORRECT_RATE = 0.5
+# Correct rates each label covers, [low, high)
+DIFFICULTY_RANGES = {
+    "easy": (EASY_CORRECT_RATE, float("inf")),
+    "medium": (MEDIUM_CORRECT_RATE, EASY_CORRECT_RATE),
+    "hard": (float("-inf"), MEDIUM_CORRECT_RATE),
+}
+# A label changes only once the rate is this far outside its range...
+RELABEL_MARGIN = 0.05
+# ...and is reconsidered only after this many attempts since it was derived
+MIN_NEW_ATTEMPTS = 20
+
+
+def time_bucket(seconds: int) -> int:
+    return bisect_left(TIME_BUCKETS, max(seconds, 0))
+
+
+def median_from_histogram(histogram: List[int]) -> Optional[float]:
+    """Approximate the median by interpolating inside the middle bucket"""
+    total = sum(histogram)
+    if not total:
+        return None
+    half = total / 2
+    seen = 0
+    for index, count in enumerate(histogram):
+        if count and seen + count >= half:
+            low = TIME_BUCKETS[index - 1] if index else 0
+            if index >= len(TIME_BUCKETS):
+                return float(low)
+            high = TIME_BUCKETS[index]
+            return low + (high - low) * (half - seen) / count
+        seen += count
+    return None
+
+
+def classify_difficulty(attempts: int, correct_count: int) -> Optional[str]:
+    """Derive easy/medium/hard from the correct rate, if there is enough data"""
+    if attempts < MIN_ATTEMPTS_FOR_TUNING:
+        return None
+    rate = correct_count / attempts
+    if rate >= EASY_CORRECT_RATE:
+        return "easy"
+    if rate >= MEDIUM_CORRECT_RATE:
+        return "medium"
+    return "hard"
+
+
+def relabel(current: Optional[str], attempts: int, correct_count: int) -> Optional[str]:
+    """The observed difficulty for new counts, keeping `current` while the rate is within the margin"""
+    observed = classify_difficulty(attempts, correct_count)
+    if current not in DIFFICULTY_RANGES or observed is None or observed == current:
+        return observed
+    low, high = DIFFICULTY_RANGES[current]
+    if low - RELABEL_MARGIN <= correct_count / attempts < high + RELABEL_MARGIN:
+        return current
+    return observed
+
+
+def _bump(histogram_json: Optional[str], index: int, size: int) -> str:
+    histogram = json.loads(histogram_json) if histogram_json else []
+    if len(histogram) < size:
+        histogram.extend([0] * (size - len(histogram)))
+    histogram[index] += 1
+    return json.dumps(histogram)
+
+
+def _increment(db: Session, model, key: dict, is_correct: bool):
+    """Count one attempt with an atomic upsert; returns the row as updated
+
+    The upsert also write-locks the row until commit, so the histograms read
+    back here cannot change under the caller before it writes them.
+    """
+    table = model.__table__
+    stmt = insert_for(db)(table).values(**key, attempts=1, correct_count=int(is_correct))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c[next(iter(key))]],
+        set_={
+            "attempts": table.c.attempts + 1,
+            "correct_count": table.c.correct_count + int(is_correct),
+            "updated_at": func.now(),
+        },
+    )
+    return db.execute(stmt.returning(*table.c)).one()
+
+
+def record_attempt(db: Session, quiz, selected_answer: int, is_correct: bool,
+                   time_taken: Optional[int], option_count: int):
+    """Fold one submitted answer into the quiz and topic statistics (caller commits).
+
+    `quiz` is a Quiz or a catalog QuizRecord; only its id and topic_id are used.
+    """
+    stats = _increment(db, QuizStats, {"quiz_id": quiz.id, "topic_id": quiz.topic_id}, is_correct)
+    topic_stats = _increment(db, TopicStats, {"topic_id": quiz.topic_id}, is_correct)
+
+    if time_taken is not None:
+        db.execute(update(TopicStats).where(TopicStats.topic_id == quiz.topic_id).values(
+            time_histogram=_bump(topic_stats.time_histogram, time_bucket(time_taken), N_TIME_BUCKETS)))
+    db.execute(update(QuizStats).where(QuizStats.quiz_id == quiz.id).values(
+        answer_histogram=_bump(stats.answer_histogram, selected_answer, option_count),
+        **({"time_histogram": _bump(stats.time_histogram, time_bucket(time_taken), N_TIME_BUCKETS)}
+           if time_taken is not None else {}),
+    ))
+
+
+def _add_to_topic(db: Session, topic_id: int, attempts: int, correct_count: int, time_histogram: List[int]):
+    """Add (or, with negative counts, subtract) a quiz's counts to a topic's statistics"""
+    table = TopicStats.__table__
+    stmt = insert_for(db)(table).values(topic_id=topic_id, attempts=attempts, correct_count=correct_count)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.topic_id],
+        set_={
+            "attempts": table.c.attempts + attempts,
+            "correct_count": table.c.correct_count + correct_count,
+            "updated_at": func.now(),
+        },
+    )
+    stored = json.loads(db.execute(stmt.returning(table.c.time_histogram)).scalar_one() or "[]")
+    stored.extend([0] * (len(time_histogram) - len(stored)))
+    for index, count in enumerate(time_histogram):
+        stored[index] += count
+    db.execute(update(TopicStats).where(TopicStats.topic_id == topic_id).values(time_histogram=json.dumps(stored)))
+
+
+def move_quiz_stats(db: Session, quiz_id: int, topic_id: Optional[int]):
+    """Move a quiz's counts into another topic's statistics, or drop them (None) (caller commits)"""
+    stats = db.execute(
+        select(QuizStats.topic_id, QuizStats.attempts, QuizStats.correct_count, QuizStats.time_histogram)
+        .where(QuizStats.quiz_id == quiz_id)
+    ).first()
+    if stats is None or stats.topic_id == topic_id:
+        return
+    time_histogram = json.loads(stats.time_histogram or "[]")
+    _add_to_topic(db, stats.topic_id, -stats.attempts, -stats.correct_count, [-count for count in time_histogram])
+    if topic_id is None:
+        db.execute(delete(QuizStats).where(QuizStats.quiz_id == quiz_id))
+    else:
+        _add_to_topic(db, topic_id, stats.attempts, stats.correct_count, time_histogram)
+        db.execute(update(QuizStats).where(QuizStats.quiz_id == quiz_id).values(topic_id=topic_id))
+
+
+def _record_relabelled(db: Session, changed: Dict[int, int]):
+    """One content event per quiz ({quiz id: topic id}) whose shown difficulty changed"""
+    for quiz_id, topic_id in sorted(changed.items()):
+        content_events.record(db, ContentEvent("quiz", "updated", id=quiz_id, topic_id=topic_id))
+
+
+def relabel_quizzes(db: Session, min_new_attempts: int = MIN_NEW_ATTEMPTS) -> int:
+    """Re-derive the observed difficulty of quizzes with enough new attempts (committed).
+
+    Returns the number of quizzes whose label changed.
+    """
+    rows = db.execute(
+        select(QuizStats.quiz_id, QuizStats.topic_id, QuizStats.attempts, QuizStats.correct_count,
+               QuizStats.observed_difficulty)
+        .where(QuizStats.attempts >= func.coalesce(QuizStats.labelled_attempts, 0) + min_new_attempts)
+    ).all()
+    if not rows:
+        return 0
+    changed = {}
+    updates = []
+    for quiz_id, topic_id, attempts, correct_count, previous in rows:
+        label = relabel(previous, attempts, correct_count)
+        if label != previous:
+            changed[quiz_id] = topic_id
+        updates.append({"quiz_id": quiz_id, "observed_difficulty": label, "labelled_attempts": attempts})
+    db.execute(update(QuizStats), updates)
+    _record_relabelled(db, changed)
+    db.commit()
+    return len(changed)
+
+
+def rebuild_quiz_stats(db: Session) -> int:
+    """Recompute all quiz and topic statistics from QuizResult rows.
+
+    Returns the number of quizzes with statistics.
+    """
+    import numpy as np
+
+    rows = db.execute(
+        select(
+            QuizResult.quiz_id,
+            Quiz.topic_id,
+            QuizResult.selected_answer,
+            QuizResult.is_correct,
+            QuizResult.time_taken,
+        ).join(Quiz, Quiz.id == QuizResult.quiz_id).where(Quiz.deleted_at.is_(None))
+    ).all()
+
+    previous = {
+        quiz_id: (topic_id, label)
+        for quiz_id, topic_id, label in db.execute(
+            select(QuizStats.quiz_id, QuizStats.topic_id, QuizStats.observed_difficulty))
+    }
+    db.execute(delete(QuizStats))
+    db.execute(delete(TopicStats))
+    if not rows:
+        _record_relabelled(db, {quiz_id: topic_id for quiz_id, (topic_id, label) in previous.items() if label})
+        db.commit()
+        return 0
+
+    count = len(rows)
+    quiz_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=count)
+    topic_ids = np.fromiter((r[1] for r in rows), dtype=np.int64, count=count)
+    selected = np.fromiter((r[2] for r in rows), dtype=np.int64, count=count)
+    correct = np.fromiter((bool(r[3]) for r in rows), dtype=np.int64, count=count)
+    times = np.fromiter((-1 if r[4] is None else r[4] for r in rows), dtype=np.int64, count=count)
+
+    has_time = times >= 0
+    buckets = np.searchsorted(np.asarray(TIME_BUCKETS), np.maximum(times, 0), side="left")
+
+    def aggregate(keys):
+        unique, inverse = np.unique(keys, return_inverse=True)
+        n = len(unique)
+        attempts = np.bincount(inverse, minlength=n)
+        correct_counts = np.bincount(inverse, weights=correct, minlength=n).astype(np.int64)
+        time_hist = np.bincount(
+            inverse[has_time] * N_TIME_BUCKETS + buckets[has_time],
+            minlength=n * N_TIME_BUCKETS,
+        ).reshape(n, N_TIME_BUCKETS)
+        return unique, inverse, attempts, correct_counts, time_hist
+
+    quiz_keys, quiz_inverse, attempts, correct_counts, time_hist = aggregate(quiz_ids)
+    width = int(selected.max()) + 1 if selected.max() >= 0 else 1
+    valid = selected >= 0
+    answer_hist = np.bincount(
+        quiz_inverse[valid] * width + selected[valid], minlength=len(quiz_keys) * width
+    ).reshape(len(quiz_keys), width)
+
+    option_counts = {
+        quiz_id: len(json.loads(options or "[]"))
+        for quiz_id, options in db.execute(
+            select(Quiz.id, Quiz.options).where(Quiz.id.in_(quiz_keys.tolist()))
+        )
+    }
+    topic_of_quiz = dict(zip(quiz_ids.tolist(), topic_ids.tolist()))
+
+    quiz_rows, changed = [], {}
+    for i, quiz_id in enumerate(quiz_keys.tolist()):
+        answers = answer_hist[i].tolist()
+        used = max((j + 1 for j, c in enumerate(answers) if c), default=0)
+        size = max(option_counts.get(quiz_id, 0), used)
+        answers = (answers + [0] * size)[:size]
+        timings = time_hist[i].tolist()
+        previous_label = previous.pop(quiz_id, (None, None))[1]
+        label = relabel(previous_label, int(attempts[i]), int(correct_counts[i]))
+        if label != previous_label:
+            changed[quiz_id] = topic_of_quiz[quiz_id]
+        quiz_rows.append({
+            "quiz_id": quiz_id,
+            "topic_id": topic_of_quiz[quiz_id],
+            "attempts": int(attempts[i]),
+            "correct_count": int(correct_counts[i]),
+            "time_histogram": json.dumps(timings) if any(timings) else "[]",
+            "answer_histogram": json.dumps(answers),
+            "observed_difficulty": label,
+            "labelled_attempts": int(attempts[i]),
+        })
+    db.execute(insert(QuizStats), quiz_rows)
+
+    topic_keys, _, topic_attempts, topic_correct, topic_time_hist = aggregate(topic_ids)
+    db.execute(insert(TopicStats), [
+        {
+            "topic_id": topic_id,
+            "attempts": int(topic_attempts[i]),
+            "correct_count": int(topic_correct[i]),
+            "time_histogram": json.dumps(topic_time_hist[i].tolist()),
+        }
+        for i, topic_id in enumerate(topic_keys.tolist())
+    ])
+
+    # Quizzes left without results lose their label too
+    changed.update((quiz_id, topic_id) for quiz_id, (topic_id, label) in previous.items() if label)
+    _record_relabelled(db, changed)
+    db.commit()
+    return len(quiz_rows)
+
+
+if __name__ == "__main__":
+    from database import SessionLocal, create_tables
+    from services.cache import start_bus, stop_bus
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="recompute every statistic from QuizResult first")
+    parser.add_argument("--watch", type=float, metavar="SECONDS",
+                        help="keep running and re-label quizzes at this interval")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    create_tables()
+    start_bus()
+    db = SessionLocal()
+    try:
+        if args.rebuild:
+            count = rebuild_quiz_stats(db)
+            print(f"✅ Rebuilt statistics for {count} quizzes")
+        count = relabel_quizzes(db)
+        print(f"✅ Re-labelled {count} quizzes")
+        while args.watch:
+            time.sleep(args.watch)
+            started = time.perf_counter()
+            count = relabel_quizzes(db)
+            if count:
+                logger.info("Re-labelled %d quizzes in %.3fs", count, time.perf_counter() - started)
+    finally:
+        db.close()
+        stop_bus()
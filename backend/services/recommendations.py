@@ -0,0 +1,237 @@
+"""
+Personalized next-topic recommendations (item-based collaborative filtering)
+
+A batch job turns UserProgress and QuizResult into a sparse user-by-topic
+interaction matrix R (SciPy CSR):
+
+- opening a topic counts OPENED_WEIGHT, plus up to PROGRESS_WEIGHT for the
+  progress percentage; completing it counts COMPLETED_WEIGHT
+- answering its quizzes adds QUIZ_WEIGHT * min(answers, QUIZ_ANSWERS_CAP) / cap
+
+Topic-to-topic cosine similarity S comes from R^T R. A user's scores are
+their row of R S; topics they completed and unpublished topics are masked,
+and the RECOMMENDATIONS_PER_USER best go to the user_recommendations table
+as a JSON list. Users are scored in blocks of USER_BLOCK rows, each one
+sparse-times-dense product plus an argpartition, so memory stays bounded
+whatever the number of users.
+
+The full run rebuilds S and every list (nightly). With --watch, the job
+then keeps S in memory and re-scores only the users who opened, completed
+or answered something since the previous pass.
+
+Run from the backend directory:
+    python -m services.recommendations              # full batch
+    python -m services.recommendations --watch 300  # then refresh active users every 5 min
+"""
+
+import argparse
+import json
+import logging
+import time
+from datetime import timedelta
+from itertools import chain
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.orm import Session
+
+from models.topic_model import LegalTopic, Quiz, QuizResult
+from models.user_model import UserProgress, UserRecommendations
+
+logger = logging.getLogger(__name__)
+
+OPENED_WEIGHT = 0.25
+PROGRESS_WEIGHT = 0.5
+COMPLETED_WEIGHT = 1.0
+QUIZ_WEIGHT = 0.5
+QUIZ_ANSWERS_CAP = 4
+RECOMMENDATIONS_PER_USER = 10
+USER_BLOCK = 20000  # users scored per block: USER_BLOCK x topics float32 scores
+FETCH_ROWS = 200000  # interaction rows fetched at a time
+WRITE_ROWS = 20000  # recommendation rows per INSERT
+ACTIVE_USER_CHUNK = 5000  # users per IN (...) list when re-scoring active users
+
+
+def _load(db: Session, queries) -> np.ndarray:
+    """The (user_id, topic_id, weight) rows of `queries` as one float64 array"""
+    parts = [
+        np.fromiter(chain.from_iterable(rows), dtype=np.float64, count=3 * len(rows)).reshape(-1, 3)
+        for query in queries
+        for rows in db.connection().execute(query.execution_options(yield_per=FETCH_ROWS)).partitions()
+    ]
+    return np.concatenate(parts) if parts else np.zeros((0, 3))
+
+
+def _interaction_queries(user_ids: Optional[Sequence[int]] = None):
+    progress_weight = case(
+        (UserProgress.completed == True, COMPLETED_WEIGHT),
+        else_=OPENED_WEIGHT + PROGRESS_WEIGHT * func.coalesce(UserProgress.progress_percentage, 0) / 100.0,
+    )
+    answered = case((func.count() > QUIZ_ANSWERS_CAP, QUIZ_ANSWERS_CAP), else_=func.count())
+    progress = select(UserProgress.user_id, UserProgress.topic_id, progress_weight)
+    answers = select(QuizResult.user_id, Quiz.topic_id, QUIZ_WEIGHT * answered / float(QUIZ_ANSWERS_CAP)).join(
+        Quiz, Quiz.id == QuizResult.quiz_id).group_by(QuizResult.user_id, Quiz.topic_id)
+    finished = select(UserProgress.user_id, UserProgress.topic_id, 1.0).where(UserProgress.completed == True)
+    if user_ids is not None:
+        progress = progress.where(UserProgress.user_id.in_(user_ids))
+        answers = answers.where(QuizResult.user_id.in_(user_ids))
+        finished = finished.where(UserProgress.user_id.in_(user_ids))
+    return (progress, answers), finished
+
+
+def _positions(sorted_ids: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Index of each value in `sorted_ids`, and whether it is there at all"""
+    positions = np.searchsorted(sorted_ids, values)
+    found = sorted_ids[np.minimum(positions, len(sorted_ids) - 1)] == values if len(sorted_ids) else \
+        np.zeros(len(values), dtype=bool)
+    return positions, found
+
+
+class Recommender:
+    """Topic similarity from the last full run, and the matrices to score users with it"""
+
+    def __init__(self, topic_ids: np.ndarray, similarity: np.ndarray):
+        self.topic_ids = topic_ids  # sorted published topic ids (the matrix columns)
+        self.similarity = similarity
+
+    def _matrix(self, data: np.ndarray, user_ids: np.ndarray) -> sp.csr_matrix:
+        """Sum (user, topic, weight) rows into a users x topics CSR matrix (others are dropped)"""
+        rows, known_user = _positions(user_ids, data[:, 0].astype(np.int64))
+        columns, published = _positions(self.topic_ids, data[:, 1].astype(np.int64))
+        keep = known_user & published
+        matrix = sp.coo_matrix(
+            (data[keep, 2].astype(np.float32), (rows[keep], columns[keep])),
+            shape=(len(user_ids), len(self.topic_ids)),
+        )
+        return matrix.tocsr()  # duplicates (progress + answers) are summed
+
+    @classmethod
+    def fit(cls, db: Session) -> Tuple["Recommender", np.ndarray, sp.csr_matrix, sp.csr_matrix]:
+        """Learn the similarity from everyone; also returns (user ids, R, completed) for scoring"""
+        topic_ids = np.array(sorted(db.scalars(select(LegalTopic.id).where(LegalTopic.is_published == True))),
+                             dtype=np.int64)
+        recommender = cls(topic_ids, np.zeros((len(topic_ids), len(topic_ids)), dtype=np.float32))
+        queries, finished = _interaction_queries()
+        data = _load(db, queries)
+        user_ids = np.unique(data[:, 0].astype(np.int64))
+        interactions = recommender._matrix(data, user_ids)
+        completed = recommender._matrix(_load(db, [finished]), user_ids)
+
+        co = (interactions.T @ interactions).toarray()
+        norms = np.sqrt(np.diagonal(co))
+        similarity = np.divide(co, np.outer(norms, norms), out=np.zeros_like(co), where=co > 0)
+        np.fill_diagonal(similarity, 0)
+        recommender.similarity = similarity.astype(np.float32)
+        return recommender, user_ids, interactions, completed
+
+    def score(self, user_ids: np.ndarray, interactions: sp.csr_matrix,
+              completed: sp.csr_matrix) -> Iterator[Tuple[int, List[int]]]:
+        """Yield (user id, best unfinished topic ids) block by block"""
+        n = min(RECOMMENDATIONS_PER_USER, len(self.topic_ids))
+        if n == 0:
+            return
+        for start in range(0, len(user_ids), USER_BLOCK):
+            stop = min(start + USER_BLOCK, len(user_ids))
+            scores = np.asarray(interactions[start:stop] @ self.similarity)
+            done = completed[start:stop].tocoo()
+            scores[done.row, done.col] = -np.inf
+            if n < scores.shape[1]:
+                top = np.argpartition(-scores, n - 1, axis=1)[:, :n]
+            else:
+                top = np.tile(np.arange(scores.shape[1]), (stop - start, 1))
+            best = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-best, axis=1, kind="stable")
+            top, best = np.take_along_axis(top, order, axis=1), np.take_along_axis(best, order, axis=1)
+            for i, user_id in enumerate(user_ids[start:stop].tolist()):
+                yield user_id, self.topic_ids[top[i][best[i] > 0]].tolist()
+
+    def score_users(self, db: Session, user_ids: Sequence[int]) -> Iterator[Tuple[int, List[int]]]:
+        """Re-score some users with the current similarity"""
+        for start in range(0, len(user_ids), ACTIVE_USER_CHUNK):
+            chunk = np.array(sorted(user_ids[start:start + ACTIVE_USER_CHUNK]), dtype=np.int64)
+            queries, finished = _interaction_queries(chunk.tolist())
+            yield from self.score(chunk, self._matrix(_load(db, queries), chunk),
+                                  self._matrix(_load(db, [finished]), chunk))
+
+
+def _write(db: Session, lists: Iterator[Tuple[int, List[int]]], replace_all: bool) -> int:
+    """Store recommendation lists (caller commits); returns the number of users written"""
+    if replace_all:
+        db.execute(delete(UserRecommendations))
+    written = 0
+    batch = []
+    for user_id, topic_ids in lists:
+        batch.append({"user_id": user_id, "topic_ids": json.dumps(topic_ids)})
+        if len(batch) >= WRITE_ROWS:
+            written += _flush(db, batch, replace_all)
+            batch = []
+    if batch:
+        written += _flush(db, batch, replace_all)
+    return written
+
+
+def _flush(db: Session, batch: List[dict], replace_all: bool) -> int:
+    if not replace_all:
+        db.execute(delete(UserRecommendations).where(
+            UserRecommendations.user_id.in_([row["user_id"] for row in batch])))
+    db.execute(UserRecommendations.__table__.insert(), batch)
+    return len(batch)
+
+
+def rebuild_recommendations(db: Session) -> Recommender:
+    """Recompute the similarity and every user's list; replaces user_recommendations"""
+    recommender, user_ids, interactions, completed = Recommender.fit(db)
+    count = _write(db, recommender.score(user_ids, interactions, completed), replace_all=True)
+    db.commit()
+    logger.info("Recommendations for %d users over %d topics", count, len(recommender.topic_ids))
+    return recommender
+
+
+def active_users(db: Session, since) -> List[int]:
+    """Users with progress or quiz answers at or after `since` (database time)"""
+    # Stored timestamps have one-second resolution; scoring a user twice is harmless
+    since -= timedelta(seconds=1)
+    progress = select(UserProgress.user_id).where(
+        func.coalesce(UserProgress.updated_at, UserProgress.created_at) >= since)
+    answers = select(QuizResult.user_id).where(QuizResult.created_at >= since)
+    return sorted(db.scalars(progress.union(answers)))
+
+
+def refresh_recommendations(db: Session, recommender: Recommender, since) -> int:
+    """Re-score the users active since `since`; returns how many"""
+    users = active_users(db, since)
+    if not users:
+        return 0
+    count = _write(db, recommender.score_users(db, users), replace_all=False)
+    db.commit()
+    return count
+
+
+if __name__ == "__main__":
+    from database import SessionLocal, create_tables
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--watch", type=float, metavar="SECONDS",
+                        help="keep running and re-score active users at this interval")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        since = db.scalar(select(func.now()))
+        started = time.perf_counter()
+        recommender = rebuild_recommendations(db)
+        print(f"✅ Rebuilt recommendations in {time.perf_counter() - started:.1f}s")
+        while args.watch:
+            time.sleep(args.watch)
+            now = db.scalar(select(func.now()))
+            started = time.perf_counter()
+            count = refresh_recommendations(db, recommender, since)
+            since = now
+            if count:
+                logger.info("Re-scored %d active users in %.2fs", count, time.perf_counter() - started)
+    finally:
+        db.close()
@@ -0,0 +1,307 @@
+"""
+Related-topic recommendations ("read next")
+
+Topic-to-topic similarity is computed offline with NumPy from three signals:
+
+- tags: Jaccard overlap of the topics' normalized tags
+- text: cosine similarity of TF-IDF vectors over LegalTopic.content
+- co-completion: cosine similarity of the sets of users who completed them
+
+and blended with TAG_WEIGHT, TEXT_WEIGHT and COMPLETION_WEIGHT. The
+RELATED_PER_TOPIC best neighbours of every published topic are written to
+the related_topics table, which the API serves as is.
+
+RelatedModel keeps the feature matrices and neighbour lists in memory, so
+a refresh after some topics changed (content, tags, publication, new
+completions) recomputes only the similarity rows of those topics and the
+lists they may enter or leave, instead of the whole matrix. The TF-IDF
+vocabulary and weights stay as of the last full build.
+
+Rewritten lists are announced with "related" topic content events when
+they commit, so the API drops its cached lists at once instead of serving
+them until their TTL. The job joins the invalidation bus to reach the
+server's workers: set the same CACHE_URL (Redis), or the same
+RIGHTS360_BUS_DIR as serve.py.
+
+Run from the backend directory:
+    python -m services.related              # full rebuild (e.g. nightly)
+    python -m services.related --watch 60   # then refresh changes every 60 s
+"""
+
+import argparse
+import logging
+import re
+import time
+from collections import Counter
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy import and_, delete, func, insert, select
+from sqlalchemy.orm import Session, aliased
+
+from models.topic_model import LegalTopic, RelatedTopic
+from models.user_model import UserProgress
+from services import content_events
+from services.content_events import ContentEvent
+from services.tags import parse_tags
+
+logger = logging.getLogger(__name__)
+
+TAG_WEIGHT = 0.3
+TEXT_WEIGHT = 0.5
+COMPLETION_WEIGHT = 0.2
+RELATED_PER_TOPIC = 8
+MIN_SCORE = 0.01  # weaker neighbours are not worth suggesting
+MAX_TERMS = 4096  # TF-IDF vocabulary size (most widespread terms first)
+BLOCK_ROWS = 512  # similarity rows computed at once
+
+_TERM = re.compile(r"[a-z]{3,}")
+
+
+def _terms(text: Optional[str]) -> Counter:
+    return Counter(_TERM.findall((text or "").lower()))
+
+
+def _published_topics(db: Session, ids: Optional[Iterable[int]] = None) -> List[Tuple[int, str, str]]:
+    query = select(LegalTopic.id, LegalTopic.tags, LegalTopic.content).where(LegalTopic.is_published == True)
+    if ids is not None:
+        query = query.where(LegalTopic.id.in_(list(ids)))
+    return [tuple(row) for row in db.execute(query.order_by(LegalTopic.id))]
+
+
+class RelatedModel:
+    """Topic features and their current neighbour lists (one row per topic ever seen)"""
+
+    def __init__(self, vocabulary: Dict[str, int], idf: np.ndarray):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.ids: List[int] = []
+        self.rows: Dict[int, int] = {}
+        self.tag_columns: Dict[str, int] = {}
+        self.active = np.zeros(0, dtype=bool)
+        self.tags = np.zeros((0, 0), dtype=np.float32)
+        self.text = np.zeros((0, len(vocabulary)), dtype=np.float32)
+        self.completions = np.zeros((0, 0), dtype=np.float32)  # users completing both; diagonal = each
+        self.neighbours = np.zeros((0, RELATED_PER_TOPIC), dtype=np.int64)  # row numbers, -1 = none
+        self.scores = np.zeros((0, RELATED_PER_TOPIC), dtype=np.float32)
+
+    @classmethod
+    def build(cls, db: Session) -> "RelatedModel":
+        topics = _published_topics(db)
+        documents = [_terms(content) for _, _, content in topics]
+        df = Counter(term for document in documents for term in document)
+        # Terms in a single topic (or in all of them) cannot make two topics similar
+        terms = [term for term, n in df.most_common() if 2 <= n < len(documents)][:MAX_TERMS]
+        idf = np.log(len(documents) / np.array([df[term] for term in terms], dtype=np.float64))
+        model = cls({term: i for i, term in enumerate(terms)}, idf.astype(np.float32))
+        model._set_topics(topics, documents)
+        model._load_completions(db)
+        model._rank(np.arange(len(model.ids)))
+        return model
+
+    def _grow(self, topic_ids: Sequence[int], tag_names: Iterable[str]):
+        new_ids = [topic_id for topic_id in topic_ids if topic_id not in self.rows]
+        new_tags = [name for name in dict.fromkeys(tag_names) if name not in self.tag_columns]
+        for name in new_tags:
+            self.tag_columns[name] = len(self.tag_columns)
+        for topic_id in new_ids:
+            self.rows[topic_id] = len(self.ids)
+            self.ids.append(topic_id)
+        extra = len(new_ids)
+        self.active = np.pad(self.active, (0, extra))
+        self.tags = np.pad(self.tags, ((0, extra), (0, len(new_tags))))
+        self.text = np.pad(self.text, ((0, extra), (0, 0)))
+        self.completions = np.pad(self.completions, ((0, extra), (0, extra)))
+        self.neighbours = np.pad(self.neighbours, ((0, extra), (0, 0)), constant_values=-1)
+        self.scores = np.pad(self.scores, ((0, extra), (0, 0)), constant_values=-np.inf)
+
+    def _set_topics(self, topics: List[Tuple[int, str, str]], documents: Optional[List[Counter]] = None):
+        tags = [parse_tags(raw) for _, raw, _ in topics]
+        self._grow([topic_id for topic_id, _, _ in topics], (name for names in tags for name in names))
+        for i, (topic_id, _, content) in enumerate(topics):
+            row = self.rows[topic_id]
+            self.active[row] = True
+            self.tags[row] = 0
+            self.tags[row, [self.tag_columns[name] for name in tags[i]]] = 1
+            vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+            for term, count in (documents[i] if documents is not None else _terms(content)).items():
+                column = self.vocabulary.get(term)
+                if column is not None:
+                    vector[column] = (1 + np.log(count)) * self.idf[column]
+            norm = np.linalg.norm(vector)
+            self.text[row] = vector / norm if norm else vector
+
+    def _deactivate(self, topic_ids: Iterable[int]):
+        for topic_id in topic_ids:
+            row = self.rows[topic_id]
+            self.active[row] = False
+            self.neighbours[row] = -1
+            self.scores[row] = -np.inf
+
+    def _load_completions(self, db: Session, topic_ids: Optional[Sequence[int]] = None):
+        """(Re)load co-completion counts for `topic_ids` (None = all) in one aggregate query"""
+        first, second = aliased(UserProgress), aliased(UserProgress)
+        query = select(first.topic_id, second.topic_id, func.count()).join(
+            second, and_(second.user_id == first.user_id, second.completed == True)
+        ).where(first.completed == True).group_by(first.topic_id, second.topic_id)
+        if topic_ids is not None:
+            query = query.where(first.topic_id.in_(list(topic_ids)))
+            rows = [self.rows[topic_id] for topic_id in topic_ids if topic_id in self.rows]
+            self.completions[rows, :] = 0
+            self.completions[:, rows] = 0
+        else:
+            self.completions[:] = 0
+        for a, b, count in db.execute(query):
+            if a in self.rows and b in self.rows:
+                self.completions[self.rows[a], self.rows[b]] = count
+                self.completions[self.rows[b], self.rows[a]] = count
+
+    def similarity(self, rows: np.ndarray) -> np.ndarray:
+        """Blended similarity of `rows` to every topic (-inf for itself and inactive topics)"""
+        overlap = self.tags[rows] @ self.tags.T
+        sizes = self.tags.sum(axis=1)
+        union = sizes[rows, None] + sizes[None, :] - overlap
+        jaccard = np.divide(overlap, union, out=np.zeros_like(overlap), where=union > 0)
+
+        text = self.text[rows] @ self.text.T
+
+        completed = np.diagonal(self.completions)
+        norms = np.sqrt(completed[rows, None] * completed[None, :])
+        together = np.divide(self.completions[rows], norms, out=np.zeros_like(norms), where=norms > 0)
+
+        scores = TAG_WEIGHT * jaccard + TEXT_WEIGHT * text + COMPLETION_WEIGHT * together
+        scores[:, ~self.active] = -np.inf
+        scores[np.arange(len(rows)), rows] = -np.inf
+        return scores
+
+    def _rank(self, rows: np.ndarray):
+        """Recompute the neighbour lists of `rows`"""
+        k = RELATED_PER_TOPIC
+        for start in range(0, len(rows), BLOCK_ROWS):
+            block = rows[start:start + BLOCK_ROWS]
+            scores = self.similarity(block)
+            if scores.shape[1] > k:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            else:
+                top = np.tile(np.arange(scores.shape[1]), (len(block), 1))
+            best = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-best, axis=1, kind="stable")
+            top, best = np.take_along_axis(top, order, axis=1), np.take_along_axis(best, order, axis=1)
+            width = top.shape[1]
+            self.neighbours[block] = -1
+            self.scores[block] = -np.inf
+            self.neighbours[block, :width] = np.where(best > -np.inf, top, -1)
+            self.scores[block, :width] = best
+
+    def refresh(self, db: Session, changed: Set[int]) -> Set[int]:
+        """Apply changes to the `changed` topics; returns the topic ids whose lists changed"""
+        published = set(db.scalars(select(LegalTopic.id).where(LegalTopic.is_published == True)))
+        removed = {topic_id for topic_id in self.ids if self.active[self.rows[topic_id]]} - published
+        changed = (changed & published) | (published - set(self.rows)) | removed
+        if not changed:
+            return set()
+
+        changed_rows = np.array([self.rows[topic_id] for topic_id in changed if topic_id in self.rows], dtype=np.int64)
+        # Lists that contained a changed topic may have to drop it
+        affected = set(np.flatnonzero(np.isin(self.neighbours, changed_rows).any(axis=1)).tolist())
+
+        self._deactivate(removed)
+        self._set_topics(_published_topics(db, changed - removed))
+        self._load_completions(db, sorted(changed))
+        changed_rows = np.array(sorted(self.rows[topic_id] for topic_id in changed), dtype=np.int64)
+
+        # Lists that a changed topic now beats the last entry of (similarity is symmetric)
+        entering = (self.similarity(changed_rows).T > self.scores[:, -1:]).any(axis=1)
+        affected.update(np.flatnonzero(entering).tolist())
+        affected.update(changed_rows.tolist())
+        rows = np.array(sorted(row for row in affected if self.active[row]), dtype=np.int64)
+        self._rank(rows)
+        return {self.ids[row] for row in affected}
+
+    def related(self, topic_id: int) -> List[Tuple[int, float]]:
+        row = self.rows[topic_id]
+        return [
+            (self.ids[neighbour], float(score))
+            for neighbour, score in zip(self.neighbours[row], self.scores[row])
+            if neighbour >= 0 and score >= MIN_SCORE
+        ]
+
+    def write(self, db: Session, topic_ids: Optional[Iterable[int]] = None):
+        """Replace the stored lists of `topic_ids` (None = all); caller commits"""
+        if topic_ids is None:
+            topic_ids = self.ids
+            db.execute(delete(RelatedTopic))
+            content_events.record(db, ContentEvent("topic", "related"))
+        else:
+            topic_ids = list(topic_ids)
+            db.execute(delete(RelatedTopic).where(RelatedTopic.topic_id.in_(topic_ids)))
+            for topic_id in topic_ids:
+                content_events.record(db, ContentEvent("topic", "related", id=topic_id))
+        rows = [
+            {"topic_id": topic_id, "rank": rank, "related_topic_id": related_id, "score": round(score, 4)}
+            for topic_id in topic_ids if self.active[self.rows[topic_id]]
+            for rank, (related_id, score) in enumerate(self.related(topic_id))
+        ]
+        if rows:
+            db.execute(insert(RelatedTopic), rows)
+
+
+def changed_since(db: Session, since) -> Set[int]:
+    """Topics edited, or completed by someone, at or after `since` (database time)"""
+    # Stored timestamps have one-second resolution; looking at a topic twice is harmless
+    since -= timedelta(seconds=1)
+    topics = select(LegalTopic.id).where(func.coalesce(LegalTopic.updated_at, LegalTopic.created_at) >= since)
+    completed = select(UserProgress.topic_id).where(
+        UserProgress.completed == True,
+        func.coalesce(UserProgress.updated_at, UserProgress.created_at) >= since,
+    )
+    return set(db.scalars(topics.union(completed)))
+
+
+def rebuild_related(db: Session) -> RelatedModel:
+    """Recompute every topic's neighbours and replace the related_topics table"""
+    model = RelatedModel.build(db)
+    model.write(db)
+    db.commit()
+    return model
+
+
+def refresh_related(db: Session, model: RelatedModel, since) -> int:
+    """Bring `model` and the table up to date with changes since `since`; returns lists rewritten"""
+    updated = model.refresh(db, changed_since(db, since))
+    if updated:
+        model.write(db, updated)
+        db.commit()
+    return len(updated)
+
+
+if __name__ == "__main__":
+    from database import SessionLocal, create_tables
+    from services.cache import start_bus, stop_bus
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--watch", type=float, metavar="SECONDS",
+                        help="keep running and refresh changed topics at this interval")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    create_tables()
+    start_bus()
+    db = SessionLocal()
+    try:
+        since = db.scalar(select(func.now()))
+        started = time.perf_counter()
+        model = rebuild_related(db)
+        print(f"✅ Related topics for {int(model.active.sum())} topics in {time.perf_counter() - started:.2f}s")
+        while args.watch:
+            time.sleep(args.watch)
+            now = db.scalar(select(func.now()))
+            started = time.perf_counter()
+            count = refresh_related(db, model, since)
+            since = now
+            if count:
+                logger.info("Refreshed %d related-topic lists in %.3fs", count, time.perf_counter() - started)
+    finally:
+        db.close()
+        stop_bus()
@@ -0,0 +1,136 @@
+"""
+Single-flight request coalescing
+
+A SingleFlight group runs one call per key at a time: concurrent callers
+asking for the same key wait for the first one (the leader) and share its
+result or exception. A successful result is kept for `ttl` seconds, so a
+burst that arrives just after the leader finished is served from it too.
+
+Callers in threadpool handlers use `do()`. Handlers on the event loop use
+`await do_async()`, which runs a plain function in the threadpool (or
+awaits a coroutine function) without blocking the loop while waiting.
+Both kinds of caller share the same in-flight calls.
+
+Results are shared between requests, so return immutable values (ids,
+tuples, encoded bytes), not ORM objects bound to the leader's session.
+"""
+
+import asyncio
+import inspect
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+
+class _Call:
+    __slots__ = ("done", "value", "error", "expires", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[Exception] = None
+        self.expires = 0.0
+        self.waiters = []  # (loop, future) of async followers
+
+    def result(self):
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class SingleFlight:
+    def __init__(self, name: str, ttl: float = 1.0, max_entries: int = 1024):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+
+    def _join(self, key: Hashable):
+        """Return (call, is_leader)"""
+        now = time.monotonic()
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and (not call.done.is_set() or now < call.expires):
+                self.shared += 1
+                return call, False
+            if len(self._calls) >= self.max_entries:
+                self._prune(now)
+            call = self._calls[key] = _Call()
+            self.leaders += 1
+            return call, True
+
+    def _prune(self, now: float):
+        for key, call in list(self._calls.items()):
+            if call.done.is_set() and now >= call.expires:
+                del self._calls[key]
+
+    def _finish(self, key: Hashable, call: _Call, value: Any = None, error: Optional[Exception] = None):
+        call.value, call.error = value, error
+        call.expires = time.monotonic() + (self.ttl if error is None else 0.0)
+        with self._lock:
+            call.done.set()
+            waiters, call.waiters = call.waiters, []
+            if error is not None and self._calls.get(key) is call:
+                del self._calls[key]
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return fn()'s result, sharing it with concurrent calls for `key`"""
+        call, leader = self._join(key)
+        if leader:
+            try:
+                value = fn()
+            except Exception as e:
+                self._finish(key, call, error=e)
+                raise
+            self._finish(key, call, value)
+            return value
+        call.done.wait()
+        return call.result()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Like do(), for callers on the event loop"""
+        call, leader = self._join(key)
+        if leader:
+            try:
+                value = await fn() if inspect.iscoroutinefunction(fn) else await run_in_threadpool(fn)
+            except BaseException as e:
+                # A cancelled leader must still release its followers
+                error = e if isinstance(e, Exception) else RuntimeError(f"{self.name}: leader call was cancelled")
+                self._finish(key, call, error=error)
+                raise
+            self._finish(key, call, value)
+            return value
+        with self._lock:
+            if not call.done.is_set():
+                loop = asyncio.get_running_loop()
+                future = loop.create_future()
+                call.waiters.append((loop, future))
+            else:
+                future = None
+        if future is not None:
+            await future
+        return call.result()
+
+    def forget(self, key: Optional[Hashable] = None):
+        """Drop `key` (or every key) so the next caller fetches afresh.
+
+        Calls already in flight still answer their own waiters, but their
+        result is not kept.
+        """
+        with self._lock:
+            if key is None:
+                self._calls.clear()
+            else:
+                self._calls.pop(key, None)
@@ -0,0 +1,229 @@
+"""
+Spaced-repetition scheduling for quiz questions (SM-2 variant)
+
+Each (user, quiz) pair keeps a compact review state that is updated on every
+submit, so picking the next question is a single indexed query instead of a
+scan over every quiz.
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, literal, select, union_all, update
+from sqlalchemy.orm import Session
+
+from database import insert_for
+from models.quiz_model import QuizReviewState, QuizStats
+from models.topic_model import Quiz, QuizResult
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# Answers faster than this (seconds) count as "perfect recall"
+FAST_ANSWER_SECONDS = 10
+SLOW_ANSWER_SECONDS = 60
+# Intervals grow geometrically; keep long streaks from overflowing dates
+MAX_INTERVAL_DAYS = 3650
+
+
+def grade_quality(is_correct: bool, time_taken: Optional[int] = None) -> int:
+    """Map an answer to an SM-2 quality score (0-5)"""
+    if not is_correct:
+        return 1
+    if time_taken is not None and time_taken <= FAST_ANSWER_SECONDS:
+        return 5
+    if time_taken is not None and time_taken > SLOW_ANSWER_SECONDS:
+        return 3
+    return 4
+
+
+def apply_review(state: QuizReviewState, quality: int, reviewed_at: datetime) -> QuizReviewState:
+    """Advance a review state by one answer"""
+    ease = state.ease_factor if state.ease_factor is not None else DEFAULT_EASE
+    repetitions = state.repetitions or 0
+    interval = state.interval_days or 0
+
+    if quality < 3:
+        repetitions = 0
+        interval = 1
+        state.lapses = (state.lapses or 0) + 1
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval = 1
+        elif repetitions == 2:
+            interval = 6
+        else:
+            interval = min(MAX_INTERVAL_DAYS, int(round(interval * ease)))
+
+    ease += 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+    state.ease_factor = max(MIN_EASE, ease)
+    state.repetitions = repetitions
+    state.interval_days = interval
+    state.last_reviewed_at = reviewed_at
+    state.due_at = reviewed_at + timedelta(days=interval)
+    return state
+
+
+def record_review(db: Session, user_id: int, quiz_id: int, is_correct: bool,
+                  time_taken: Optional[int] = None) -> QuizReviewState:
+    """Update the review state for a submitted answer (caller commits)"""
+    now = datetime.utcnow()
+    table = QuizReviewState.__table__
+    # Insert a fresh state or claim the existing one: either way the row is
+    # write-locked until commit, so parallel submits cannot both create it or
+    # advance it from the same starting point
+    stmt = insert_for(db)(table).values(
+        user_id=user_id, quiz_id=quiz_id, ease_factor=DEFAULT_EASE, interval_days=0, repetitions=0, lapses=0,
+        due_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.quiz_id], set_={"user_id": stmt.excluded.user_id}
+    )
+    row = db.execute(stmt.returning(*table.c)).one()
+    state = apply_review(QuizReviewState(**row._mapping), grade_quality(is_correct, time_taken), now)
+    db.execute(update(QuizReviewState).where(
+        QuizReviewState.user_id == user_id, QuizReviewState.quiz_id == quiz_id
+    ).values(
+        ease_factor=state.ease_factor, interval_days=state.interval_days, repetitions=state.repetitions,
+        lapses=state.lapses, due_at=state.due_at, last_reviewed_at=state.last_reviewed_at,
+    ))
+    return state
+
+
+def next_quiz_for_user(db: Session, user_id: int, topic_id: Optional[int] = None,
+                       difficulty: Optional[str] = None) -> Optional[Quiz]:
+    """Return the most useful question for a user in one query.
+
+    Order: the most overdue question, then the first question never seen,
+    then the weakest (lowest ease) of the ones not yet due. Each candidate is
+    a LIMIT 1 lookup on an index (review states by (user_id, due_at) and
+    (user_id, quiz_id)), so no branch scans or sorts every quiz.
+    `difficulty` matches the effective difficulty (observed once tuned, else
+    the hand-set label), like the catalog.
+    """
+    now = datetime.utcnow()
+
+    def filtered(query):
+        query = query.where(Quiz.deleted_at.is_(None))
+        if topic_id:
+            query = query.where(Quiz.topic_id == topic_id)
+        if difficulty:
+            query = query.outerjoin(QuizStats, QuizStats.quiz_id == Quiz.id).where(
+                func.coalesce(QuizStats.observed_difficulty, Quiz.difficulty) == difficulty)
+        return query
+
+    reviewed = filtered(select(QuizReviewState.quiz_id).join(Quiz, Quiz.id == QuizReviewState.quiz_id)).where(
+        QuizReviewState.user_id == user_id)
+    overdue = reviewed.where(QuizReviewState.due_at <= now).order_by(QuizReviewState.due_at).limit(1)
+    unseen = filtered(select(Quiz.id)).where(~select(QuizReviewState.quiz_id).where(
+        QuizReviewState.user_id == user_id, QuizReviewState.quiz_id == Quiz.id
+    ).exists()).order_by(Quiz.id).limit(1)
+    weakest = reviewed.order_by(QuizReviewState.ease_factor, QuizReviewState.due_at).limit(1)
+
+    branches = [
+        select(literal(rank).label("rank"), candidate.c[0].label("quiz_id"))
+        for rank, candidate in enumerate(query.subquery() for query in (overdue, unseen, weakest))
+    ]
+    candidates = union_all(*branches).subquery()
+    return db.query(Quiz).join(candidates, candidates.c.quiz_id == Quiz.id).order_by(candidates.c.rank).first()
+
+
+def rebuild_review_states(db: Session, chunk_size: int = 5000) -> int:
+    """Recompute every review state from the QuizResult history.
+
+    The SM-2 recurrence is sequential per (user, quiz) pair, so the rebuild
+    vectorizes across pairs: step k applies every pair's k-th answer at once.
+    Returns the number of states written.
+    """
+    import numpy as np
+
+    rows = db.execute(
+        select(
+            QuizResult.user_id,
+            QuizResult.quiz_id,
+            QuizResult.is_correct,
+            QuizResult.time_taken,
+            QuizResult.created_at,
+        ).join(Quiz, Quiz.id == QuizResult.quiz_id).where(Quiz.deleted_at.is_(None))
+        .order_by(QuizResult.user_id, QuizResult.quiz_id, QuizResult.created_at, QuizResult.id)
+    ).all()
+
+    db.execute(delete(QuizReviewState))
+    if not rows:
+        db.commit()
+        return 0
+
+    user_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    quiz_ids = np.fromiter((r[1] for r in rows), dtype=np.int64, count=len(rows))
+    correct = np.fromiter((bool(r[2]) for r in rows), dtype=bool, count=len(rows))
+    times = np.fromiter((-1 if r[3] is None else r[3] for r in rows), dtype=np.int64, count=len(rows))
+
+    quality = np.where(correct, 4, 1)
+    quality[correct & (times >= 0) & (times <= FAST_ANSWER_SECONDS)] = 5
+    quality[correct & (times > SLOW_ANSWER_SECONDS)] = 3
+
+    # Group boundaries: rows are sorted by (user, quiz)
+    new_group = np.ones(len(rows), dtype=bool)
+    new_group[1:] = (user_ids[1:] != user_ids[:-1]) | (quiz_ids[1:] != quiz_ids[:-1])
+    group_starts = np.flatnonzero(new_group)
+    group_of_row = np.cumsum(new_group) - 1
+    position = np.arange(len(rows)) - group_starts[group_of_row]
+
+    n_groups = len(group_starts)
+    ease = np.full(n_groups, DEFAULT_EASE)
+    interval = np.zeros(n_groups, dtype=np.int64)
+    repetitions = np.zeros(n_groups, dtype=np.int64)
+    lapses = np.zeros(n_groups, dtype=np.int64)
+    last_row = np.zeros(n_groups, dtype=np.int64)
+
+    for step in range(int(position.max()) + 1):
+        row_idx = np.flatnonzero(position == step)
+        groups = group_of_row[row_idx]
+        q = quality[row_idx]
+        failed = q < 3
+
+        reps = np.where(failed, 0, repetitions[groups] + 1)
+        next_interval = np.where(
+            reps <= 1, 1,
+            np.where(reps == 2, 6, np.minimum(MAX_INTERVAL_DAYS, np.rint(interval[groups] * ease[groups])).astype(np.int64)),
+        )
+        ease[groups] = np.maximum(
+            MIN_EASE, ease[groups] + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02)
+        )
+        repetitions[groups] = reps
+        interval[groups] = next_interval
+        lapses[groups] += failed
+        last_row[groups] = row_idx
+
+    written = 0
+    for start in range(0, n_groups, chunk_size):
+        batch = []
+        for g in range(start, min(start + chunk_size, n_groups)):
+            reviewed_at = rows[last_row[g]][4] or datetime.utcnow()
+            batch.append({
+                "user_id": int(user_ids[group_starts[g]]),
+                "quiz_id": int(quiz_ids[group_starts[g]]),
+                "ease_factor": float(ease[g]),
+                "interval_days": int(interval[g]),
+                "repetitions": int(repetitions[g]),
+                "lapses": int(lapses[g]),
+                "last_reviewed_at": reviewed_at,
+                "due_at": reviewed_at + timedelta(days=int(interval[g])),
+            })
+        db.execute(insert(QuizReviewState), batch)
+        written += len(batch)
+
+    db.commit()
+    return written
+
+
+if __name__ == "__main__":
+    from database import SessionLocal, create_tables
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        count = rebuild_review_states(db)
+        print(f"✅ Rebuilt {count} review states from quiz history")
+    finally:
+        db.close()
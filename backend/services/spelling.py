@@ -0,0 +1,125 @@
+"""
+Typo correction with a symmetric-delete (SymSpell) index
+
+Every dictionary word's prefix is stored under all the strings obtained by
+deleting up to `max_distance` characters from it. At lookup time the same
+deletes are generated from the typed word, so candidates are found with a
+handful of dict probes instead of an edit-distance scan over the whole
+dictionary; only those candidates are verified with `edit_distance`. Lookup
+cost depends on the word's length, not on the dictionary size.
+
+`correct()` fixes a whole phrase word by word and also joins a split word
+("cyber bulling" -> "cyberbullying"). Words that are already spelled right
+are left alone: dictionary words, and the extra `known` vocabulary that is
+recognised but never offered as a correction ("sue" must not become "use").
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance (adjacent swaps count once), or max_distance + 1 when further"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1] if previous[-1] <= max_distance else max_distance + 1
+
+
+def allowed_distance(word: str) -> int:
+    """Edits tolerated in a word of this length (short words are too easy to turn into others)"""
+    return 0 if len(word) <= 2 else 1 if len(word) <= 5 else 2
+
+
+class SymSpell:
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words: Dict[str, int] = {}
+        self.known: Set[str] = set()
+        self._deletes: Dict[str, List[str]] = {}
+
+    def _edits(self, word: str, distance: int) -> Set[str]:
+        edits, frontier = {word}, {word}
+        for _ in range(distance):
+            frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))} - edits
+            edits |= frontier
+        return edits
+
+    def add(self, word: str, count: int = 1):
+        if word in self.words:
+            self.words[word] += count
+            return
+        self.words[word] = count
+        for delete in self._edits(word[:self.prefix_length], self.max_distance):
+            self._deletes.setdefault(delete, []).append(word)
+
+    def add_text(self, text: str):
+        for word in _WORD.findall(text.lower()):
+            self.add(word)
+
+    def is_known(self, word: str) -> bool:
+        return word in self.words or word in self.known
+
+    def lookup(self, word: str, max_distance: Optional[int] = None) -> Optional[Tuple[str, int]]:
+        """The closest dictionary word as (word, distance), most frequent first on ties"""
+        if word in self.words:
+            return word, 0
+        max_distance = min(self.max_distance, allowed_distance(word) if max_distance is None else max_distance)
+        if max_distance == 0:
+            return None
+        best: Optional[Tuple[int, int, str]] = None  # (distance, -count, word)
+        checked = set()
+        for delete in self._edits(word[:self.prefix_length], max_distance):
+            for candidate in self._deletes.get(delete, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                distance = edit_distance(word, candidate, best[0] if best else max_distance)
+                if distance <= max_distance:
+                    key = (distance, -self.words[candidate], candidate)
+                    if best is None or key < best:
+                        best = key
+        return (best[2], best[0]) if best else None
+
+    def correct(self, text: str) -> str:
+        """`text` lower-cased with unknown words replaced by their closest dictionary word"""
+        words = _WORD.findall(text.lower())
+        corrected = []
+        i = 0
+        while i < len(words):
+            word = words[i]
+            if self.is_known(word):
+                corrected.append(word)
+                i += 1
+                continue
+            if i + 1 < len(words):
+                joined = self.lookup(word + words[i + 1])
+                if joined is not None:
+                    corrected.append(joined[0])
+                    i += 2
+                    continue
+            match = self.lookup(word)
+            corrected.append(match[0] if match else word)
+            i += 1
+        return " ".join(corrected)
+
+
+def build(texts: Iterable[str], max_distance: int = 2, known: Iterable[str] = ()) -> SymSpell:
+    speller = SymSpell(max_distance)
+    for text in texts:
+        speller.add_text(text)
+    speller.known.update(word.lower() for word in known)
+    return speller
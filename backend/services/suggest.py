@@ -0,0 +1,214 @@
+"""
+Typeahead suggestions over topic titles, tags and assistant questions
+
+Every suggestion is indexed under each of its word starts ("know your
+rights" under "know your rights", "your rights" and "rights"), normalized
+to lower-case words. The keys are kept in one sorted list, so a prefix
+matches a contiguous range found with two bisects. A sparse table over the
+entry weights answers "heaviest entry in this range" in O(1), and the top
+`limit` suggestions are pulled from the range with a small heap, so a
+lookup costs O(log n + limit log limit) whatever the prefix.
+
+Weights are 1 + the number of users who opened the topic (UserProgress
+rows); a tag weighs as much as its topics together. They are refreshed
+every POPULARITY_TTL seconds by whichever request finds them stale, while
+other requests keep using the previous index.
+
+Like the catalog, an index is never modified. A topic change re-derives
+the entries of the changed topics and of the tags, and merges them into
+the kept ones; a popularity refresh keeps the keys and only recomputes the
+weights.
+"""
+
+import heapq
+import re
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from services import catalog, content_events, lifecycle
+
+POPULARITY_TTL = 300
+MAX_WORD_STARTS = 8  # a suggestion is indexed under at most this many of its words
+MAX_LIMIT = 20
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+class Suggestion(NamedTuple):
+    text: str
+    kind: str  # "topic", "tag" or "question"
+    slug: Optional[str] = None
+    topic_ids: Tuple[int, ...] = ()
+
+
+def normalize(text: str) -> str:
+    return " ".join(_NON_WORD.sub(" ", text.casefold()).split())
+
+
+def _keys(text: str) -> List[str]:
+    words = normalize(text).split()
+    return [" ".join(words[start:]) for start in range(min(len(words), MAX_WORD_STARTS))]
+
+
+def _entries(suggestions: Iterable[Suggestion]) -> List[Tuple[str, Suggestion]]:
+    return sorted((key, suggestion) for suggestion in suggestions for key in _keys(suggestion.text))
+
+
+class PrefixIndex:
+    """Sorted (key, suggestion) entries with a range-maximum table over their weights"""
+
+    __slots__ = ("entries", "keys", "popularity", "weights", "_table", "built_at")
+
+    def __init__(self, entries: List[Tuple[str, Suggestion]], popularity: Dict[int, int],
+                 keys: Optional[List[str]] = None):
+        import numpy as np
+
+        self.entries = entries
+        self.keys = keys if keys is not None else [key for key, _ in entries]
+        self.popularity = popularity
+        self.built_at = time.monotonic()
+
+        weights = {}
+        for _, suggestion in entries:
+            if suggestion not in weights:
+                weights[suggestion] = 1 + sum(popularity.get(topic_id, 0) for topic_id in suggestion.topic_ids)
+        self.weights = np.fromiter((weights[s] for _, s in entries), dtype=np.float64, count=len(entries))
+
+        # _table[j][i]: position of the heaviest entry in [i, i + 2**j); ties go to the first
+        level = np.arange(len(entries), dtype=np.int64)
+        self._table = [level]
+        span = 1
+        while span * 2 <= len(entries):
+            left, right = level[:-span], level[span:]
+            level = np.where(self.weights[right] > self.weights[left], right, left)
+            self._table.append(level)
+            span *= 2
+
+    def with_popularity(self, popularity: Dict[int, int]) -> "PrefixIndex":
+        return PrefixIndex(self.entries, popularity, self.keys)
+
+    def _heaviest(self, lo: int, hi: int) -> int:
+        level = (hi - lo).bit_length() - 1
+        a, b = self._table[level][lo], self._table[level][hi - (1 << level)]
+        return int(b) if self.weights[b] > self.weights[a] else int(a)
+
+    def _push(self, heap: list, lo: int, hi: int):
+        if lo < hi:
+            position = self._heaviest(lo, hi)
+            heapq.heappush(heap, (-self.weights[position], position, lo, hi))
+
+    def search(self, prefix: str, limit: int = 8) -> List[Suggestion]:
+        """The `limit` heaviest distinct suggestions with a word starting with `prefix`"""
+        prefix = normalize(prefix)
+        if not prefix or limit <= 0:
+            return []
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + "\U0010ffff", lo)
+        heap, found = [], {}
+        self._push(heap, lo, hi)
+        while heap and len(found) < limit:
+            _, position, lo, hi = heapq.heappop(heap)
+            found.setdefault(self.entries[position][1], None)
+            self._push(heap, lo, position)
+            self._push(heap, position + 1, hi)
+        return list(found)
+
+
+def _topic_suggestions(snapshot: catalog.Catalog, topic_ids: Optional[Iterable[int]] = None) -> List[Suggestion]:
+    topics = snapshot.published if topic_ids is None else (
+        snapshot.topics[topic_id] for topic_id in topic_ids
+        if topic_id in snapshot.topics and snapshot.topics[topic_id].is_published
+    )
+    return [Suggestion(topic.title, "topic", topic.slug, (topic.id,)) for topic in topics]
+
+
+def _tag_suggestions(snapshot: catalog.Catalog) -> List[Suggestion]:
+    return [Suggestion(tag, "tag", None, tuple(topic.id for topic in topics))
+            for tag, topics in snapshot.published_by_tag.items()]
+
+
+def _question_suggestions() -> List[Suggestion]:
+    from services.gemini_service import GeminiService
+
+    return [Suggestion(question, "question") for question in GeminiService.COMMON_QUESTIONS]
+
+
+def _popularity() -> Dict[int, int]:
+    from sqlalchemy import func, select
+
+    from database import SessionLocal
+    from models.user_model import UserProgress
+
+    db = SessionLocal()
+    try:
+        return dict(db.execute(
+            select(UserProgress.topic_id, func.count()).group_by(UserProgress.topic_id)
+        ).all())
+    finally:
+        db.close()
+
+
+_index: Optional[PrefixIndex] = None
+_lock = threading.Lock()
+
+
+def reload() -> PrefixIndex:
+    """Build the index from the catalog, the common questions and UserProgress"""
+    global _index
+    with _lock:
+        snapshot = catalog.current()
+        suggestions = _topic_suggestions(snapshot) + _tag_suggestions(snapshot) + _question_suggestions()
+        _index = PrefixIndex(_entries(suggestions), _popularity())
+        return _index
+
+
+def current() -> PrefixIndex:
+    """The current index, with popularity refreshed when stale (loaded on first use)"""
+    global _index
+    index = _index
+    if index is None:
+        return reload()
+    if time.monotonic() - index.built_at > POPULARITY_TTL and _lock.acquire(blocking=False):
+        # One request refreshes; the rest carry on with the previous weights
+        try:
+            if _index is index:
+                _index = index.with_popularity(_popularity())
+        finally:
+            _lock.release()
+    return _index
+
+
+def search(prefix: str, limit: int = 8) -> List[Suggestion]:
+    return current().search(prefix, min(limit, MAX_LIMIT))
+
+
+@content_events.subscribe
+def _on_content_change(events):
+    # Runs after the catalog's subscriber, so catalog.current() already has the change
+    global _index
+    events = [event for event in events if event.entity == "topic" and event.action != "related"]
+    if _index is None or not events:
+        return
+    with _lock:
+        old, snapshot = _index, catalog.current()
+        changed = set()
+        for event in events:
+            if event.id is not None:
+                changed.add(event.id)
+            elif event.slug in snapshot.topics_by_slug:
+                changed.add(snapshot.topics_by_slug[event.slug].id)
+            else:
+                changed = None  # cannot tell which topic: re-derive them all
+                break
+        # Tags are re-derived every time: their topic sets follow the topics
+        kept = [
+            (key, s) for key, s in old.entries
+            if s.kind == "question" or (s.kind == "topic" and changed is not None and s.topic_ids[0] not in changed)
+        ]
+        added = _entries(_topic_suggestions(snapshot, changed) + _tag_suggestions(snapshot))
+        _index = PrefixIndex(list(heapq.merge(kept, added)), old.popularity)
+
+
+lifecycle.on_preload(reload)
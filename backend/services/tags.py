@@ -0,0 +1,135 @@
+"""
+Normalized topic tags and facet counts
+
+LegalTopic.tags keeps the JSON list the API returns. Write paths also call
+`sync_topic_tags()` in the same transaction, which mirrors each topic's
+normalized tags (trimmed, lower-cased, deduplicated) into the `tags` and
+`topic_tags` tables so they can be filtered and counted in SQL. A preload
+hook fills in topics written without it (older databases, bench.datagen).
+
+`facets()` returns topic counts per category, difficulty_level and tag in
+one aggregated query.
+"""
+
+import json
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from database import insert_for
+from models.topic_model import LegalTopic, Tag, TopicTag
+from services import lifecycle
+
+logger = logging.getLogger(__name__)
+
+FACET_FIELDS = ("category", "difficulty_level", "tag")
+
+
+def normalize_tags(values: Iterable[str]) -> List[str]:
+    seen = {}
+    for value in values:
+        name = " ".join(str(value).split()).lower()
+        if name:
+            seen.setdefault(name, None)
+    return list(seen)
+
+
+def parse_tags(raw: Optional[str]) -> List[str]:
+    """Normalized tags from a LegalTopic.tags JSON string (empty if malformed)"""
+    if not raw:
+        return []
+    try:
+        values = json.loads(raw)
+    except json.JSONDecodeError:
+        return []
+    return normalize_tags(values) if isinstance(values, list) else []
+
+
+def _tag_ids(db: Session, names: Iterable[str]) -> Dict[str, int]:
+    names = set(names)
+    if not names:
+        return {}
+    ids = dict(db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names))).all())
+    missing = names - set(ids)
+    if missing:
+        # Another transaction may be adding the same tag: keep its row and read the ids back
+        db.execute(insert_for(db)(Tag).on_conflict_do_nothing(index_elements=[Tag.name]),
+                   [{"name": name} for name in sorted(missing)])
+        ids.update(db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(missing))).all())
+    return ids
+
+
+def sync_topic_tags(db: Session, where) -> int:
+    """Rewrite the tag rows of the topics matching `where` from their JSON tags (caller commits).
+
+    Returns the number of topics synced.
+    """
+    topics = {
+        topic_id: parse_tags(raw)
+        for topic_id, raw in db.execute(select(LegalTopic.id, LegalTopic.tags).where(where))
+    }
+    if not topics:
+        return 0
+    ids = _tag_ids(db, (name for names in topics.values() for name in names))
+    db.execute(delete(TopicTag).where(TopicTag.topic_id.in_(list(topics))))
+    rows = [{"topic_id": topic_id, "tag_id": ids[name]} for topic_id, names in topics.items() for name in names]
+    if rows:
+        db.execute(TopicTag.__table__.insert(), rows)
+    return len(topics)
+
+
+def remove_topic_tags(db: Session, topic_id: int):
+    db.execute(delete(TopicTag).where(TopicTag.topic_id == topic_id))
+
+
+def _published(category: Optional[str], difficulty: Optional[str], tag: Optional[str]):
+    conditions = [LegalTopic.is_published == True]
+    if category:
+        conditions.append(LegalTopic.category == category)
+    if difficulty:
+        conditions.append(LegalTopic.difficulty_level == difficulty)
+    if tag:
+        conditions.append(LegalTopic.id.in_(
+            select(TopicTag.topic_id).join(Tag, Tag.id == TopicTag.tag_id).where(Tag.name.in_(normalize_tags([tag])))
+        ))
+    return conditions
+
+
+def facets(db: Session, category: Optional[str] = None, difficulty: Optional[str] = None,
+           tag: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+    """Published topic counts per category, difficulty_level and tag, within the given filters"""
+    conditions = _published(category, difficulty, tag)
+    count = func.count().label("count")
+    by_category = select(literal("category").label("field"), LegalTopic.category.label("value"), count).where(
+        *conditions).group_by(LegalTopic.category)
+    by_difficulty = select(literal("difficulty_level"), LegalTopic.difficulty_level, count).where(
+        *conditions).group_by(LegalTopic.difficulty_level)
+    by_tag = select(literal("tag"), Tag.name, count).select_from(TopicTag).join(
+        Tag, Tag.id == TopicTag.tag_id).join(LegalTopic, LegalTopic.id == TopicTag.topic_id).where(
+        *conditions).group_by(Tag.name)
+
+    result = {field: {} for field in FACET_FIELDS}
+    rows = db.execute(union_all(by_category, by_difficulty, by_tag)).all()
+    for field, value, n in sorted(rows, key=lambda row: (-row[2], str(row[1]))):
+        if value is not None:
+            result[field][value] = n
+    return result
+
+
+@lifecycle.on_preload
+def migrate_json_tags():
+    """Mirror JSON tags of topics that have no tag rows yet"""
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        untagged = (LegalTopic.tags.isnot(None)) & (LegalTopic.tags.notin_(["", "[]"])) & (
+            LegalTopic.id.notin_(select(TopicTag.topic_id).distinct()))
+        synced = sync_topic_tags(db, untagged)
+        db.commit()
+        if synced:
+            logger.info("Mirrored JSON tags of %d topics into topic_tags", synced)
+    finally:
+        db.close()
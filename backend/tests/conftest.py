@@ -0,0 +1,99 @@
+"""
+Shared fixtures: a throwaway SQLite database seeded with
+data/seed_content.jsonl (as bench.query_budgets does), the app, and users.
+
+Run from the backend directory:
+    python -m pytest -q
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import uuid
+from types import SimpleNamespace
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must be set before `database` is imported anywhere
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='rights360-tests-'), 'test.db')}"
+sys.path.insert(0, BACKEND_DIR)
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    from database import SessionLocal, create_tables
+    from services.content_io import import_file
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        with open(os.path.join(BACKEND_DIR, "data", "seed_content.jsonl"), encoding="utf-8") as f:
+            import_file(db, f)
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def app(database):
+    import main
+
+    return main.app
+
+
+@pytest.fixture
+def client(app):
+    from fastapi.testclient import TestClient
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def make_user():
+    """Create a user; returns an object with .id and Authorization .headers"""
+    from database import SessionLocal
+    from models.user_model import User
+    from routers.auth import create_access_token
+
+    def make(is_admin: bool = False):
+        email = f"user-{uuid.uuid4().hex[:12]}@example.com"
+        db = SessionLocal()
+        try:
+            user = User(name="Test user", email=email, hashed_password="", is_active=True, is_admin=is_admin)
+            db.add(user)
+            db.commit()
+            user_id = user.id
+        finally:
+            db.close()
+        return SimpleNamespace(id=user_id, headers={"Authorization": f"Bearer {create_access_token({'sub': email})}"})
+
+    return make
+
+
+@pytest.fixture
+def concurrently(app):
+    """Send requests at the same time: concurrently([(method, url, kwargs), ...]) -> responses"""
+    import httpx
+
+    async def send(requests):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.request(method, url, **kwargs) for method, url, kwargs in requests))
+
+    return lambda requests: asyncio.run(send(requests))
+
+
+@pytest.fixture
+def first_topic():
+    from database import SessionLocal
+    from models.topic_model import LegalTopic, Quiz
+
+    db = SessionLocal()
+    try:
+        topic = db.query(LegalTopic).filter(LegalTopic.is_published == True).order_by(LegalTopic.id).first()
+        quiz = db.query(Quiz).filter(Quiz.topic_id == topic.id).order_by(Quiz.id).first()
+        return SimpleNamespace(id=topic.id, slug=topic.slug, quiz_id=quiz.id)
+    finally:
+        db.close()
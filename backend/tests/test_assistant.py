@@ -0,0 +1,36 @@
+import pytest
+
+from services.gemini_service import gemini_service
+from services.spelling import build
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("tennant rights", "what are my rights as a tenant"),
+    ("cyber bulling", "what is cyberbullying"),
+    ("what is a contrct", "what is a contract"),
+    ("what are my consumer rigths", "what are my consumer rights"),
+])
+def test_typos_still_find_the_common_question(question, expected):
+    assert gemini_service._check_common_questions(question) == gemini_service.COMMON_QUESTIONS[expected]
+
+
+@pytest.mark.parametrize("question", ["wht", "rigths", "i want to sue my landlord"])
+def test_corrected_fragments_do_not_match_unrelated_answers(question):
+    assert gemini_service._check_common_questions(question) is None
+
+
+def test_correctly_spelled_words_are_not_rewritten():
+    assert gemini_service._get_speller().correct("i want to sue my landlord") == "i want to sue my landlord"
+
+
+def test_known_words_are_kept_but_never_suggested():
+    speller = build(["use the contract"], known=["sue"])
+    assert speller.correct("sue the contrct") == "sue the contract"
+    assert speller.correct("ues") == "use"
+
+
+def test_assistant_endpoint_falls_back_for_unmatched_questions(client, make_user):
+    user = make_user()
+    response = client.post("/api/ai/assistant", json={"message": "wht"}, headers=user.headers)
+    assert response.status_code == 200
+    assert response.json()["response"].startswith("I can help you with these common legal questions")
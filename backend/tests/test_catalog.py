@@ -0,0 +1,54 @@
+import threading
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+from database import SessionLocal
+from services import catalog
+
+
+def test_cold_current_loads_once_for_concurrent_callers():
+    loads = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if "FROM quizzes LEFT OUTER JOIN quiz_stats" in statement:
+            loads.append(statement)
+
+    # Every caller holds a pooled connection, as a request past authentication does
+    callers = 12
+    barrier = threading.Barrier(callers)
+    snapshots, errors = [], []
+
+    def request():
+        db = SessionLocal()
+        try:
+            db.execute(text("SELECT 1"))
+            barrier.wait()
+            snapshots.append(catalog.current())
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            db.close()
+
+    catalog._snapshot = None
+    event.listen(Engine, "before_cursor_execute", count)
+    try:
+        threads = [threading.Thread(target=request) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+    finally:
+        event.remove(Engine, "before_cursor_execute", count)
+
+    assert errors == []
+    assert len(loads) == 1
+    assert len(snapshots) == callers and all(snapshot is snapshots[0] for snapshot in snapshots)
+
+
+def test_reload_replaces_the_snapshot():
+    before = catalog.current()
+    after = catalog.reload()
+    assert after is catalog.current()
+    assert after.version == before.version + 1
+    assert after.topics.keys() == before.topics.keys()
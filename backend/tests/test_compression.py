@@ -0,0 +1,63 @@
+import gzip
+
+import pytest
+
+from services import compression
+from services.cache import get_cache
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip, br", "br"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("br;q=0, gzip;q=0", None),
+    ("*", "br"),
+    ("*;q=0.2, gzip;q=0", "br"),
+    ("deflate, x-unknown", None),
+])
+def test_negotiate_prefers_the_best_accepted_encoding(monkeypatch, header, expected):
+    monkeypatch.setattr(compression, "PREFERENCE", ["br", "gzip"])
+    assert compression.negotiate(header) == expected
+
+
+def test_cached_listing_is_compressed_once_per_encoding(client, monkeypatch):
+    get_cache().delete_prefix("topics:")
+    identity = client.get("/api/legal/topics", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert len(identity.content) >= compression.MIN_SIZE
+    calls = []
+    compress = compression.compress
+    monkeypatch.setattr(compression, "compress", lambda *args: calls.append(args[1]) or compress(*args))
+
+    first = client.get("/api/legal/topics", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/api/legal/topics", headers={"Accept-Encoding": "gzip"})
+
+    for response in (first, second):
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.content == identity.content  # decoded by the client
+    assert calls == ["gzip"]
+    assert gzip.decompress(get_cache().get("topics:list:None:None:None#gzip")) == identity.content
+
+
+def test_brotli_when_installed(client):
+    pytest.importorskip("brotli")
+    response = client.get("/api/legal/topics", headers={"Accept-Encoding": "br"})
+    assert response.headers["content-encoding"] == "br"
+
+
+def test_small_bodies_are_sent_as_is(client):
+    response = client.get("/api/legal/suggest", params={"prefix": "zzzz"}, headers={"Accept-Encoding": "gzip"})
+    assert response.json() == []
+    assert "content-encoding" not in response.headers
+
+
+def test_streamed_exports_are_gzipped_by_the_middleware(client, make_user):
+    admin = make_user(is_admin=True)
+    plain = client.get("/api/admin/content/export", headers={**admin.headers, "Accept-Encoding": "identity"})
+    zipped = client.get("/api/admin/content/export", headers={**admin.headers, "Accept-Encoding": "gzip"})
+    assert "content-encoding" not in plain.headers
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.text == plain.text
@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+import uuid
+
+
+def _upload(client, admin, text, filename="content.jsonl", **params):
+    return client.post("/api/admin/content/import", params=params, headers=admin.headers,
+                       files={"file": (filename, io.BytesIO(text.encode()), "application/octet-stream")})
+
+
+def _export(client, admin, **params):
+    response = client.get("/api/admin/content/export", params=params, headers=admin.headers)
+    assert response.status_code == 200
+    return response.text
+
+
+def test_jsonl_round_trip_and_rejected_records(client, make_user):
+    admin = make_user(is_admin=True)
+    slug = f"io-{uuid.uuid4().hex[:8]}"
+    topic = {"type": "topic", "slug": slug, "title": "Imported topic", "category": "Imports",
+             "content": "Body text", "description": None, "difficulty_level": "advanced",
+             "tags": ["imports", "round trip"], "is_published": True}
+    quiz = {"type": "quiz", "topic_slug": slug, "question": "Does the round trip keep me?",
+            "options": ["Yes", "No", "Maybe"], "correct_answer": 1, "explanation": "It does",
+            "difficulty": "hard"}
+    lines = [
+        json.dumps(topic),
+        json.dumps(quiz),
+        "{not json",
+        json.dumps({"type": "lesson", "slug": "x"}),
+        json.dumps({**quiz, "question": "Bad difficulty?", "difficulty": "brutal"}),
+        json.dumps({**quiz, "question": "Answer out of range?", "correct_answer": 3}),
+        json.dumps({**quiz, "question": "Unknown topic?", "topic_slug": f"{slug}-missing"}),
+    ]
+
+    response = _upload(client, admin, "\n".join(lines), batch_size=3)
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["processed"], report["topics_upserted"], report["quizzes_upserted"]) == (7, 1, 1)
+    assert report["error_count"] == 5
+    assert [error.split(":")[0] for error in report["errors"]] == [f"record {n}" for n in (3, 4, 5, 6, 7)]
+    assert "invalid JSON" in report["errors"][0]
+    assert "unknown record type 'lesson'" in report["errors"][1]
+    assert "unknown topic_slug" in report["errors"][4]
+
+    exported = [json.loads(line) for line in _export(client, admin).splitlines()]
+    assert [record for record in exported if record.get("slug") == slug] == [topic]
+    assert [record for record in exported if record.get("topic_slug") == slug] == [quiz]
+
+
+def _csv_rows(client, admin, slug):
+    rows = csv.DictReader(io.StringIO(_export(client, admin, format="csv", kind="topic"), newline=""))
+    return [row for row in rows if row["slug"] == slug]
+
+
+def test_csv_export_imports_back_unchanged(client, make_user):
+    admin = make_user(is_admin=True)
+    slug = f"io-{uuid.uuid4().hex[:8]}"
+    line = json.dumps({"type": "topic", "slug": slug, "title": "CSV, with comma", "category": "Imports",
+                       "content": "Line one\nLine two", "tags": ["a", "b"], "is_published": False})
+    assert _upload(client, admin, line).json()["error_count"] == 0
+    [before] = _csv_rows(client, admin, slug)
+    upload = io.StringIO()
+    writer = csv.DictWriter(upload, fieldnames=list(before))
+    writer.writeheader()
+    writer.writerow(before)
+
+    response = _upload(client, admin, upload.getvalue(), filename="topics.csv", kind="topic")
+
+    assert response.status_code == 200
+    assert (response.json()["topics_upserted"], response.json()["error_count"]) == (1, 0)
+    assert _csv_rows(client, admin, slug) == [before]
+    assert (before["title"], before["content"]) == ("CSV, with comma", "Line one\nLine two")
+
+
+def test_export_needs_a_kind_for_csv(client, make_user):
+    admin = make_user(is_admin=True)
+    response = client.get("/api/admin/content/export", params={"format": "csv"}, headers=admin.headers)
+    assert response.status_code == 400
@@ -0,0 +1,27 @@
+from sqlalchemy import update
+
+from database import SessionLocal
+from models.topic_model import ContentChange, LegalTopic
+from services import catalog, content_sync
+
+
+def test_catch_up_replays_changes_committed_since_preload(first_topic):
+    catalog.current()
+    content_sync._remember_version()
+    db = SessionLocal()
+    try:
+        # Another process changes a topic; this one never hears about it
+        title = db.get(LegalTopic, first_topic.id).title
+        db.execute(update(LegalTopic).where(LegalTopic.id == first_topic.id).values(title=title + " (revised)"))
+        db.execute(ContentChange.__table__.insert().values(entity="topic", entity_id=first_topic.id))
+        db.commit()
+        assert catalog.current().topics[first_topic.id].title == title
+
+        assert content_sync.catch_up() == 1
+        assert catalog.current().topics[first_topic.id].title == title + " (revised)"
+        assert content_sync.catch_up() == 0  # only once
+    finally:
+        db.execute(update(LegalTopic).where(LegalTopic.id == first_topic.id).values(title=title))
+        db.commit()
+        db.close()
+        catalog.reload()
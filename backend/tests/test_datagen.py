@@ -0,0 +1,69 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _datagen(db_path, *args):
+    # A fresh interpreter: the engine is bound to DATABASE_URL at import time
+    result = subprocess.run(
+        [sys.executable, "-m", "bench.datagen", "--db", str(db_path), "--users", "12", "--topics", "4",
+         "--quizzes-per-topic", "3", "--results", "500", "--progress-per-user", "2", *args],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def _count(conn, sql):
+    return conn.execute(sql).fetchone()[0]
+
+
+def test_generates_consistent_data_and_extends_an_existing_database(tmp_path):
+    db_path = tmp_path / "bench.db"
+
+    first = _datagen(db_path)
+    assert (first["users"], first["topics"], first["quizzes"], first["results"], first["progress"]) == (12, 4, 12, 500, 24)
+    assert first["first_user_id"] == 1 and "derived_s" in first["timings"]
+
+    second = _datagen(db_path, "--no-derived", "--seed", "7")
+    assert (second["first_user_id"], second["first_topic_id"]) == (13, 5)
+    assert "derived_s" not in second["timings"]
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert _count(conn, "SELECT COUNT(*) FROM users WHERE email LIKE 'bench-user-%@example.com'") == 24
+        assert _count(conn, "SELECT COUNT(*) FROM quizzes") == 24
+        assert _count(conn, "SELECT COUNT(*) FROM quiz_results") == 1000
+        # Every result points at a generated user and quiz, and is_correct matches the answer key
+        assert _count(conn, """
+            SELECT COUNT(*) FROM quiz_results r
+            JOIN users u ON u.id = r.user_id
+            JOIN quizzes q ON q.id = r.quiz_id
+            WHERE r.is_correct = (r.selected_answer = q.correct_answer)
+        """) == 1000
+        # No user has two progress rows for the same topic
+        assert _count(conn, "SELECT COUNT(*) FROM (SELECT DISTINCT user_id, topic_id FROM user_progress)") == 48
+        # Derived tables were rebuilt after the first run only
+        assert _count(conn, "SELECT COUNT(*) FROM quiz_stats") == 12
+        assert _count(conn, "SELECT COUNT(*) FROM quiz_review_states WHERE user_id <= 12") > 0
+        assert _count(conn, "SELECT COUNT(*) FROM quiz_review_states WHERE user_id > 12") == 0
+    finally:
+        conn.close()
+
+
+def test_same_seed_generates_the_same_history(tmp_path):
+    query = "SELECT user_id, quiz_id, selected_answer, time_taken FROM quiz_results ORDER BY id"
+    histories = []
+    for name in ("a.db", "b.db"):
+        _datagen(tmp_path / name, "--no-derived")
+        conn = sqlite3.connect(tmp_path / name)
+        try:
+            histories.append(conn.execute(query).fetchall())
+        finally:
+            conn.close()
+
+    assert histories[0] == histories[1]
@@ -0,0 +1,106 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from database import SessionLocal
+from models.quiz_model import ExamSession
+from models.topic_model import QuizResult
+from services import exams
+
+
+def _topic_with_quizzes(client, admin, count=3):
+    topic_id = client.post("/api/admin/topics", headers=admin.headers, json={
+        "slug": f"exam-{uuid.uuid4().hex[:8]}", "title": "Exam topic", "category": "general", "content": "Text",
+        "difficulty_level": "beginner", "tags": [], "is_published": True,
+    }).json()["id"]
+    correct = {}
+    for n in range(count):
+        options = [f"Q{n} option {letter}" for letter in "ABCD"]
+        quiz_id = client.post("/api/admin/quizzes", headers=admin.headers, json={
+            "topic_id": topic_id, "question": f"Exam question {n}?", "options": options,
+            "correct_answer": n, "difficulty": "easy",
+        }).json()["id"]
+        correct[quiz_id] = options[n]
+    return topic_id, correct
+
+
+def _start(client, user, topic_id, **fields):
+    response = client.post("/api/exams", json={"question_count": 10, "topic_ids": [topic_id], **fields},
+                           headers=user.headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def _expire(exam_id, ago):
+    db = SessionLocal()
+    try:
+        db.query(ExamSession).filter(ExamSession.id == exam_id).update(
+            {ExamSession.expires_at: datetime.now(timezone.utc) - ago})
+        db.commit()
+    finally:
+        db.close()
+    exams.decks.clear()  # the next request reloads the deck with its new deadline
+
+
+def test_finish_grades_answers_through_the_shown_option_order(client, make_user):
+    admin, user = make_user(is_admin=True), make_user()
+    topic_id, correct = _topic_with_quizzes(client, admin)
+    exam = _start(client, user, topic_id)
+    assert exam["total_questions"] == 3
+    questions = client.get(f"/api/exams/{exam['id']}", headers=user.headers).json()["questions"]
+    assert {question["quiz_id"] for question in questions} == set(correct)
+
+    right = {q["quiz_id"]: q["options"].index(correct[q["quiz_id"]]) for q in questions}
+    wrong_quiz = questions[0]["quiz_id"]
+    answers = [{"quiz_id": quiz_id, "selected_answer": (shown + 1) % 4 if quiz_id == wrong_quiz else shown}
+               for quiz_id, shown in right.items()]
+    response = client.post(f"/api/exams/{exam['id']}/finish", json={"answers": answers}, headers=user.headers)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["score"], result["answered"], result["total_questions"]) == (2, 3, 3)
+    for item in result["results"]:
+        assert item["is_correct"] == (item["quiz_id"] != wrong_quiz)
+        assert item["correct_answer"] == right[item["quiz_id"]]
+    db = SessionLocal()
+    try:
+        stored = db.query(QuizResult).filter(QuizResult.user_id == user.id).all()
+        # Results hold the quiz's own option index, not the shuffled one
+        assert sorted((r.quiz_id, r.is_correct) for r in stored) == sorted(
+            (quiz_id, quiz_id != wrong_quiz) for quiz_id in correct)
+    finally:
+        db.close()
+    # An exam is graded once
+    again = client.post(f"/api/exams/{exam['id']}/finish", json={"answers": answers}, headers=user.headers)
+    assert again.status_code == 409
+
+
+def test_expired_exams_refuse_pages_and_answers(client, make_user):
+    admin, user = make_user(is_admin=True), make_user()
+    topic_id, _ = _topic_with_quizzes(client, admin, count=1)
+    exam = _start(client, user, topic_id)
+
+    _expire(exam["id"], exams.FINISH_GRACE + timedelta(seconds=5))
+
+    assert client.get(f"/api/exams/{exam['id']}", headers=user.headers).status_code == 409
+    response = client.post(f"/api/exams/{exam['id']}/finish", json={"answers": []}, headers=user.headers)
+    assert response.status_code == 409
+
+
+def test_answers_sent_within_the_grace_period_count(client, make_user):
+    admin, user = make_user(is_admin=True), make_user()
+    topic_id, _ = _topic_with_quizzes(client, admin, count=1)
+    exam = _start(client, user, topic_id)
+
+    _expire(exam["id"], timedelta(seconds=5))
+
+    response = client.post(f"/api/exams/{exam['id']}/finish", json={"answers": []}, headers=user.headers)
+    assert response.status_code == 200
+    assert (response.json()["answered"], response.json()["score"]) == (0, 0)
+
+
+def test_exams_are_private_to_their_user(client, make_user):
+    admin, user, other = make_user(is_admin=True), make_user(), make_user()
+    topic_id, _ = _topic_with_quizzes(client, admin, count=1)
+    exam = _start(client, user, topic_id)
+
+    assert client.get(f"/api/exams/{exam['id']}", headers=other.headers).status_code == 404
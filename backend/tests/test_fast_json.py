@@ -0,0 +1,67 @@
+import json
+from datetime import date, datetime, timezone
+
+import pytest
+from pydantic import TypeAdapter
+
+from routers.quizzes import QuizResponse
+from services import fast_json
+
+CONTENT = {
+    "title": "Droits du consommateur – ₹ refunds",
+    "created_at": datetime(2024, 5, 1, 9, 30, 15, 250000, tzinfo=timezone.utc),
+    "updated_at": datetime(2024, 5, 1, 9, 30),
+    "due": date(2024, 6, 1),
+    "counts": {1: 3, 2: 0},
+    "options": ("a", "b"),
+    "score": 0.75,
+    "missing": None,
+}
+
+
+def test_stdlib_fallback_matches_orjson(monkeypatch):
+    pytest.importorskip("orjson")
+    encoded = fast_json.dumps(CONTENT)
+
+    monkeypatch.setattr(fast_json, "orjson", None)
+    fallback = fast_json.dumps(CONTENT)
+
+    assert json.loads(fallback) == json.loads(encoded)
+    assert json.loads(fallback)["created_at"] == "2024-05-01T09:30:15.250000+00:00"
+    assert json.loads(fallback)["counts"] == {"1": 3, "2": 0}
+    # Non-ASCII text is written as UTF-8, not escaped
+    assert "₹".encode("utf-8") in fallback
+
+
+def test_stdlib_fallback_rejects_unknown_types(monkeypatch):
+    monkeypatch.setattr(fast_json, "orjson", None)
+
+    with pytest.raises(TypeError, match="set"):
+        fast_json.dumps({"tags": {"a"}})
+
+
+def test_rows_to_dicts_applies_the_transform():
+    rows = [(1, "a"), (2, "b")]
+
+    assert fast_json.rows_to_dicts(("id", "slug"), rows) == [{"id": 1, "slug": "a"}, {"id": 2, "slug": "b"}]
+    assert fast_json.rows_to_dicts(("id", "slug"), rows, lambda item: {**item, "slug": item["slug"].upper()}) == [
+        {"id": 1, "slug": "A"}, {"id": 2, "slug": "B"}
+    ]
+
+
+def test_encoded_endpoints_match_their_response_models(client, make_user, first_topic):
+    user = make_user()
+    assert client.post("/api/quiz/submit", json={"quiz_id": first_topic.quiz_id, "selected_answer": 0,
+                                                "time_taken": 12}, headers=user.headers).status_code == 200
+
+    response = client.get(f"/api/quiz/topic/{first_topic.id}", headers=user.headers)
+    assert response.headers["content-type"] == "application/json"
+    quizzes = TypeAdapter(list[QuizResponse]).validate_python(response.json())
+    assert first_topic.quiz_id in {quiz.id for quiz in quizzes}
+
+    response = client.get("/api/quiz/results", headers=user.headers)
+    assert response.headers["content-type"] == "application/json"
+    [result] = response.json()
+    assert (result["quiz_id"], result["selected_answer"], result["time_taken"]) == (first_topic.quiz_id, 0, 12)
+    assert isinstance(result["is_correct"], bool)
+    datetime.fromisoformat(result["created_at"])
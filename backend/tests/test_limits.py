@@ -0,0 +1,65 @@
+import asyncio
+
+import httpx
+from fastapi import Depends, FastAPI
+
+from services import limits
+from services.limits import Bulkhead, MemoryRateStore
+
+
+def test_ai_requests_past_the_burst_get_429(client, make_user):
+    user, other = make_user(), make_user()
+
+    # The AI router allows bursts of 10 per user
+    statuses = [client.post("/api/ai/assistant", json={"message": "what is a contract"}, headers=user.headers)
+                for _ in range(11)]
+
+    assert [response.status_code for response in statuses] == [200] * 10 + [429]
+    assert int(statuses[-1].headers["retry-after"]) >= 1
+    # Buckets are per user
+    assert client.post("/api/ai/assistant", json={"message": "hi"}, headers=other.headers).status_code == 200
+
+
+def test_token_bucket_refills_over_time(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(limits.time, "monotonic", lambda: now[0])
+    store = MemoryRateStore()
+
+    assert [store.take("k", rate=1.0, burst=2)[0] for _ in range(3)] == [True, True, False]
+    assert store.take("k", rate=1.0, burst=2) == (False, 1.0)
+    now[0] += 1.5
+    assert store.take("k", rate=1.0, burst=2)[0] is True
+    assert store.take("k", rate=1.0, burst=2)[0] is False
+
+
+def test_bulkhead_rejects_requests_over_its_limit_until_one_finishes():
+    bulkhead = Bulkhead("test", 1)
+    app = FastAPI(dependencies=[Depends(bulkhead)])
+    started, release = asyncio.Event(), asyncio.Event()
+
+    @app.get("/slow")
+    async def slow():
+        started.set()
+        await release.wait()
+        return {"ok": True}
+
+    @app.get("/fast")
+    async def fast():
+        return {"ok": True}
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            slow_request = asyncio.ensure_future(client.get("/slow"))
+            await started.wait()
+            rejected = await client.get("/fast")
+            release.set()
+            held = await slow_request
+            return rejected, held, await client.get("/fast")
+
+    rejected, held, after = asyncio.run(scenario())
+
+    assert rejected.status_code == 429
+    assert rejected.headers["retry-after"] == "1"
+    assert held.status_code == 200
+    assert after.status_code == 200
+    assert bulkhead.active == 0
@@ -0,0 +1,54 @@
+import re
+
+from services import metrics
+
+
+def _samples(text):
+    """{(metric name, frozenset of labels): value}"""
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith("#"):
+            continue
+        match = re.fullmatch(r"(\w+)\{(.*)\} (\S+)", line)
+        assert match, line
+        labels = frozenset(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', match.group(2)))
+        samples[(match.group(1), labels)] = float(match.group(3))
+    return samples
+
+
+def _get(samples, name, **labels):
+    wanted = set(labels.items())
+    return [value for (metric, have), value in samples.items()
+            if metric == name and wanted <= {(k, v) for k, v in have}]
+
+
+def test_requests_are_counted_per_route_template(client, make_user):
+    user = make_user()
+    metrics.reset()
+    client.get("/api/legal/topics")
+    client.get("/api/legal/topics")
+    client.get("/api/legal/topics/no-such-topic", headers=user.headers)
+    client.get("/api/legal/topics/another-missing-topic", headers=user.headers)
+    client.get("/no/such/route")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = _samples(response.text)
+    total = "rights360_http_requests_total"
+    assert _get(samples, total, method="GET", route="/api/legal/topics", status="200") == [2]
+    assert _get(samples, total, method="GET", route="/api/legal/topics/{slug}", status="404") == [2]
+    assert _get(samples, total, route=metrics.UNMATCHED_ROUTE, status="404") == [1]
+    assert not [key for key in samples if ("route", "/api/legal/topics/no-such-topic") in key[1]]
+
+    histogram = "rights360_http_request_duration_seconds"
+    buckets = [
+        (labels, value) for (metric, labels), value in samples.items()
+        if metric == f"{histogram}_bucket" and ("route", "/api/legal/topics") in labels
+    ]
+    counts = [value for labels, value in sorted(
+        buckets, key=lambda item: float(dict(item[0])["le"].replace("+Inf", "inf")))]
+    assert counts == sorted(counts) and counts[-1] == 2
+    assert _get(samples, f"{histogram}_count", route="/api/legal/topics") == [2]
+    assert _get(samples, "rights360_http_requests_in_flight", group="/api/legal") == [0]
@@ -0,0 +1,63 @@
+import json
+import os
+import subprocess
+import sys
+
+from bench import micro
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_every_benchmark_sets_up_and_runs():
+    # Catches benchmarks left pointing at renamed or removed code
+    for setup in micro.BENCHMARKS.values():
+        setup()()
+
+
+def test_measure_calibrates_the_loop_count():
+    calls = []
+
+    result = micro.measure(lambda: calls.append(1), repeats=3, min_time=0.001)
+
+    assert result["loops"] > 1
+    assert len(calls) >= 3 * result["loops"]
+    assert 0 < result["min_us"] <= result["median_us"]
+
+
+def test_compare_flags_only_slowdowns_past_the_threshold():
+    results = {"a": {"median_us": 11.5}, "b": {"median_us": 10.5}, "c": {"median_us": 5.0}, "new": {"median_us": 1.0}}
+    baseline = {"a": {"median_us": 10.0}, "b": {"median_us": 10.0}, "c": {"median_us": 10.0}}
+
+    rows, regressed = micro.compare(results, baseline, threshold=10.0)
+
+    assert regressed == ["a"]
+    assert {row["name"]: row["change_pct"] for row in rows} == {"a": 15.0, "b": 5.0, "c": -50.0, "new": None}
+
+
+def _micro(*args):
+    return subprocess.run([sys.executable, "-m", "bench.micro", *args, "-k", "compression.negotiate",
+                           "--repeats", "2", "--min-time", "0.001"],
+                          cwd=BACKEND_DIR, capture_output=True, text=True)
+
+
+def test_save_then_compare_against_the_baseline(tmp_path):
+    baseline = tmp_path / "baselines" / "micro.json"
+
+    assert _micro("compare", "--baseline", str(baseline)).returncode != 0
+
+    saved = _micro("save", "--baseline", str(baseline))
+    assert saved.returncode == 0, saved.stderr
+    assert list(json.loads(baseline.read_text())["results"]) == ["compression.negotiate"]
+
+    # Generous threshold: only the plumbing is under test, not the timing
+    compared = _micro("compare", "--baseline", str(baseline), "--threshold", "1000")
+    assert compared.returncode == 0, compared.stderr
+    assert "compression.negotiate" in compared.stdout
+
+    # An impossibly fast baseline makes compare fail
+    data = json.loads(baseline.read_text())
+    data["results"]["compression.negotiate"]["median_us"] = 1e-6
+    baseline.write_text(json.dumps(data))
+    regressed = _micro("compare", "--baseline", str(baseline))
+    assert regressed.returncode != 0
+    assert "REGRESSION" in regressed.stdout
@@ -0,0 +1,20 @@
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_one_model_module_configures_its_relationships():
+    # A fresh interpreter: the test session has imported every model already
+    script = (
+        "import sys\n"
+        "from models import Quiz\n"
+        "assert sorted(m for m in sys.modules if m.startswith('models.')) == ['models.topic_model']\n"
+        "from sqlalchemy.orm import configure_mappers\n"
+        "configure_mappers()\n"
+        "print(Quiz.quiz_results.property.mapper.class_.user.property.mapper.class_.__name__)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=BACKEND_DIR, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "User"
@@ -0,0 +1,67 @@
+import io
+import json
+import time
+import uuid
+
+from database import SessionLocal
+from models.topic_model import LegalTopic
+from services import catalog, content_events, overload
+from services.content_events import ContentEvent
+
+
+def _import(client, admin, topics: int):
+    records = "\n".join(json.dumps({
+        "type": "topic", "slug": f"bulk-import-{n}", "title": f"Bulk import {n}", "category": "Bulk",
+        "content": "Body", "description": "Imported", "difficulty_level": "beginner", "tags": ["bulk"],
+        "is_published": False,
+    }) for n in range(topics))
+    return client.post("/api/admin/content/import?batch_size=50", headers=admin.headers,
+                       files={"file": ("content.jsonl", io.BytesIO(records.encode()), "application/x-ndjson")})
+
+
+def test_admin_imports_have_no_deadline(client, make_user, monkeypatch):
+    # Anything falling back to the default rule would run out of time at once
+    monkeypatch.setattr(overload, "DEFAULT_RULE", (overload.NORMAL, 0.000001, 500))
+    admin = make_user(is_admin=True)
+
+    response = _import(client, admin, 500)
+
+    assert response.status_code == 200, response.text
+    assert response.json()["topics_upserted"] == 500
+    assert response.json()["error_count"] == 0
+
+
+def test_admin_writes_get_a_long_deadline():
+    middleware = overload.LoadSheddingMiddleware(app=None)
+    for method, path in [("POST", "/api/admin/content/import"), ("POST", "/api/admin/batch")]:
+        assert middleware.classify(method, path)[1] is None
+    for method, path in [("POST", "/api/admin/topics"), ("PATCH", "/api/admin/quizzes/3"),
+                         ("DELETE", "/api/admin/topics/3")]:
+        assert middleware.classify(method, path)[1] >= 30.0
+
+
+def test_content_subscribers_do_not_inherit_the_request_deadline(client, make_user):
+    catalog.current()
+    admin = make_user(is_admin=True)
+    slug = f"deadline-{uuid.uuid4().hex[:8]}"
+    response = client.post("/api/admin/topics", headers=admin.headers, json={
+        "slug": slug, "title": "Before", "category": "general", "content": "Text",
+        "difficulty_level": "beginner", "tags": [], "is_published": True,
+    })
+    topic_id = response.json()["id"]
+    db = SessionLocal()
+    try:
+        db.query(LegalTopic).filter(LegalTopic.id == topic_id).update({LegalTopic.title: "After"})
+        db.commit()
+    finally:
+        db.close()
+
+    assert catalog.current().topics[topic_id].title == "Before"
+    # The writer's deadline passed between its commit and the catalog reload
+    token = overload._deadline.set(time.monotonic() - 1)
+    try:
+        content_events.publish([ContentEvent("topic", "updated", id=topic_id, slug=slug)])
+    finally:
+        overload._deadline.reset(token)
+
+    assert catalog.current().topics[topic_id].title == "After"
@@ -0,0 +1,81 @@
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from services import profiler
+from services.profiler import Profile, ProfilerMiddleware, ProfileStore
+
+
+def _app(monkeypatch, **settings):
+    monkeypatch.setattr(profiler, "store", ProfileStore(10))
+    app = FastAPI()
+    app.add_middleware(ProfilerMiddleware, interval_ms=1, **settings)
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/busy")
+    def busy():
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_one_in_sample_rate_requests_is_kept(monkeypatch):
+    client = _app(monkeypatch, sample_rate=3, slow_ms=10_000)
+
+    for item_id in range(6):
+        assert client.get(f"/items/{item_id}").status_code == 200
+    assert client.get("/missing").status_code == 404
+
+    kept = profiler.store.list()
+    assert [profile.path for profile in kept] == ["/items/5", "/items/2"]
+    assert {profile.route for profile in kept} == {"/items/{item_id}"}
+    assert {profile.reason for profile in kept} == {"sampled"}
+
+
+def test_slow_requests_are_kept_with_their_stacks(monkeypatch):
+    client = _app(monkeypatch, sample_rate=0, slow_ms=20)
+
+    client.get("/items/1")
+    client.get("/busy")
+
+    [profile] = profiler.store.list()
+    assert (profile.path, profile.reason, profile.status) == ("/busy", "slow", 200)
+    assert profile.duration_ms >= 20
+    assert profile.samples > 0
+    assert "test_profiler.py:busy" in profile.collapsed()
+    assert profiler.store.get(profile.id) is profile
+    assert profiler.store.get(profile.id + 1) is None
+
+
+def test_store_keeps_only_the_newest_profiles():
+    store = ProfileStore(2)
+    for profile_id in range(1, 4):
+        store.add(Profile(profile_id, "GET", "/"))
+
+    assert [profile.id for profile in store.list()] == [3, 2]
+    assert store.get(1) is None
+
+
+def test_admin_lists_and_downloads_profiles(client, make_user, monkeypatch):
+    admin, user = make_user(is_admin=True), make_user()
+    monkeypatch.setattr(profiler, "store", ProfileStore(10))
+    profile = Profile(7, "GET", "/api/legal/topics")
+    profile.stacks.update({"main.py:run;routers.py:list_topics": 3, "main.py:run": 1})
+    profiler.store.add(profile)
+
+    assert client.get("/api/admin/profiles", headers=user.headers).status_code == 403
+    listing = client.get("/api/admin/profiles", headers=admin.headers).json()
+    assert listing["enabled"] is profiler.enabled()
+    assert [summary["id"] for summary in listing["profiles"]] == [7]
+
+    response = client.get("/api/admin/profiles/7", headers=admin.headers)
+    assert response.text == "main.py:run;routers.py:list_topics 3\nmain.py:run 1\n"
+    assert "profile-7.folded" in response.headers["content-disposition"]
+    assert client.get("/api/admin/profiles/8", headers=admin.headers).status_code == 404
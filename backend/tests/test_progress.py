@@ -0,0 +1,84 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+
+from database import SessionLocal, engine
+from models.user_model import UserProgress
+from services import progress
+
+
+def _rows(user_id, topic_id):
+    db = SessionLocal()
+    try:
+        return db.query(UserProgress).filter(
+            UserProgress.user_id == user_id, UserProgress.topic_id == topic_id).all()
+    finally:
+        db.close()
+
+
+def test_first_views_at_once_create_one_row(make_user, first_topic, concurrently):
+    user = make_user()
+
+    responses = concurrently([
+        ("GET", f"/api/legal/topics/{first_topic.slug}", {"headers": user.headers}) for _ in range(8)
+    ])
+
+    assert [response.status_code for response in responses] == [200] * 8
+    rows = _rows(user.id, first_topic.id)
+    assert len(rows) == 1
+    assert (rows[0].progress_percentage, rows[0].completed) == (0, False)
+
+
+def test_opening_a_topic_keeps_buffered_and_completed_progress(make_user, first_topic, client):
+    user = make_user()
+    progress.buffer.add(user.id, {first_topic.id: progress.entry(100, True)})
+
+    response = client.get(f"/api/legal/topics/{first_topic.slug}", headers=user.headers)
+
+    assert response.status_code == 200
+    assert progress.buffer.pending(user.id) == {}
+    [row] = _rows(user.id, first_topic.id)
+    assert (row.progress_percentage, row.completed) == (100, True)
+
+
+def test_single_update_returns_progress_merged_with_the_stored_row(make_user, first_topic, client):
+    user = make_user()
+    url = f"/api/legal/topics/{first_topic.id}/progress"
+    client.post(url, json={"progress_percentage": 80, "completed": True}, headers=user.headers)
+    progress.buffer.flush()
+
+    response = client.post(url, json={"progress_percentage": 40}, headers=user.headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    # Monotonic: the lower percentage is ignored, the latest update decides completed
+    assert (body["progress_percentage"], body["completed"]) == (80, False)
+
+
+def test_a_failing_row_is_retried_alone_then_dropped(make_user, first_topic, caplog):
+    good, bad = make_user(), make_user()
+
+    bad_timestamp = datetime(2001, 2, 3, tzinfo=timezone.utc)
+
+    def reject_bad_user(conn, cursor, statement, parameters, context, executemany):
+        # The bad user's row is the one carrying bad_timestamp
+        rows = parameters if executemany else [parameters]
+        if statement.startswith("INSERT INTO user_progress") and any(
+                "2001-02-03" in str(value) for row in rows for value in row):
+            raise RuntimeError("rejected row")
+
+    buffer = progress.ProgressBuffer(interval=3600, max_attempts=2)
+    buffer.add(good.id, {first_topic.id: progress.entry(30, False)})
+    buffer.add(bad.id, {first_topic.id: progress.entry(30, False, bad_timestamp)})
+    event.listen(engine, "before_cursor_execute", reject_bad_user)
+    try:
+        assert buffer.flush() == 1
+        assert list(buffer.pending(bad.id)) == [first_topic.id]
+        assert buffer.flush() == 0
+    finally:
+        event.remove(engine, "before_cursor_execute", reject_bad_user)
+
+    assert buffer.pending(bad.id) == {}
+    assert "Dropping buffered progress of user %d" % bad.id in caplog.text
+    assert [row.progress_percentage for row in _rows(good.id, first_topic.id)] == [30]
+    assert _rows(bad.id, first_topic.id) == []
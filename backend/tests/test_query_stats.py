@@ -0,0 +1,64 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from database import SessionLocal
+from models.topic_model import LegalTopic
+from services import query_stats
+from services.query_stats import QueryBudgetExceeded, QueryStatsMiddleware, query_budget, track
+
+
+def test_track_counts_statements_and_rows():
+    db = SessionLocal()
+    try:
+        topics = db.query(LegalTopic).count()
+        with track() as stats:
+            db.query(LegalTopic).all()
+            db.execute(text("SELECT 1")).all()
+        assert (stats.queries, stats.rows) == (2, topics + 1)
+        assert stats.db_time > 0
+        db.execute(text("SELECT 1"))
+        assert stats.queries == 2  # nothing counted outside the block
+    finally:
+        db.close()
+
+
+def test_query_budget_fails_with_the_repeated_statements():
+    db = SessionLocal()
+    try:
+        with query_budget(3, label="one statement"):
+            db.execute(text("SELECT 1")).all()
+        with pytest.raises(QueryBudgetExceeded, match=r"loop: 4 queries, budget is 3\n  4x SELECT 2"):
+            with query_budget(3, label="loop"):
+                for _ in range(4):
+                    db.execute(text("SELECT 2")).all()
+        with pytest.raises(QueryBudgetExceeded, match="rows, budget is 0"):
+            with query_budget(5, max_rows=0):
+                db.execute(text("SELECT 3")).all()
+    finally:
+        db.close()
+
+
+def test_middleware_reports_headers_and_logs_n_plus_one(caplog):
+    app = FastAPI()
+
+    @app.get("/loop")
+    def loop():
+        db = SessionLocal()
+        try:
+            for n in range(query_stats.N_PLUS_ONE_THRESHOLD):
+                db.execute(text("SELECT :n"), {"n": n}).all()
+        finally:
+            db.close()
+        return {}
+
+    app.add_middleware(QueryStatsMiddleware, debug=True)
+    response = TestClient(app).get("/loop")
+
+    assert response.headers["x-db-queries"] == str(query_stats.N_PLUS_ONE_THRESHOLD)
+    assert response.headers["x-db-rows"] == str(query_stats.N_PLUS_ONE_THRESHOLD)
+    query_stats.assert_query_budget(response, query_stats.N_PLUS_ONE_THRESHOLD)
+    with pytest.raises(QueryBudgetExceeded):
+        query_stats.assert_query_budget(response, 1)
+    assert "Possible N+1 in GET /loop" in caplog.text
@@ -0,0 +1,137 @@
+import json
+
+from database import SessionLocal
+from models.quiz_model import QuizStats, TopicStats
+from models.topic_model import Quiz
+from services import content_events
+from services.content_events import ContentEvent
+from services.quiz_stats import rebuild_quiz_stats, relabel, relabel_quizzes
+
+
+def _fresh_quiz():
+    """A quiz with no statistics yet"""
+    db = SessionLocal()
+    try:
+        quiz = db.query(Quiz).order_by(Quiz.id.desc()).first()
+        db.query(QuizStats).filter(QuizStats.quiz_id == quiz.id).delete()
+        db.commit()
+        return quiz.id, quiz.topic_id, quiz.correct_answer
+    finally:
+        db.close()
+
+
+def test_concurrent_first_submits_count_every_attempt(make_user, concurrently):
+    quiz_id, topic_id, correct_answer = _fresh_quiz()
+    db = SessionLocal()
+    topic_attempts = getattr(db.get(TopicStats, topic_id), "attempts", 0)
+    db.close()
+    users = [make_user() for _ in range(12)]
+
+    responses = concurrently([
+        ("POST", "/api/quiz/submit",
+         {"json": {"quiz_id": quiz_id, "selected_answer": correct_answer, "time_taken": 7}, "headers": user.headers})
+        for user in users
+    ])
+
+    assert [response.status_code for response in responses] == [200] * len(users)
+    db = SessionLocal()
+    try:
+        stats = db.get(QuizStats, quiz_id)
+        assert stats.attempts == len(users)
+        assert stats.correct_count == len(users)
+        assert sum(json.loads(stats.answer_histogram)) == len(users)
+        assert sum(json.loads(stats.time_histogram)) == len(users)
+        assert db.get(TopicStats, topic_id).attempts == topic_attempts + len(users)
+    finally:
+        db.close()
+
+
+def test_labels_hold_while_the_rate_stays_near_a_cutoff():
+    assert relabel(None, 100, 80) == "easy"
+    assert relabel("medium", 100, 80) == "medium"
+    assert relabel("medium", 100, 84) == "medium"
+    assert relabel("medium", 100, 86) == "easy"
+    assert relabel("medium", 100, 46) == "medium"
+    assert relabel("medium", 100, 44) == "hard"
+    assert relabel("easy", 10, 1) is None  # too few attempts to trust
+
+
+def _set_stats(quiz_id, topic_id, **values):
+    db = SessionLocal()
+    try:
+        db.query(QuizStats).filter(QuizStats.quiz_id == quiz_id).delete()
+        db.add(QuizStats(quiz_id=quiz_id, topic_id=topic_id, **values))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _relabel():
+    events = []
+    content_events.subscribe(events.extend)
+    db = SessionLocal()
+    try:
+        changed = relabel_quizzes(db)
+    finally:
+        db.close()
+        content_events.unsubscribe(events.extend)
+    return changed, events
+
+
+def test_submits_do_not_relabel_quizzes(make_user, client):
+    quiz_id, topic_id, correct_answer = _fresh_quiz()
+    _set_stats(quiz_id, topic_id, attempts=100, correct_count=50, observed_difficulty="medium",
+               labelled_attempts=100)
+    user = make_user()
+    events = []
+    content_events.subscribe(events.extend)
+    try:
+        response = client.post("/api/quiz/submit", json={"quiz_id": quiz_id, "selected_answer": correct_answer + 1},
+                               headers=user.headers)
+    finally:
+        content_events.unsubscribe(events.extend)
+
+    assert response.status_code == 200
+    assert events == []
+    db = SessionLocal()
+    try:
+        assert db.get(QuizStats, quiz_id).observed_difficulty == "medium"  # 50/101 would be "hard"
+    finally:
+        db.close()
+
+
+def test_relabelling_waits_for_new_attempts_and_emits_keyed_events():
+    quiz_id, topic_id, _ = _fresh_quiz()
+    _set_stats(quiz_id, topic_id, attempts=110, correct_count=40, observed_difficulty="medium",
+               labelled_attempts=100)
+    assert _relabel() == (0, [])  # 10 new attempts: not reconsidered yet
+
+    _set_stats(quiz_id, topic_id, attempts=120, correct_count=40, observed_difficulty="medium",
+               labelled_attempts=100)
+    changed, events = _relabel()
+
+    assert changed == 1
+    assert events == [ContentEvent("quiz", "updated", id=quiz_id, topic_id=topic_id)]
+    db = SessionLocal()
+    try:
+        stats = db.get(QuizStats, quiz_id)
+        assert (stats.observed_difficulty, stats.labelled_attempts) == ("hard", 120)
+    finally:
+        db.close()
+
+
+def test_rebuild_emits_events_per_relabelled_quiz():
+    quiz_id, topic_id, _ = _fresh_quiz()
+    _set_stats(quiz_id, topic_id, attempts=100, correct_count=90, observed_difficulty="easy",
+               labelled_attempts=100)
+    events = []
+    content_events.subscribe(events.extend)
+    db = SessionLocal()
+    try:
+        rebuild_quiz_stats(db)
+    finally:
+        db.close()
+        content_events.unsubscribe(events.extend)
+
+    assert events and all(event.id is not None for event in events)
+    assert ContentEvent("quiz", "updated", id=quiz_id, topic_id=topic_id) in events
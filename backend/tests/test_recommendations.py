@@ -0,0 +1,49 @@
+import json
+import uuid
+
+from database import SessionLocal
+from models.user_model import UserRecommendations
+from services import progress
+
+
+def _recommend(user, topic_ids):
+    db = SessionLocal()
+    try:
+        db.merge(UserRecommendations(user_id=user.id, topic_ids=json.dumps(topic_ids)))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _recommended(client, user):
+    response = client.get("/api/me/recommendations", headers=user.headers)
+    assert response.status_code == 200
+    return [topic["id"] for topic in response.json()]
+
+
+def test_topics_without_a_description_are_recommended(make_user, client):
+    user, admin = make_user(), make_user(is_admin=True)
+    created = client.post("/api/admin/topics", headers=admin.headers, json={
+        "slug": f"no-description-{uuid.uuid4().hex[:8]}", "title": "No description", "category": "general",
+        "content": "Text", "description": None, "difficulty_level": "beginner", "tags": [], "is_published": True,
+    })
+    assert created.status_code == 201
+    _recommend(user, [created.json()["id"]])
+
+    response = client.get("/api/me/recommendations", headers=user.headers)
+
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == created.json()["id"]
+    assert response.json()[0]["description"] is None
+
+
+def test_topics_completed_but_not_yet_written_are_skipped(make_user, client, first_topic):
+    user = make_user()
+    _recommend(user, [first_topic.id])
+    assert _recommended(client, user) == [first_topic.id]
+
+    progress.buffer.add(user.id, {first_topic.id: progress.entry(100, True)})
+    try:
+        assert first_topic.id not in _recommended(client, user)
+    finally:
+        progress.buffer.take(user.id)
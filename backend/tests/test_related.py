@@ -0,0 +1,52 @@
+from database import SessionLocal
+from models.topic_model import LegalTopic, RelatedTopic
+from services import content_events
+from services.content_events import ContentEvent
+from services.content_sync import current_version
+from services.related import rebuild_related
+
+
+def _related(client, slug):
+    response = client.get(f"/api/legal/topics/{slug}/related")
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_rebuilt_lists_are_served_at_once(client, first_topic):
+    db = SessionLocal()
+    try:
+        db.query(RelatedTopic).delete()
+        db.commit()
+        assert _related(client, first_topic.slug) == []  # now cached
+        version = current_version(db)
+
+        rebuild_related(db)
+
+        stored = db.query(RelatedTopic).filter(RelatedTopic.topic_id == first_topic.id).count()
+        assert stored > 0
+        # Neighbour lists are not synced content
+        assert current_version(db) == version
+    finally:
+        db.close()
+    assert len(_related(client, first_topic.slug)) == stored
+
+
+def test_related_topics_without_a_description(client, first_topic):
+    db = SessionLocal()
+    try:
+        rebuild_related(db)
+        neighbour = db.get(LegalTopic, db.query(RelatedTopic.related_topic_id).filter(
+            RelatedTopic.topic_id == first_topic.id).order_by(RelatedTopic.rank).first()[0])
+        description, neighbour_slug = neighbour.description, neighbour.slug
+        neighbour.description = None
+        content_events.record(db, ContentEvent("topic", "updated", id=neighbour.id))
+        db.commit()
+        try:
+            related = _related(client, first_topic.slug)
+        finally:
+            neighbour.description = description
+            content_events.record(db, ContentEvent("topic", "updated", id=neighbour.id))
+            db.commit()
+    finally:
+        db.close()
+    assert [topic["description"] for topic in related if topic["slug"] == neighbour_slug] == [None]
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from services.single_flight import SingleFlight
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_concurrent_callers_share_one_call():
+    group = SingleFlight("test", ttl=0)
+    calls, results = [], []
+
+    def fetch():
+        calls.append(1)
+        _wait_for(lambda: group.shared == 7)  # every follower has joined
+        return ("value",)
+
+    threads = [threading.Thread(target=lambda: results.append(group.do("key", fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert len(calls) == 1
+    assert results == [("value",)] * 8
+    assert (group.leaders, group.shared) == (1, 7)
+
+
+def test_results_are_kept_for_ttl_and_until_forgotten():
+    group = SingleFlight("test", ttl=60)
+    calls = []
+    fetch = lambda: calls.append(1) or len(calls)
+
+    assert [group.do("key", fetch), group.do("key", fetch), group.do("other", fetch)] == [1, 1, 2]
+    group.forget("key")
+    assert group.do("key", fetch) == 3
+
+
+def test_errors_are_shared_but_not_kept():
+    group = SingleFlight("test", ttl=60)
+    attempts = []
+
+    def failing():
+        attempts.append(1)
+        raise ValueError("boom")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            group.do("key", failing)
+    assert len(attempts) == 2
+    assert group.do("key", lambda: "ok") == "ok"
+
+
+def test_async_followers_share_the_leaders_result():
+    group = SingleFlight("test", ttl=0)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def burst():
+        return await asyncio.gather(*(group.do_async("key", fetch) for _ in range(5)))
+
+    assert asyncio.run(burst()) == ["value"] * 5
+    assert len(calls) == 1
+
+
+def test_a_cancelled_async_leader_releases_its_followers():
+    group = SingleFlight("test", ttl=0)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def scenario():
+        leader = asyncio.ensure_future(group.do_async("key", hang))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(group.do_async("key", lambda: "unused"))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(RuntimeError, match="cancelled"):
+            await follower
+
+    asyncio.run(scenario())
+
+
+def test_identical_quiz_list_reads_are_built_once(make_user, first_topic, concurrently):
+    from routers.quizzes import quiz_lists
+
+    user = make_user()
+    quiz_lists.forget()
+    leaders = quiz_lists.leaders
+
+    responses = concurrently([
+        ("GET", f"/api/quiz/topic/{first_topic.id}", {"headers": user.headers}) for _ in range(10)
+    ])
+
+    assert [response.status_code for response in responses] == [200] * 10
+    assert len({response.content for response in responses}) == 1
+    assert quiz_lists.leaders == leaders + 1
@@ -0,0 +1,80 @@
+import uuid
+from datetime import datetime, timedelta
+
+from database import SessionLocal
+from models.quiz_model import QuizReviewState, QuizStats
+from models.topic_model import Quiz
+from services import content_events
+from services.content_events import ContentEvent
+from services.spaced_repetition import next_quiz_for_user, record_review
+
+
+def test_parallel_submits_by_one_user_advance_one_state(make_user, first_topic, concurrently):
+    user = make_user()
+    db = SessionLocal()
+    try:
+        correct_answer = db.get(Quiz, first_topic.quiz_id).correct_answer
+    finally:
+        db.close()
+
+    responses = concurrently([
+        ("POST", "/api/quiz/submit",
+         {"json": {"quiz_id": first_topic.quiz_id, "selected_answer": correct_answer, "time_taken": 20}, "headers": user.headers})
+        for _ in range(8)
+    ])
+
+    assert [response.status_code for response in responses] == [200] * 8
+    db = SessionLocal()
+    try:
+        state = db.get(QuizReviewState, (user.id, first_topic.quiz_id))
+        assert (state.repetitions, state.lapses) == (8, 0)  # every answer applied, none lost
+    finally:
+        db.close()
+
+
+def test_next_quiz_prefers_overdue_then_unseen_then_weakest(make_user, first_topic):
+    user = make_user()
+    db = SessionLocal()
+    try:
+        first = next_quiz_for_user(db, user.id, topic_id=first_topic.id)
+        assert first.id == first_topic.quiz_id  # nothing seen yet: lowest id
+
+        record_review(db, user.id, first.id, is_correct=True, time_taken=5)
+        db.commit()
+        second = next_quiz_for_user(db, user.id, topic_id=first_topic.id)
+        assert second.id != first.id  # the next unseen one
+
+        db.query(QuizReviewState).filter(
+            QuizReviewState.user_id == user.id, QuizReviewState.quiz_id == first.id
+        ).update({QuizReviewState.due_at: datetime.utcnow() - timedelta(days=1)})
+        db.commit()
+        assert next_quiz_for_user(db, user.id, topic_id=first_topic.id).id == first.id
+    finally:
+        db.close()
+
+
+def test_next_quiz_filters_on_the_observed_difficulty(make_user, client):
+    admin, user = make_user(is_admin=True), make_user()
+    topic_id = client.post("/api/admin/topics", headers=admin.headers, json={
+        "slug": f"topic-{uuid.uuid4().hex[:8]}", "title": "Topic", "category": "general", "content": "Text",
+        "difficulty_level": "beginner", "tags": [], "is_published": True,
+    }).json()["id"]
+    quiz_id = client.post("/api/admin/quizzes", headers=admin.headers, json={
+        "topic_id": topic_id, "question": "Labelled easy, answered like a hard one?", "options": ["Yes", "No"],
+        "correct_answer": 0, "difficulty": "easy",
+    }).json()["id"]
+    db = SessionLocal()
+    try:
+        db.add(QuizStats(quiz_id=quiz_id, topic_id=topic_id, attempts=50, correct_count=10,
+                         observed_difficulty="hard", labelled_attempts=50))
+        content_events.record(db, ContentEvent("quiz", "updated", id=quiz_id, topic_id=topic_id))
+        db.commit()
+    finally:
+        db.close()
+
+    for path in ("/api/quiz/next", "/api/quiz/random"):
+        hard = client.get(path, params={"topic_id": topic_id, "difficulty": "hard"}, headers=user.headers)
+        assert hard.status_code == 200
+        assert (hard.json()["id"], hard.json()["options"], hard.json()["difficulty"]) == (quiz_id, ["Yes", "No"], "hard")
+        easy = client.get(path, params={"topic_id": topic_id, "difficulty": "easy"}, headers=user.headers)
+        assert easy.status_code == 404
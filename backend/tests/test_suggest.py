@@ -0,0 +1,51 @@
+import uuid
+
+from services import suggest
+from services.suggest import PrefixIndex, Suggestion, _entries
+
+
+def _index(popularity=None):
+    suggestions = [
+        Suggestion("Know Your Rights", "topic", "know-your-rights", (1,)),
+        Suggestion("Tenant Rights", "topic", "tenant-rights", (2,)),
+        Suggestion("Renting", "tag", None, (2, 3)),
+        Suggestion("what are my rights as a tenant", "question"),
+    ]
+    return PrefixIndex(_entries(suggestions), popularity or {})
+
+
+def test_a_prefix_matches_the_start_of_any_word():
+    texts = [s.text for s in _index().search("righ", 10)]
+    assert sorted(texts) == ["Know Your Rights", "Tenant Rights", "what are my rights as a tenant"]
+    assert [s.text for s in _index().search("your r", 10)] == ["Know Your Rights"]
+    assert _index().search("ights", 10) == []
+
+
+def test_results_are_ordered_by_popularity_and_distinct():
+    results = _index({2: 5, 3: 1, 1: 2}).search("r", 10)
+    # "Renting" covers topics 2 and 3, "Tenant Rights" only topic 2
+    assert [s.text for s in results[:3]] == ["Renting", "Tenant Rights", "Know Your Rights"]
+    assert len(results) == len(set(results))
+    assert len(_index().search("r", 2)) == 2
+
+
+def test_prefixes_are_normalized():
+    assert [s.text for s in _index().search("  TENANT-rig ", 10)] == ["Tenant Rights"]
+    assert _index().search("   ", 10) == []
+
+
+def test_suggest_endpoint_follows_topic_changes(client, make_user):
+    admin = make_user(is_admin=True)
+    word = f"zq{uuid.uuid4().hex[:8]}"
+    suggest.current()
+    response = client.post("/api/admin/topics", headers=admin.headers, json={
+        "slug": f"topic-{word}", "title": f"Topic {word}", "category": "general", "content": "Text",
+        "difficulty_level": "beginner", "tags": [], "is_published": True,
+    })
+    topic_id = response.json()["id"]
+
+    found = client.get("/api/legal/suggest", params={"prefix": word}).json()
+    assert found == [{"text": f"Topic {word}", "kind": "topic", "slug": f"topic-{word}"}]
+
+    client.patch(f"/api/admin/topics/{topic_id}", json={"is_published": False}, headers=admin.headers)
+    assert client.get("/api/legal/suggest", params={"prefix": word}).json() == []
@@ -0,0 +1,48 @@
+from services.cache import get_cache
+from routers.sync import SYNC_CACHE_PREFIX
+
+
+def _sync(client, user, since):
+    response = client.get("/api/sync", params={"since": since}, headers=user.headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_new_clients_get_a_full_snapshot_cached_once_per_version(make_user, client):
+    user = make_user()
+    first = _sync(client, user, 0)
+    again = _sync(client, user, -7)
+
+    assert first["full"] and again == first
+    assert first["topics"] and first["quizzes"]
+    keys = [key for key in get_cache()._entries if key.startswith(SYNC_CACHE_PREFIX)]
+    assert f"{SYNC_CACHE_PREFIX}full:{first['version']}" in keys
+    assert not any(key.startswith((f"{SYNC_CACHE_PREFIX}0:", f"{SYNC_CACHE_PREFIX}-7:")) for key in keys)
+
+
+def test_clients_behind_get_only_the_changed_rows(make_user, client, first_topic):
+    user, admin = make_user(), make_user(is_admin=True)
+    version = _sync(client, user, 0)["version"]
+
+    response = client.patch(f"/api/admin/topics/{first_topic.id}", json={"description": "Updated for sync"},
+                            headers=admin.headers)
+    assert response.status_code == 200
+    delta = _sync(client, user, version)
+
+    assert not delta["full"] and delta["version"] > version
+    assert [topic["id"] for topic in delta["topics"]] == [first_topic.id]
+    assert delta["topics"][0]["description"] == "Updated for sync"
+    assert {quiz["topic_id"] for quiz in delta["quizzes"]} == {first_topic.id}
+    assert _sync(client, user, delta["version"])["topics"] == []
+
+
+def test_unpublished_topics_are_sent_as_deleted(make_user, client, first_topic):
+    user, admin = make_user(), make_user(is_admin=True)
+    version = _sync(client, user, 0)["version"]
+    try:
+        client.patch(f"/api/admin/topics/{first_topic.id}", json={"is_published": False}, headers=admin.headers)
+        delta = _sync(client, user, version)
+        assert delta["deleted"]["topics"] == [first_topic.id]
+        assert first_topic.quiz_id in delta["deleted"]["quizzes"]
+    finally:
+        client.patch(f"/api/admin/topics/{first_topic.id}", json={"is_published": True}, headers=admin.headers)
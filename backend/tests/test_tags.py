@@ -0,0 +1,36 @@
+import uuid
+
+from sqlalchemy import event, insert
+
+from database import SessionLocal, UnpooledSession, engine
+from models.topic_model import Tag
+from services.tags import _tag_ids
+
+
+def test_tag_added_by_another_transaction_meanwhile_is_reused():
+    name = f"tag-{uuid.uuid4().hex[:8]}"
+    raced = []
+
+    def add_same_tag_first(conn, cursor, statement, parameters, context, executemany):
+        # Runs between _tag_ids' lookup and its insert, like a concurrent request would
+        if statement.startswith("INSERT INTO tags") and not raced:
+            raced.append(name)
+            other = UnpooledSession()
+            try:
+                other.execute(insert(Tag).values(name=name))
+                other.commit()
+            finally:
+                other.close()
+
+    db = SessionLocal()
+    event.listen(engine, "before_cursor_execute", add_same_tag_first)
+    try:
+        ids = _tag_ids(db, [name])
+        db.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", add_same_tag_first)
+
+    try:
+        assert raced and ids == {name: db.query(Tag.id).filter(Tag.name == name).scalar()}
+    finally:
+        db.close()